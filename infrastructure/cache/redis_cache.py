@@ -0,0 +1,162 @@
+from datetime import datetime
+from typing import Dict, Optional
+from uuid import UUID
+
+from loguru import logger
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+
+from settings.settings import settings
+
+# Тела хакеров и решений зависят от связей, которые не меняют их updated_at, поэтому
+# версией служит поколение ключа в Redis (см. EntityCache.versioned): invalidate после
+# фиксации сдвигает поколение, и тело, прочитанное до изменения, уже никто не прочтёт
+def hacker_key(hacker_id: UUID) -> str:
+    return f"hacker:{hacker_id}"
+
+
+def hacker_user_key(user_id: UUID) -> str:
+    return f"hacker:user:{user_id}"
+
+
+# Тела команд и хакатонов хранятся под версией (updated_at), из которой строится их ETag:
+# тело, прочитанное до изменения, не может попасть под ключ новой версии, поэтому
+# инвалидация не нужна, а старые версии истекают по TTL
+def team_key(team_id: UUID, version: datetime) -> str:
+    return f"team:{team_id}:{version.isoformat()}"
+
+
+def hackathon_key(hackathon_id: UUID, version: datetime) -> str:
+    return f"hackathon:{hackathon_id}:{version.isoformat()}"
+
+
+def winner_solution_key(solution_id: UUID) -> str:
+    return f"winner_solution:{solution_id}"
+
+
+class EntityCache:
+    """
+    Read-through кэш сущностей в Redis.
+
+    Хранит сериализованные DTO с TTL. Если Redis не настроен или недоступен,
+    кэш ведёт себя как постоянный промах и не ломает запрос.
+    """
+
+    def __init__(
+        self,
+        url: Optional[str],
+        ttl: int,
+        prefix: str = "hackathon_service",
+        client: Optional[Redis] = None,
+    ) -> None:
+        self._url = url
+        self._ttl = ttl
+        self._prefix = prefix
+        self._client = client  # Можно передать готовый клиент (например, fakeredis)
+        self.hits = 0
+        self.misses = 0
+        self.errors = 0
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self._url) or self._client is not None
+
+    def _redis(self) -> Redis:
+        if self._client is None:
+            self._client = Redis.from_url(self._url)
+            logger.info("redis cache client created")
+
+        return self._client
+
+    def _key(self, key: str) -> str:
+        return f"{self._prefix}:{key}"
+
+    async def get_value(self, key: str) -> Optional[bytes]:
+        """
+        Получение сырого значения по ключу.
+        """
+        if not self.enabled:
+            return None
+
+        try:
+            value = await self._redis().get(self._key(key))
+        except RedisError as e:
+            self.errors += 1
+            logger.warning(f"redis cache get {key} failed: {e}")
+            return None
+
+        if value is None:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        return value
+
+    async def set_value(
+        self, key: str, value: bytes | str, ttl: Optional[int] = None, expire: bool = True
+    ) -> None:
+        """
+        Сохранение сырого значения по ключу с TTL; expire=False — без срока жизни.
+        """
+        if not self.enabled:
+            return
+
+        try:
+            await self._redis().set(self._key(key), value, ex=(ttl or self._ttl) if expire else None)
+        except RedisError as e:
+            self.errors += 1
+            logger.warning(f"redis cache set {key} failed: {e}")
+
+    def _generation_key(self, key: str) -> str:
+        return self._key(f"{key}:generation")
+
+    async def versioned(self, key: str) -> Optional[str]:
+        """
+        Ключ тела сущности под текущим поколением. Поколение читается до запроса в базу:
+        если сущность изменится раньше, чем тело будет записано, оно ляжет под старый ключ.
+        None — кэш выключен или поколение не прочитать, кэш в этом запросе не используется.
+        """
+        if not self.enabled:
+            return None
+
+        try:
+            generation = await self._redis().get(self._generation_key(key))
+        except RedisError as e:
+            self.errors += 1
+            logger.warning(f"redis cache generation {key} failed: {e}")
+            return None
+
+        return f"{key}@{int(generation or 0)}"
+
+    async def invalidate(self, *keys: str) -> None:
+        """
+        Удаление ключей и сдвиг их поколений после изменения сущностей.
+        """
+        if not self.enabled or not keys:
+            return
+
+        try:
+            async with self._redis().pipeline() as pipe:
+                pipe.delete(*(self._key(key) for key in keys))
+                for key in keys:
+                    pipe.incr(self._generation_key(key))
+                    # Поколение живёт дольше тел: сброс к 0 не воскресит тело старого поколения
+                    pipe.expire(self._generation_key(key), 2 * self._ttl)
+                await pipe.execute()
+        except RedisError as e:
+            self.errors += 1
+            logger.warning(f"redis cache invalidate {keys} failed: {e}")
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Счётчики попаданий и промахов для мониторинга.
+        """
+        return {"hits": self.hits, "misses": self.misses, "errors": self.errors}
+
+    async def close(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+
+entity_cache = EntityCache(settings.redis.url, settings.redis.cache_ttl)
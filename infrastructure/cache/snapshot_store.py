@@ -0,0 +1,135 @@
+import mmap
+import os
+import struct
+from typing import Dict, Optional, Tuple
+
+from loguru import logger
+
+from settings.settings import settings
+
+# Заголовок файла снимка: сигнатура, длина версии, длина тела
+_MAGIC = b"SNP1"
+_HEADER = struct.Struct(">4sHI")
+
+
+class _Mapped:
+    """
+    Открытый процессом файл снимка: отображение в память и разобранный заголовок.
+    """
+
+    def __init__(self, identity: Tuple[int, int, int], mapping: mmap.mmap, version: str, offset: int, size: int):
+        self.identity = identity
+        self.mapping = mapping
+        self.version = version
+        self.offset = offset
+        self.size = size
+
+
+class SnapshotStore:
+    """
+    Общие для воркеров снимки сериализованных ответов в файлах, отображённых в память.
+
+    Один воркер рендерит ответ и публикует его с версией (атомарная замена файла),
+    остальные отдают те же байты, пока версия совпадает с их текущей. Файлы лежат
+    в tmpfs (например, /dev/shm), поэтому страницы снимка одни на все процессы и
+    память под кэш ответов не растёт с числом воркеров. Без каталога (SNAPSHOT_DIR)
+    хранилище отключено и ведёт себя как постоянный промах.
+    """
+
+    def __init__(self, directory: Optional[str]) -> None:
+        self._directory = directory
+        self._mapped: Dict[str, _Mapped] = {}
+        self.hits = 0
+        self.misses = 0
+        self.errors = 0
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self._directory)
+
+    def _path(self, name: str) -> str:
+        return os.path.join(self._directory, f"{name}.snap")
+
+    def _map(self, name: str) -> Optional[_Mapped]:
+        """
+        Отображение текущего файла снимка; переоткрывается, если файл был заменён.
+        """
+        try:
+            stat = os.stat(self._path(name))
+        except FileNotFoundError:
+            return None
+
+        identity = (stat.st_dev, stat.st_ino, stat.st_mtime_ns)
+        mapped = self._mapped.get(name)
+        if mapped is not None and mapped.identity == identity:
+            return mapped
+
+        with open(self._path(name), "rb") as file:
+            mapping = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, version_size, body_size = (_HEADER.unpack_from(mapping) if len(mapping) >= _HEADER.size
+                                          else (None, 0, 0))
+        offset = _HEADER.size + version_size
+        if magic != _MAGIC or offset + body_size != len(mapping):
+            mapping.close()
+            raise ValueError(f"corrupted snapshot {name}")
+
+        if mapped is not None:
+            mapped.mapping.close()
+
+        mapped = _Mapped(identity, mapping, mapping[_HEADER.size:offset].decode(), offset, body_size)
+        self._mapped[name] = mapped
+
+        return mapped
+
+    def get(self, name: str, version: str) -> Optional[bytes]:
+        """
+        Тело снимка, если он опубликован с той же версией.
+        """
+        if not self.enabled:
+            return None
+
+        try:
+            mapped = self._map(name)
+        except (OSError, ValueError) as e:
+            self.errors += 1
+            logger.warning(f"snapshot {name} read failed: {e}")
+            return None
+
+        if mapped is None or mapped.version != version:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        return mapped.mapping[mapped.offset:mapped.offset + mapped.size]
+
+    def put(self, name: str, version: str, body: bytes) -> None:
+        """
+        Публикация снимка: запись во временный файл и атомарная замена.
+
+        Воркеры, уже отобразившие прежний файл, дочитывают его и переоткрывают при следующем get.
+        """
+        if not self.enabled:
+            return
+
+        encoded_version = version.encode()
+        tmp_path = f"{self._path(name)}.{os.getpid()}.tmp"
+        try:
+            os.makedirs(self._directory, exist_ok=True)
+            with open(tmp_path, "wb") as file:
+                file.write(_HEADER.pack(_MAGIC, len(encoded_version), len(body)))
+                file.write(encoded_version)
+                file.write(body)
+            os.replace(tmp_path, self._path(name))
+        except OSError as e:
+            self.errors += 1
+            logger.warning(f"snapshot {name} write failed: {e}")
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Счётчики попаданий и промахов для мониторинга.
+        """
+        return {"hits": self.hits, "misses": self.misses, "errors": self.errors}
+
+
+snapshot_store = SnapshotStore(settings.snapshot.directory)
@@ -0,0 +1,27 @@
+from typing import Sequence
+
+from loguru import logger
+from sqlalchemy import Table, text
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.schema import CreateTable
+
+
+async def copy_to_staging(session: AsyncSession, table: Table, records: Sequence[tuple]) -> None:
+    """
+    Создаёт временную таблицу в текущей транзакции и заливает в неё записи
+    через asyncpg copy_records_to_table (протокол COPY).
+    """
+    connection = await session.connection()
+    await connection.execute(CreateTable(table, if_not_exists=True))
+    await connection.execute(text(f"TRUNCATE {table.name}"))
+
+    if not records:
+        return
+
+    raw_connection = await connection.get_raw_connection()
+    await raw_connection.driver_connection.copy_records_to_table(
+        table.name,
+        records=records,
+        columns=[column.name for column in table.columns],
+    )
+    logger.info(f"copy_to_staging: {len(records)} rows into {table.name}")
@@ -1,8 +1,172 @@
+import asyncio
+import os
+from contextlib import asynccontextmanager
+from contextvars import Context, ContextVar, copy_context
+from typing import AsyncIterator, Awaitable, Callable, List, Optional
+
+from loguru import logger
 from settings.settings import settings
-from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
+
+# Один движок (и один пул соединений) на процесс
+_engine: Optional[AsyncEngine] = None
+_sessionmaker: Optional[async_sessionmaker[AsyncSession]] = None
+
+# Сессия текущего запроса (unit of work), выставляется зависимостью db_session
+_request_session: ContextVar[Optional[AsyncSession]] = ContextVar("request_session", default=None)
+
+
+def get_engine() -> AsyncEngine:
+    """
+    Возвращает общий для процесса движок, создавая его при первом обращении.
+    """
+    global _engine
+
+    if _engine is None:
+        _engine = create_async_engine(
+            settings.pg.url,
+            pool_size=settings.pg.pool_size,
+            max_overflow=settings.pg.max_overflow,
+            pool_timeout=settings.pg.pool_timeout,
+            pool_pre_ping=settings.pg.pool_pre_ping,
+            pool_recycle=settings.pg.pool_recycle,
+        )
+        logger.info(
+            "pg engine created: pool_size={} max_overflow={}",
+            settings.pg.pool_size, settings.pg.max_overflow,
+        )
+
+    return _engine
 
 
 def pg_connection() -> async_sessionmaker[AsyncSession]:
-    engine = create_async_engine(settings.pg.url)
+    """
+    Возвращает общую для процесса фабрику сессий, привязанную к единому движку.
+    """
+    global _sessionmaker
+
+    if _sessionmaker is None:
+        _sessionmaker = async_sessionmaker(
+            autocommit=False, autoflush=False, expire_on_commit=False, bind=get_engine()
+        )
+
+    return _sessionmaker
+
+
+def _reset_engine_after_fork() -> None:
+    """
+    Сбрасывает унаследованный от родителя движок в дочернем процессе
+    (pre-fork серверы): соединения пула родителя не закрываются и не
+    переиспользуются, дочерний процесс при первом обращении создаст свой движок.
+    """
+    global _engine, _sessionmaker
+
+    if _engine is not None:
+        _engine.sync_engine.dispose(close=False)
+
+    _engine = None
+    _sessionmaker = None
+
+
+os.register_at_fork(after_in_child=_reset_engine_after_fork)
+
+
+async def db_session() -> AsyncIterator[AsyncSession]:
+    """
+    FastAPI-зависимость: одна сессия на запрос.
+
+    Все репозитории внутри запроса работают через неё, фиксация (commit)
+    или откат (rollback) выполняется один раз по завершении обработчика.
+    """
+    async with pg_connection()() as session:
+        token = _request_session.set(session)
+        try:
+            yield session
+            await session.commit()
+        except Exception:
+            await session.rollback()
+            raise
+        finally:
+            _request_session.reset(token)
+
+        for callback in session.info.pop("after_commit", []):
+            await callback()
+
+
+@asynccontextmanager
+async def session_scope() -> AsyncIterator[AsyncSession]:
+    """
+    Возвращает сессию текущего запроса, а вне запроса (фоновые задачи, сидирование)
+    открывает собственную сессию и фиксирует её при выходе.
+    """
+    session = _request_session.get()
+    if session is not None:
+        yield session
+        return
+
+    async with pg_connection()() as session:
+        try:
+            yield session
+            await session.commit()
+        except Exception:
+            await session.rollback()
+            raise
+
+
+def detached_context() -> Context:
+    """
+    Копия текущего контекста без сессии запроса: задачи, запущенные в нём,
+    открывают собственные сессии и не зависят от транзакции и отмены запроса.
+    """
+    context = copy_context()
+    context.run(_request_session.set, None)
+
+    return context
+
+
+async def run_after_commit(callback: Callable[[], Awaitable[None]]) -> None:
+    """
+    Выполняет callback после фиксации транзакции текущего запроса
+    (например, инвалидацию кэша). Вне запроса данные уже зафиксированы,
+    поэтому callback выполняется сразу.
+    """
+    session = _request_session.get()
+    if session is None:
+        await callback()
+        return
+
+    callbacks: List[Callable[[], Awaitable[None]]] = session.info.setdefault("after_commit", [])
+    callbacks.append(callback)
+
+
+async def ping(timeout: float) -> bool:
+    """
+    Проверяет доступность базы запросом SELECT 1 через пул соединений.
+    """
+    async def select_one() -> None:
+        async with get_engine().connect() as connection:
+            await connection.execute(text("SELECT 1"))
+
+    try:
+        await asyncio.wait_for(select_one(), timeout)
+    except Exception as e:
+        logger.warning(f"pg ping failed: {e!r}")
+        return False
+
+    return True
+
+
+async def dispose_engine() -> None:
+    """
+    Закрывает пул соединений. Вызывается при завершении приложения.
+    """
+    global _engine, _sessionmaker
+
+    if _engine is None:
+        return
 
-    return async_sessionmaker(autocommit=False, autoflush=False, bind=engine)
\ No newline at end of file
+    await _engine.dispose()
+    _engine = None
+    _sessionmaker = None
+    logger.info("pg engine disposed")
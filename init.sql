@@ -34,11 +34,14 @@ CREATE TABLE team (
     owner_id UUID NOT NULL,
     name TEXT NOT NULL,
     max_size INTEGER NOT NULL CHECK (max_size > 0),
+    member_count INTEGER DEFAULT 0 NOT NULL,
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP NOT NULL,
     updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP NOT NULL,
     FOREIGN KEY (owner_id) REFERENCES hacker (id) ON DELETE CASCADE,
 
-    CONSTRAINT uq_team_owner_id_name UNIQUE (owner_id, name)
+    CONSTRAINT uq_team_owner_id_name UNIQUE (owner_id, name),
+    -- Счётчик участников не может превысить max_size даже при конкурентных вступлениях
+    CONSTRAINT ck_team_member_count CHECK (member_count >= 0 AND member_count <= max_size)
 );
 
 -- Таблица для связи hacker и team (many-to-many)
@@ -55,6 +58,7 @@ CREATE TABLE hackathon (
     id UUID PRIMARY KEY,
     name TEXT NOT NULL,
     task_description TEXT,
+    task_summary TEXT,
     start_of_registration TIMESTAMP WITH TIME ZONE,
     end_of_registration TIMESTAMP WITH TIME ZONE,
     start_of_hack TIMESTAMP WITH TIME ZONE NOT NULL,
@@ -83,3 +87,72 @@ CREATE TABLE winner_solution (
 
     CONSTRAINT uq_winner_solution_hackathon_id_team_id UNIQUE (hackathon_id, team_id)
 );
+
+-- Счётчики изменений таблиц: версии списков для ETag. Триггер увеличивает счётчик
+-- в транзакции изменения, блокировка строки счётчика упорядочивает версии по фиксациям
+CREATE TABLE IF NOT EXISTS change_counter (
+    entity TEXT PRIMARY KEY,
+    version BIGINT DEFAULT 0 NOT NULL
+);
+
+INSERT INTO change_counter (entity) VALUES ('hackathon') ON CONFLICT DO NOTHING;
+
+CREATE OR REPLACE FUNCTION bump_change_counter() RETURNS trigger AS $$
+BEGIN
+    UPDATE change_counter SET version = version + 1 WHERE entity = TG_TABLE_NAME;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE TRIGGER trg_hackathon_change_counter
+    AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON hackathon
+    FOR EACH STATEMENT EXECUTE FUNCTION bump_change_counter();
+
+-- Индексы для keyset-пагинации списков по (created_at, id)
+CREATE INDEX IF NOT EXISTS ix_hacker_created_at_id ON hacker (created_at, id);
+CREATE INDEX IF NOT EXISTS ix_team_created_at_id ON team (created_at, id);
+CREATE INDEX IF NOT EXISTS ix_hackathon_created_at_id ON hackathon (created_at, id);
+CREATE INDEX IF NOT EXISTS ix_winner_solution_created_at_id ON winner_solution (created_at, id);
+
+-- Миграция существующих баз (блок можно выполнить отдельно): счётчик участников
+-- команд пересчитывается по фактическому составу; на новой базе ничего не меняет
+ALTER TABLE team ADD COLUMN IF NOT EXISTS member_count INTEGER DEFAULT 0 NOT NULL;
+UPDATE team SET member_count = (
+    SELECT count(*) FROM hacker_team_association a WHERE a.team_id = team.id
+);
+-- Ограничение вместимости добавляется без проверки старых строк (NOT VALID) и
+-- проверяется, только если переполненных команд нет: их нужно разобрать вручную
+DO $$
+BEGIN
+    IF NOT EXISTS (
+        SELECT 1 FROM pg_constraint
+        WHERE conname = 'ck_team_member_count' AND conrelid = 'team'::regclass
+    ) THEN
+        ALTER TABLE team ADD CONSTRAINT ck_team_member_count
+            CHECK (member_count >= 0 AND member_count <= max_size) NOT VALID;
+    END IF;
+    IF EXISTS (SELECT 1 FROM team WHERE member_count > max_size) THEN
+        RAISE WARNING 'ck_team_member_count не проверено: есть команды сверх max_size';
+    ELSE
+        ALTER TABLE team VALIDATE CONSTRAINT ck_team_member_count;
+    END IF;
+END $$;
+-- Версия списка хакатонов теперь берётся из change_counter (блок выше идемпотентен)
+DROP INDEX IF EXISTS ix_hackathon_updated_at;
+-- Краткое описание задачи для списков хакатонов: колонка добавляется в старые базы
+-- и однократно заполняется из task_description (повтор не трогает заполненные строки).
+-- Выражение повторяет services.hackathon_service.summarize_task: первый абзац,
+-- пробелы схлопнуты, обрезка по границе слова до 200 символов
+ALTER TABLE hackathon ADD COLUMN IF NOT EXISTS task_summary TEXT;
+UPDATE hackathon h SET task_summary = CASE
+        WHEN length(s.paragraph) <= 200 THEN s.paragraph
+        ELSE rtrim(regexp_replace(left(s.paragraph, 199), ' [^ ]*$', ''), ' ,.;:') || '…'
+    END
+FROM (
+    SELECT id, btrim(regexp_replace(
+               split_part(btrim(task_description, E' \t\r\n\f\v'), E'\n\n', 1), '\s+', ' ', 'g'
+           )) AS paragraph
+    FROM hackathon
+    WHERE task_summary IS NULL AND task_description IS NOT NULL
+) s
+WHERE h.id = s.id;
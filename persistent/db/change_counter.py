@@ -0,0 +1,12 @@
+from sqlalchemy import BigInteger, Column, Text
+
+from persistent.db.base import Base
+
+
+# Счётчики изменений таблиц — версии списков для ETag. Увеличиваются триггером
+# в транзакции изменения (init.sql), поэтому порядок версий совпадает с порядком фиксаций
+class ChangeCounter(Base):
+    __tablename__ = "change_counter"
+
+    entity = Column(Text, primary_key=True)  # Имя таблицы
+    version = Column(BigInteger, nullable=False, default=0)
@@ -1,7 +1,7 @@
 from sqlalchemy.orm import relationship
 
 from persistent.db.base import Base, WithMetadata
-from sqlalchemy import Column, Text, Integer, Boolean, DateTime, Float, UUID, UniqueConstraint
+from sqlalchemy import Column, Text, Integer, Boolean, DateTime, Float, UUID, UniqueConstraint, Index
 from sqlalchemy.dialects.postgresql import ARRAY
 from datetime import datetime
 
@@ -12,12 +12,16 @@ class Hackathon(Base, WithMetadata):
 
     name = Column(Text, nullable=False)
     task_description = Column(Text, nullable=True)
+    task_summary = Column(Text, nullable=True)  # Краткое описание для списков, обновляется при upsert
     start_of_registration = Column(DateTime, nullable=True)
     end_of_registration = Column(DateTime, nullable=True)
     start_of_hack = Column(DateTime, nullable=False)
     end_of_hack = Column(DateTime, nullable=True)
     amount_money = Column(Float, nullable=True)
     type = Column(Text, nullable=True)  # \"online\" или \"offline\"
-    winner_solutions = relationship("WinnerSolution", back_populates="hackathon", lazy='subquery')
+    winner_solutions = relationship("WinnerSolution", back_populates="hackathon", lazy='raise')
 
-    __table_args__ = (UniqueConstraint("name", "start_of_hack", name="uq_name_start_of_hack"),)
+    __table_args__ = (
+        UniqueConstraint("name", "start_of_hack", name="uq_name_start_of_hack"),
+        Index("ix_hackathon_created_at_id", "created_at", "id"),
+    )
@@ -3,7 +3,7 @@ from sqlalchemy.orm import relationship
 from persistent.db.base import Base, WithMetadata
 from persistent.db.relations import hacker_role_association, hacker_team_association
 
-from sqlalchemy import Column, Text, Integer, Boolean, DateTime, Float
+from sqlalchemy import Column, Text, Integer, Boolean, DateTime, Float, Index
 from sqlalchemy.dialects.postgresql import ARRAY, UUID
 from datetime import datetime
 
@@ -13,8 +13,7 @@ class Hacker(Base, WithMetadata):
 
     user_id = Column(UUID(as_uuid=True), nullable=False, unique=True)
     name = Column(Text, nullable=False)
-    teams = relationship("Team", secondary=hacker_team_association, back_populates="hackers", lazy='subquery')
-    roles = relationship("Role", secondary=hacker_role_association, back_populates="hackers", lazy='subquery')
-
-
+    teams = relationship("Team", secondary=hacker_team_association, back_populates="hackers", lazy='raise')
+    roles = relationship("Role", secondary=hacker_role_association, back_populates="hackers", lazy='raise')
 
+    __table_args__ = (Index("ix_hacker_created_at_id", "created_at", "id"),)
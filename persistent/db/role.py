@@ -26,4 +26,4 @@ class Role(Base, WithMetadata):
     name = Column(Text, nullable=False)
     
     # Отношения
-    hackers = relationship("Hacker", secondary=hacker_role_association, back_populates="roles")
\ No newline at end of file
+    hackers = relationship("Hacker", secondary=hacker_role_association, back_populates="roles", lazy='raise')
\ No newline at end of file
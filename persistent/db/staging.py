@@ -0,0 +1,50 @@
+from sqlalchemy import Boolean, Column, Float, Integer, MetaData, Table, Text
+from sqlalchemy.dialects.postgresql import UUID
+
+# Временные таблицы для массовой загрузки через COPY.
+# Создаются в схеме pg_temp и удаляются по окончании транзакции.
+staging_metadata = MetaData()
+
+
+def _staging_table(name: str, *columns: Column) -> Table:
+    return Table(name, staging_metadata, *columns, prefixes=["TEMPORARY"], postgresql_on_commit="DROP")
+
+
+stage_hacker = _staging_table(
+    "stage_hacker",
+    Column("row_no", Integer, nullable=False),
+    Column("user_id", UUID(as_uuid=True), nullable=False),
+    Column("name", Text, nullable=False),
+    Column("set_roles", Boolean, nullable=False),  # Заменять ли набор ролей хакера
+)
+
+stage_hacker_role = _staging_table(
+    "stage_hacker_role",
+    Column("user_id", UUID(as_uuid=True), nullable=False),
+    Column("role_id", UUID(as_uuid=True), nullable=False),
+)
+
+stage_team = _staging_table(
+    "stage_team",
+    Column("row_no", Integer, nullable=False),
+    Column("owner_id", UUID(as_uuid=True), nullable=False),
+    Column("name", Text, nullable=False),
+    Column("max_size", Integer, nullable=False),
+)
+
+stage_team_member = _staging_table(
+    "stage_team_member",
+    Column("row_no", Integer, nullable=False),
+    Column("hacker_id", UUID(as_uuid=True), nullable=False),
+)
+
+stage_winner_solution = _staging_table(
+    "stage_winner_solution",
+    Column("row_no", Integer, nullable=False),
+    Column("hackathon_id", UUID(as_uuid=True), nullable=False),
+    Column("team_id", UUID(as_uuid=True), nullable=False),
+    Column("win_money", Float, nullable=False),
+    Column("link_to_solution", Text, nullable=False),
+    Column("link_to_presentation", Text, nullable=False),
+    Column("can_share", Boolean, nullable=False),
+)
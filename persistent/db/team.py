@@ -1,7 +1,7 @@
 from sqlalchemy.orm import relationship
 
 from persistent.db.base import Base, WithMetadata
-from sqlalchemy import Column, Text, Integer, Boolean, DateTime, Float
+from sqlalchemy import Column, Text, Integer, Boolean, DateTime, Float, Index, CheckConstraint
 from sqlalchemy.dialects.postgresql import ARRAY, UUID
 from datetime import datetime
 
@@ -15,5 +15,11 @@ class Team(Base, WithMetadata):
     owner_id = Column(UUID(as_uuid=True), nullable=False)
     name = Column(Text, nullable=False)
     max_size = Column(Integer, nullable=False)
-    hackers = relationship("Hacker", secondary=hacker_team_association, back_populates="teams", lazy='subquery')
-    winner_solutions = relationship("WinnerSolution", back_populates="team", lazy='subquery')
\ No newline at end of file
+    member_count = Column(Integer, nullable=False, default=0, server_default="0")  # Число участников
+    hackers = relationship("Hacker", secondary=hacker_team_association, back_populates="teams", lazy='raise')
+    winner_solutions = relationship("WinnerSolution", back_populates="team", lazy='raise')
+
+    __table_args__ = (
+        CheckConstraint("member_count >= 0 AND member_count <= max_size", name="ck_team_member_count"),
+        Index("ix_team_created_at_id", "created_at", "id"),
+    )
@@ -1,32 +1,71 @@
-from contextlib import asynccontextmanager
+from utils.startup_timer import FirstRequestTimer, startup_timer  # Первым: отсчёт времени запуска
+
+import asyncio
+from contextlib import asynccontextmanager, suppress
 
 from fastapi import FastAPI, HTTPException, Path, Response, status
 from fastapi.middleware.cors import CORSMiddleware
 from loguru import logger
 from pydantic import BaseModel
 
+from presentations.routers.export_router import export_router
+from presentations.routers.health_router import health_router
+from presentations.routers.metrics_router import metrics_router
 from presentations.routers.role_router import role_router
 from presentations.routers.hackathon_router import hackathon_router
 from presentations.routers.hacker_router import hacker_router
 from presentations.routers.team_router import team_router
 from presentations.routers.winner_solution_router import winner_solution_router
 
+from infrastructure.cache.redis_cache import entity_cache
+from infrastructure.db.connection import dispose_engine
 from services.mock_data_service import MockDataService
+from services.role_service import RoleService
+from settings.settings import settings
+from utils.runtime_profile import default_response_class
+
+async def warm_up() -> None:
+    """
+    Фоновый прогрев после старта: тестовые данные (по флагу), недостающие роли
+    и справочник ролей в памяти. Запросы до окончания прогрева обслуживаются:
+    справочник ролей загружается лениво при первом обращении.
+    """
+    try:
+        # Инициализация тестовых данных только по флагу; большие наборы — через seed_data.py
+        if settings.seed.on_startup:
+            await MockDataService().initialize_mock_data()
+
+        # Создание недостающих ролей и загрузка справочника ролей в память
+        await RoleService().init_roles()
+    except Exception as e:
+        logger.exception(f"warm-up failed: {e!r}")
+        return
+
+    startup_timer.mark("warmup")
+    logger.info(f"warm-up completed: {startup_timer.stats()}")
+
 
 # Lifespan-событие
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """
     Обработчик жизненного цикла приложения.
-    Используется для инициализации данных при старте и очистки ресурсов при завершении.
+    Старт не ждёт базу: прогрев запускается фоновой задачей, движок создаётся
+    при первом запросе. При завершении освобождаются ресурсы.
     """
-    # Инициализация тестовых данных
-    mock_data_service = MockDataService()
-    await mock_data_service.initialize_mock_data()
+    warm_up_task = asyncio.create_task(warm_up())
+    startup_timer.mark("lifespan")
 
     yield  # Возвращаем управление приложению
 
     logger.info("Application shutdown: cleaning up...")  # Действия при завершении приложения
+    if not warm_up_task.done():
+        warm_up_task.cancel()
+        # Дожидаемся отмены, чтобы прогрев не обращался к закрываемому пулу
+        with suppress(asyncio.CancelledError):
+            await warm_up_task
+    await dispose_engine()
+    await entity_cache.close()
 
 
 # Создание приложения FastAPI с lifespan
@@ -34,6 +73,7 @@ app = FastAPI(
     title="Наше последнее приложение!",
     description="Прикольное приложение (последнее)",
     lifespan=lifespan,
+    default_response_class=default_response_class(),
 )
 
 # Настройка CORS
@@ -43,10 +83,18 @@ app.add_middleware(
     allow_credentials=False,
     allow_methods=["*"],  # Разрешить все HTTP-методы
     allow_headers=["*"],  # Разрешить все заголовки
+    expose_headers=["ETag"],  # Клиенты на JS сами отправляют If-None-Match
 )
 
+app.add_middleware(FirstRequestTimer)
+
+app.include_router(health_router)
 app.include_router(hacker_router)
 app.include_router(role_router)
 app.include_router(team_router)
 app.include_router(hackathon_router)
 app.include_router(winner_solution_router)
+app.include_router(export_router)
+app.include_router(metrics_router)
+
+startup_timer.mark("imported")
@@ -0,0 +1,87 @@
+import enum
+from typing import AsyncIterator, Callable, Dict, Tuple
+
+from fastapi import APIRouter, Depends
+from fastapi.responses import StreamingResponse
+from loguru import logger
+from pydantic import BaseModel
+from sqlalchemy import Row
+
+from presentations.routers.hacker_router import HackerDto, hacker_service
+from presentations.routers.team_router import TeamDto, team_service
+from presentations.routers.winner_solution_router import WinnerSolutionDto, winner_solution_service
+from utils.jwt_utils import Claims, get_current_claims
+from utils.serialization import dump_json
+
+# Сколько строк NDJSON склеивать в один чанк ответа
+EXPORT_CHUNK_ROWS = 500
+
+export_router = APIRouter(
+    prefix="/export",
+    tags=["Export"],
+    responses={404: {"description": "Not Found"}},
+)
+
+
+class ExportEntity(str, enum.Enum):
+    HACKERS = "hackers"
+    TEAMS = "teams"
+    WINNER_SOLUTIONS = "winner-solutions"
+
+
+def _hacker_dto(row: Row) -> BaseModel:
+    return HackerDto(id=row.id, user_id=row.user_id, name=row.name, roles=row.roles, team_ids=row.team_ids)
+
+
+def _team_dto(row: Row) -> BaseModel:
+    return TeamDto(id=row.id, ownerID=row.owner_id, name=row.name, max_size=row.max_size, hacker_ids=row.hacker_ids)
+
+
+def _winner_solution_dto(row: Row) -> BaseModel:
+    return WinnerSolutionDto(
+        id=row.id,
+        win_money=row.win_money,
+        link_to_solution=row.link_to_solution,
+        link_to_presentation=row.link_to_presentation,
+        can_share=row.can_share,
+        hackathon_id=row.hackathon_id,
+        team_id=row.team_id,
+    )
+
+
+_EXPORTS: Dict[ExportEntity, Tuple[Callable[[], AsyncIterator[Row]], Callable[[Row], BaseModel]]] = {
+    ExportEntity.HACKERS: (hacker_service.stream_all_hackers, _hacker_dto),
+    ExportEntity.TEAMS: (team_service.stream_all_teams, _team_dto),
+    ExportEntity.WINNER_SOLUTIONS: (winner_solution_service.stream_all_winner_solutions, _winner_solution_dto),
+}
+
+
+async def _ndjson(entity: ExportEntity) -> AsyncIterator[bytes]:
+    stream, to_dto = _EXPORTS[entity]
+    chunk = []
+    total = 0
+
+    async for row in stream():
+        chunk.append(dump_json(to_dto(row)))
+        total += 1
+
+        if len(chunk) >= EXPORT_CHUNK_ROWS:
+            yield b"\n".join(chunk) + b"\n"
+            chunk.clear()
+
+    if chunk:
+        yield b"\n".join(chunk) + b"\n"
+
+    logger.info(f"export_{entity.value}: streamed {total} rows")
+
+
+@export_router.get("/{entity}")
+async def export(entity: ExportEntity, claims: Claims = Depends(get_current_claims)):
+    """
+    Полная выгрузка сущностей в формате NDJSON (одна строка JSON на запись).
+    Данные читаются серверным курсором и отдаются потоком.
+    Requires authentication.
+    """
+    logger.info(f"export_{entity.value} by user {claims.uid}")
+
+    return StreamingResponse(_ndjson(entity), media_type="application/x-ndjson")
@@ -1,14 +1,20 @@
 from datetime import datetime
-from typing import List
+from typing import List, Optional
 from uuid import UUID
 
-from fastapi import APIRouter, HTTPException, status, Depends
-from fastapi.security import HTTPAuthorizationCredentials
+from fastapi import APIRouter, HTTPException, Query, Request, status, Depends
 from pydantic import BaseModel
 from loguru import logger
 
+from infrastructure.cache.redis_cache import entity_cache, hackathon_key
+from infrastructure.cache.snapshot_store import snapshot_store
+from infrastructure.db.connection import db_session
 from services.hackathon_service import HackathonService
-from utils.jwt_utils import security, parse_jwt_token
+from utils.etag import etag_matches, make_etag, not_modified, with_etag
+from utils.serialization import dump_json, json_response, trusted_response
+from utils.fieldsets import FIELDS_DESCRIPTION, list_include, parse_fields, trim_json
+from utils.pagination import DEFAULT_PAGE_LIMIT, MAX_PAGE_LIMIT, decode_cursor
+from utils.jwt_utils import Claims, get_current_claims
 
 hackathon_service = HackathonService()
 
@@ -16,13 +22,14 @@ hackathon_router = APIRouter(
     prefix="/hackathon",
     tags=["Hackathons"],
     responses={404: {"description": "Not Found"}},
+    dependencies=[Depends(db_session)],
 )
 
 
 class HackathonDto(BaseModel):
     id: UUID
     name: str
-    task_description: str
+    task_summary: Optional[str] = None  # Полное описание задачи — в GET /hackathon/{id}
     start_of_registration: datetime
     end_of_registration: datetime
     start_of_hack: datetime
@@ -33,6 +40,7 @@ class HackathonDto(BaseModel):
 
 class HackathonGetAllResponse(BaseModel):
     hackathons: List[HackathonDto]
+    next_cursor: Optional[str] = None
 
 
 class HackathonCreatePostRequest(BaseModel):
@@ -63,43 +71,58 @@ class HackathonGetByIdResponse(BaseModel):
 
 
 @hackathon_router.get("/", response_model=HackathonGetAllResponse)
-async def get_all_hackathons(credentials: HTTPAuthorizationCredentials = Depends(security)):
+async def get_all_hackathons(
+    http_request: Request,
+    limit: int = Query(DEFAULT_PAGE_LIMIT, ge=1, le=MAX_PAGE_LIMIT),
+    cursor: Optional[str] = Query(None, description="Курсор следующей страницы"),
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION),
+    claims: Claims = Depends(get_current_claims),
+):
     """
     Получить список всех хакатонов.
     Requires authentication.
     """
-    claims = parse_jwt_token(credentials)
     logger.info(f"hackathon_get_all by user {claims.uid}")
-    hackathons = await hackathon_service.get_all_hackathons()
-
-    return HackathonGetAllResponse(
-        hackathons=[
-            HackathonDto(
-                id=hackathon.id,
-                name=hackathon.name,
-                task_description=hackathon.task_description,
-                start_of_registration=hackathon.start_of_registration,
-                end_of_registration=hackathon.end_of_registration,
-                start_of_hack=hackathon.start_of_hack,
-                end_of_hack=hackathon.end_of_hack,
-                amount_money=hackathon.amount_money,
-                type=hackathon.type,
-            )
-            for hackathon in hackathons
-        ]
+    fieldset = parse_fields(fields, HackathonDto)
+    # Версия читается до данных: при гонке с записью тело окажется новее ETag, а не наоборот
+    version = await hackathon_service.get_hackathons_version()
+    etag = make_etag("hackathons", version, http_request.url.query)
+    if etag_matches(http_request, etag):
+        return not_modified(etag)
+
+    # Первая страница без параметров (расписание) отдаётся из общего для воркеров снимка
+    snapshot = not http_request.url.query
+    if snapshot:
+        body = snapshot_store.get("hackathons", etag)
+        if body is not None:
+            return with_etag(json_response(body), etag)
+
+    hackathons, next_cursor = await hackathon_service.get_all_hackathons(
+        limit, decode_cursor(cursor), fieldset, version=version
     )
 
+    response = trusted_response(
+        HackathonGetAllResponse.model_construct(
+            hackathons=[HackathonDto.model_construct(**hackathon._mapping) for hackathon in hackathons],
+            next_cursor=next_cursor,
+        ),
+        include=list_include("hackathons", fieldset),
+    )
+    if snapshot:
+        snapshot_store.put("hackathons", etag, response.body)
+
+    return with_etag(response, etag)
+
 
 @hackathon_router.post("/", response_model=HackathonCreatePostResponse, status_code=201)
 async def upsert_hackathon(
     request: HackathonCreatePostRequest,
-    credentials: HTTPAuthorizationCredentials = Depends(security)
+    claims: Claims = Depends(get_current_claims)
 ):
     """
     Создать или обновить новый хакатон.
     Requires authentication.
     """
-    claims = parse_jwt_token(credentials)
     logger.info(f"hackathon_post: {request.name} by user {claims.uid}")
     hackathon_id = await hackathon_service.upsert_hackathon(
         name=request.name,
@@ -112,27 +135,42 @@ async def upsert_hackathon(
         type=request.type,
     )
 
-    return HackathonCreatePostResponse(id=hackathon_id)
+    return trusted_response(
+        HackathonCreatePostResponse.model_construct(id=hackathon_id),
+        status_code=status.HTTP_201_CREATED,
+    )
 
 
 @hackathon_router.get("/{hackathon_id}", response_model=HackathonGetByIdResponse)
 async def get_hackathon_by_id(
     hackathon_id: UUID,
-    credentials: HTTPAuthorizationCredentials = Depends(security)
+    http_request: Request,
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION),
+    claims: Claims = Depends(get_current_claims)
 ):
     """
     Получить информацию о хакатоне по ID.
     Requires authentication.
     """
-    claims = parse_jwt_token(credentials)
     logger.info(f"hackathon_get_by_id: {hackathon_id} by user {claims.uid}")
+    fieldset = parse_fields(fields, HackathonGetByIdResponse)
+    version = await hackathon_service.get_hackathon_version(hackathon_id)
+    etag = make_etag("hackathon", hackathon_id, version, fieldset) if version else None
+    if etag and etag_matches(http_request, etag):
+        return not_modified(etag)
+
+    # Без версии объекта нет: кэш не читается, ответ 404 даст база
+    cached = await entity_cache.get_value(hackathon_key(hackathon_id, version)) if version else None
+    if cached is not None:
+        return with_etag(json_response(trim_json(cached, fieldset)), etag)
+
     hackathon, found = await hackathon_service.get_hackathon_by_id(hackathon_id)
 
     if not found:
         logger.error(f"hackathon_get_by_id: {hackathon_id} not found")
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Хакатон не найден")
 
-    return HackathonGetByIdResponse(
+    response = HackathonGetByIdResponse.model_construct(
         id=hackathon.id,
         name=hackathon.name,
         task_description=hackathon.task_description,
@@ -143,4 +181,9 @@ async def get_hackathon_by_id(
         amount_money=hackathon.amount_money,
         type=hackathon.type,
     )
+    body = dump_json(response)
+    if version:
+        await entity_cache.set_value(hackathon_key(hackathon_id, version), body)
+
+    return with_etag(json_response(trim_json(body, fieldset)), etag)
 
@@ -1,17 +1,22 @@
 import uuid
 from datetime import datetime
-from typing import List
+from typing import List, Optional
 
-from fastapi import APIRouter, HTTPException, status, Depends
-from fastapi.security import HTTPAuthorizationCredentials
+from fastapi import APIRouter, HTTPException, Query, Request, status, Depends
 from loguru import logger
 from pydantic import BaseModel
 from uuid import UUID
 
+from infrastructure.cache.redis_cache import entity_cache, hacker_key
+from infrastructure.db.connection import db_session
 from persistent.db.team import Team
 from persistent.db.role import RoleEnum
 from services.hacker_service import HackerService
-from utils.jwt_utils import security, parse_jwt_token, get_current_user_id
+from utils.bulk_input import BulkResponse, parse_bulk_body
+from utils.serialization import dump_json, json_response, trusted_response
+from utils.fieldsets import FIELDS_DESCRIPTION, list_include, parse_fields, trim_json
+from utils.pagination import DEFAULT_PAGE_LIMIT, MAX_PAGE_LIMIT, decode_cursor
+from utils.jwt_utils import Claims, get_admin_claims, get_current_user_id
 
 hacker_service = HackerService()  # Создаём экземпляр RoleService
 
@@ -19,6 +24,7 @@ hacker_router = APIRouter(
     prefix="/hacker",
     tags=["Hackers"],
     responses={404: {"description": "Not Found"}},
+    dependencies=[Depends(db_session)],
 )
 
 
@@ -32,6 +38,7 @@ class HackerDto(BaseModel):
 
 class HackerGetAllResponse(BaseModel):
     hackers: List[HackerDto]
+    next_cursor: Optional[str] = None
 
 
 class HackerCreatePostRequest(BaseModel):
@@ -46,6 +53,12 @@ class HackerAddRolesPostRequest(BaseModel):
     role_names: List[str]
 
 
+class HackerBulkRow(BaseModel):
+    user_id: UUID
+    name: str
+    role_names: Optional[List[str]] = None  # None — роли не меняются
+
+
 class GetHackerByIdGetRequest(BaseModel):
     hacker_id: UUID
 
@@ -58,23 +71,26 @@ class GetHackerByIdGetResponse(BaseModel):
 
 
 @hacker_router.get("/", response_model=HackerGetAllResponse)
-async def get_all(user_id: str = Depends(get_current_user_id)):
+async def get_all(
+    limit: int = Query(DEFAULT_PAGE_LIMIT, ge=1, le=MAX_PAGE_LIMIT),
+    cursor: Optional[str] = Query(None, description="Курсор следующей страницы"),
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION),
+    user_id: str = Depends(get_current_user_id),
+):
     """
     Получить список всех хакатонщиков.
     Requires authentication.
     """
     logger.info(f"hacker_get_all by user {user_id}")
-    hackers = await hacker_service.get_all_hackers()
-
-    return HackerGetAllResponse(
-        hackers=[
-            HackerDto(id=hacker.id,
-                      user_id=hacker.user_id,
-                      name=hacker.name,
-                      roles=[role.name for role in hacker.roles],
-                      team_ids=[team.id for team in hacker.teams], )
-            for hacker in hackers
-        ]
+    fieldset = parse_fields(fields, HackerDto)
+    hackers, next_cursor = await hacker_service.get_all_hackers(limit, decode_cursor(cursor), fieldset)
+
+    return trusted_response(
+        HackerGetAllResponse.model_construct(
+            hackers=[HackerDto.model_construct(**hacker._mapping) for hacker in hackers],
+            next_cursor=next_cursor,
+        ),
+        include=list_include("hackers", fieldset),
     )
 
 
@@ -97,10 +113,34 @@ async def upsert(
             detail="Не удалось создать или обновить хакатонщика"
         )
 
-    return CreateHackerPostResponse(
-        id=hacker_id,
+    return trusted_response(
+        CreateHackerPostResponse.model_construct(
+            id=hacker_id,
+        ),
+        status_code=status.HTTP_201_CREATED,
+    )
+
+
+@hacker_router.post("/bulk", response_model=BulkResponse)
+async def bulk_upsert(
+    http_request: Request,
+    claims: Claims = Depends(get_admin_claims)
+):
+    """
+    Массово создать или обновить хакатонщиков.
+    Тело — JSON-массив или NDJSON (Content-Type: application/x-ndjson)
+    объектов {user_id, name, role_names}. Возвращает результат по каждой строке.
+    Requires authentication with the admin scope (JWT_ADMIN_SCOPE).
+    """
+    rows, errors = await parse_bulk_body(http_request, HackerBulkRow)
+    logger.info(f"hacker_bulk: {len(rows)} valid rows, {len(errors)} invalid by user {claims.uid}")
+
+    results = await hacker_service.bulk_upsert_hackers(
+        [(row_no, row.user_id, row.name, row.role_names) for row_no, row in rows]
     )
 
+    return trusted_response(BulkResponse.from_results(errors + results))
+
 
 @hacker_router.post("/update_roles", status_code=201)
 async def update_roles(
@@ -113,16 +153,19 @@ async def update_roles(
     Requires authentication.
     """
     logger.info(f"hacker_update_roles: roles {request.role_names} for user {user_id}")
-    success = await hacker_service.update_hacker_roles_by_user_id(user_id, request.role_names)
-    
+    success, changed = await hacker_service.update_hacker_roles_by_user_id(user_id, request.role_names)
+
     if not success:
         logger.error(f"hacker_update_roles: failed to update roles for user {user_id}")
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Не удалось обновить роли")
 
+    logger.info(f"hacker_update_roles: user {user_id} roles changed={changed}")
+
 
 @hacker_router.get("/{hacker_id}", response_model=GetHackerByIdGetResponse)
 async def get_by_id(
     hacker_id: UUID,
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION),
     user_id: str = Depends(get_current_user_id)
 ):
     """
@@ -130,15 +173,26 @@ async def get_by_id(
     Requires authentication.
     """
     logger.info(f"hacker_get_by_id: {hacker_id} by user {user_id}")
+    fieldset = parse_fields(fields, GetHackerByIdGetResponse)
+    cache_key = await entity_cache.versioned(hacker_key(hacker_id))
+    cached = await entity_cache.get_value(cache_key) if cache_key else None
+    if cached is not None:
+        return json_response(trim_json(cached, fieldset))
+
     hacker, found = await hacker_service.get_hacker_by_id(hacker_id)
 
     if not found:
         logger.error(f"hacker_get_by_id: {hacker_id} not found")
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Хакер не найден")
 
-    return GetHackerByIdGetResponse(
+    response = GetHackerByIdGetResponse.model_construct(
         user_id=hacker.user_id,
         name=hacker.name,
         roles=[role.name for role in hacker.roles],
         team_ids=[team.id for team in hacker.teams],
     )
+    body = dump_json(response)
+    if cache_key:
+        await entity_cache.set_value(cache_key, body)
+
+    return json_response(trim_json(body, fieldset))
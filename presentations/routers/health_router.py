@@ -0,0 +1,45 @@
+from fastapi import APIRouter, HTTPException, status
+from loguru import logger
+from pydantic import BaseModel
+
+from infrastructure.db.connection import ping
+from utils.startup_timer import startup_timer
+
+# Проверка базы должна укладываться в период опроса балансировщика
+READY_CHECK_TIMEOUT = 2.0
+
+health_router = APIRouter(
+    tags=["Health"],
+)
+
+
+class HealthGetResponse(BaseModel):
+    status: str
+
+
+class ReadyGetResponse(BaseModel):
+    status: str
+    warmup: str
+
+
+@health_router.get("/healthz", response_model=HealthGetResponse)
+async def healthz():
+    """
+    Liveness: процесс запущен и обрабатывает запросы. База не проверяется.
+    """
+    return HealthGetResponse(status="ok")
+
+
+@health_router.get("/readyz", response_model=ReadyGetResponse)
+async def readyz():
+    """
+    Readiness: база доступна через пул соединений (SELECT 1 с таймаутом).
+    """
+    if not await ping(READY_CHECK_TIMEOUT):
+        logger.error("readyz: database is not reachable")
+        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail="Database is not reachable")
+
+    return ReadyGetResponse(
+        status="ready",
+        warmup="done" if startup_timer.has("warmup") else "pending",
+    )
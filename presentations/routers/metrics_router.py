@@ -0,0 +1,45 @@
+from typing import Dict
+
+from fastapi import APIRouter, Depends
+from loguru import logger
+from pydantic import BaseModel
+
+from infrastructure.cache.redis_cache import entity_cache
+from infrastructure.cache.snapshot_store import snapshot_store
+from services.identity_resolver import identity_resolver
+from services.single_flight import single_flight
+from utils.jwt_utils import get_admin_claims, token_verifier
+from utils.startup_timer import startup_timer
+
+metrics_router = APIRouter(
+    prefix="/metrics",
+    tags=["Metrics"],
+    dependencies=[Depends(get_admin_claims)],  # Внутренние счётчики — только служебным токенам
+)
+
+
+class MetricsGetResponse(BaseModel):
+    cache: Dict[str, int]
+    snapshot: Dict[str, int]  # Общие для воркеров снимки ответов
+    auth: Dict[str, int]  # LRU-кэш проверенных токенов
+    identity: Dict[str, int]  # LRU-кэш user_id -> id хакера
+    coalescing: Dict[str, Dict[str, int]]  # Объединённые одинаковые чтения по методам сервисов
+    startup: Dict[str, float]  # Секунды от импорта приложения до этапов запуска
+
+
+@metrics_router.get("/", response_model=MetricsGetResponse)
+async def get_metrics():
+    """
+    Счётчики работы приложения для мониторинга.
+    Requires authentication with the admin scope (JWT_ADMIN_SCOPE).
+    """
+    logger.debug("metrics_get")
+
+    return MetricsGetResponse(
+        cache=entity_cache.stats(),
+        snapshot=snapshot_store.stats(),
+        auth=token_verifier.stats(),
+        identity=identity_resolver.stats(),
+        coalescing=single_flight.stats(),
+        startup=startup_timer.stats(),
+    )
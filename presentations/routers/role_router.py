@@ -2,12 +2,15 @@ from typing import List
 from uuid import UUID
 
 from fastapi import APIRouter, HTTPException, Depends
-from fastapi.security import HTTPAuthorizationCredentials
 from pydantic import BaseModel
 from loguru import logger
 
+from infrastructure.cache.snapshot_store import snapshot_store
+from infrastructure.db.connection import db_session
 from services.role_service import RoleService
-from utils.jwt_utils import security, parse_jwt_token
+from utils.etag import make_etag
+from utils.serialization import dump_json, json_response
+from utils.jwt_utils import Claims, get_current_claims
 
 role_service = RoleService()
 
@@ -15,6 +18,7 @@ role_router = APIRouter(
     prefix="/role",
     tags=["Roles"],
     responses={404: {"description": "Not Found"}},
+    dependencies=[Depends(db_session)],
 )
 
 
@@ -28,26 +32,33 @@ class RoleGetAllResponse(BaseModel):
 
 
 @role_router.get("/", response_model=RoleGetAllResponse)
-async def get_all_roles(credentials: HTTPAuthorizationCredentials = Depends(security)):
+async def get_all_roles(claims: Claims = Depends(get_current_claims)):
     """
     Получить список всех ролей.
     Requires authentication.
     """
-    claims = parse_jwt_token(credentials)
     logger.info(f"Запрос на получение списка всех ролей от пользователя {claims.uid}")
     
     try:
-        roles = await role_service.get_all_roles()
-        
-        return RoleGetAllResponse(
-            roles=[
-                RoleDto(
-                    id=role.id,
-                    name=role.name
-                )
-                for role in roles
-            ]
-        )
+        # Снимок общий для воркеров; версия — отпечаток справочника этого процесса,
+        # поэтому воркер отдаёт только байты, совпадающие с его собственным справочником
+        catalog = await role_service.get_catalog()
+        version = make_etag("roles", catalog.version)
+        body = snapshot_store.get("roles", version)
+
+        if body is None:
+            body = dump_json(RoleGetAllResponse.model_construct(
+                roles=[
+                    RoleDto.model_construct(
+                        id=role.id,
+                        name=role.name
+                    )
+                    for role in catalog.roles
+                ]
+            ))
+            snapshot_store.put("roles", version, body)
+
+        return json_response(body)
         
     except Exception as e:
         logger.exception("Ошибка при получении списка ролей")
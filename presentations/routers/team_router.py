@@ -1,23 +1,32 @@
 import uuid
-from typing import List
+from typing import List, Optional
 
-from fastapi import APIRouter, HTTPException, status, Depends
-from fastapi.security import HTTPAuthorizationCredentials
+from fastapi import APIRouter, HTTPException, Query, Request, status, Depends
 from loguru import logger
 from pydantic import BaseModel, Field
+from sqlalchemy import Row
 from uuid import UUID
 
+from infrastructure.cache.redis_cache import entity_cache, team_key
+from infrastructure.db.connection import db_session
 from persistent.db.team import Team
 from services.team_service import TeamService
 from services.hacker_service import HackerService
-from utils.jwt_utils import security, parse_jwt_token
+from utils.bulk_input import BulkResponse, parse_bulk_body
+from utils.etag import etag_matches, make_etag, not_modified, with_etag
+from utils.serialization import dump_json, json_response, trusted_response
+from utils.fieldsets import FIELDS_DESCRIPTION, list_include, parse_fields, trim_json
+from utils.pagination import DEFAULT_PAGE_LIMIT, MAX_PAGE_LIMIT, decode_cursor
+from utils.jwt_utils import Claims, get_admin_claims, get_current_claims
 
 team_service = TeamService()  # Создаём экземпляр TeamService
+hacker_service = HackerService()
 
 team_router = APIRouter(
     prefix="/team",
     tags=["Teams"],
     responses={404: {"description": "Not Found"}},
+    dependencies=[Depends(db_session)],
 )
 
 
@@ -31,6 +40,7 @@ class TeamDto(BaseModel):
 
 class TeamGetAllResponse(BaseModel):
     teams: List[TeamDto]
+    next_cursor: Optional[str] = None
 
 
 class TeamCreatePostRequest(BaseModel):
@@ -42,6 +52,13 @@ class CreateTeamPostResponse(BaseModel):
     id: UUID
 
 
+class TeamBulkRow(BaseModel):
+    owner_id: UUID  # ID хакера-владельца
+    name: str
+    max_size: int
+    hacker_ids: List[UUID] = []
+
+
 class AddHackerToTeamRequest(BaseModel):
     team_id: UUID
 
@@ -62,43 +79,64 @@ class GetTeamByIdGetResponse(BaseModel):
     hacker_ids: List[UUID]
 
 
+# Поля DTO, названия которых отличаются от колонок проекции команды
+TEAM_FIELD_COLUMNS = {"ownerID": "owner_id"}
+
+
+def _team_dto(team: Row) -> TeamDto:
+    """
+    DTO команды из строки проекции (возможно, с разреженным набором колонок).
+    """
+    values = dict(team._mapping)
+    if "owner_id" in values:
+        values["ownerID"] = values.pop("owner_id")
+
+    return TeamDto.model_construct(**values)
+
+
 @team_router.get("/", response_model=TeamGetAllResponse)
-async def get_all(credentials: HTTPAuthorizationCredentials = Depends(security)):
+async def get_all(
+    limit: int = Query(DEFAULT_PAGE_LIMIT, ge=1, le=MAX_PAGE_LIMIT),
+    cursor: Optional[str] = Query(None, description="Курсор следующей страницы"),
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION),
+    claims: Claims = Depends(get_current_claims),
+):
     """
     Получить список всех команд.
     Requires authentication.
     """
-    claims = parse_jwt_token(credentials)
     logger.info(f"team_get_all by user {claims.uid}")
-    teams = await team_service.get_all_teams()
-
-    return TeamGetAllResponse(
-        teams=[
-            TeamDto(
-                id=team.id,
-                ownerID=team.owner_id,
-                name=team.name,
-                max_size=team.max_size,
-                hacker_ids=[hacker.id for hacker in team.hackers],
-            )
-            for team in teams
-        ]
+    fieldset = parse_fields(fields, TeamDto)
+    columns = None if fieldset is None else [TEAM_FIELD_COLUMNS.get(field, field) for field in fieldset]
+    teams, next_cursor = await team_service.get_all_teams(limit, decode_cursor(cursor), columns)
+
+    return trusted_response(
+        TeamGetAllResponse.model_construct(
+            teams=[_team_dto(team) for team in teams],
+            next_cursor=next_cursor,
+        ),
+        include=list_include("teams", fieldset),
     )
 
 
 @team_router.post("/", response_model=CreateTeamPostResponse, status_code=201)
 async def create(
     request: TeamCreatePostRequest,
-    credentials: HTTPAuthorizationCredentials = Depends(security)
+    claims: Claims = Depends(get_current_claims)
 ):
     """
-    Создать команду.
+    Создать команду. Владельцем становится текущий участник.
     Requires authentication.
     """
-    claims = parse_jwt_token(credentials)
     user_id = claims.uid
-    logger.info(f"team_create: {request.name} by user {user_id}")
-    team_id, status_code = await team_service.create_team(user_id, request.name, request.max_size)
+    hacker_id = await hacker_service.get_hacker_id_by_user_id(user_id)
+
+    if not hacker_id:
+        logger.error(f"team_create: hacker with user_id {user_id} not found")
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Хакер не найден")
+
+    logger.info(f"team_create: {request.name} owner={hacker_id} by user {user_id}")
+    team_id, status_code = await team_service.create_team(hacker_id, request.name, request.max_size)
 
     if status_code == -1:
         logger.error(f"team_create: invalid max_size {request.max_size}")
@@ -107,42 +145,63 @@ async def create(
         logger.error(f"team_create: team already exists")
         raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Команда с таким владельцем и названием уже существует")
 
-    return CreateTeamPostResponse(
-        id=team_id,
+    return trusted_response(
+        CreateTeamPostResponse.model_construct(
+            id=team_id,
+        ),
+        status_code=status.HTTP_201_CREATED,
     )
 
 
+@team_router.post("/bulk", response_model=BulkResponse)
+async def bulk_upsert(
+    http_request: Request,
+    claims: Claims = Depends(get_admin_claims)
+):
+    """
+    Массово создать или обновить команды с участниками.
+    Тело — JSON-массив или NDJSON (Content-Type: application/x-ndjson)
+    объектов {owner_id, name, max_size, hacker_ids}. Возвращает результат по каждой строке.
+    Requires authentication with the admin scope (JWT_ADMIN_SCOPE).
+    """
+    rows, errors = await parse_bulk_body(http_request, TeamBulkRow)
+    logger.info(f"team_bulk: {len(rows)} valid rows, {len(errors)} invalid by user {claims.uid}")
+
+    results = await team_service.bulk_upsert_teams(
+        [(row_no, row.owner_id, row.name, row.max_size, row.hacker_ids) for row_no, row in rows]
+    )
+
+    return trusted_response(BulkResponse.from_results(errors + results))
+
+
 @team_router.post("/add_hacker", response_model=AddHackerToTeamResponse, status_code=201)
 async def add_hacker_to_team(
     request: AddHackerToTeamRequest,
-    credentials: HTTPAuthorizationCredentials = Depends(security)
+    claims: Claims = Depends(get_current_claims)
 ):
     """
     Добавить текущего участника в команду по ID команды.
     Requires authentication.
     """
-    claims = parse_jwt_token(credentials)
     user_id = claims.uid
     
     # Получаем hacker_id по user_id
-    hacker_service = HackerService()
-    hacker, found = await hacker_service.get_hacker_by_user_id(user_id)
-    
-    if not found:
+    hacker_id = await hacker_service.get_hacker_id_by_user_id(user_id)
+
+    if not hacker_id:
         logger.error(f"team_add_hacker: hacker with user_id {user_id} not found")
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Хакер не найден")
-    
-    hacker_id = hacker.id
+
     logger.info(f"team_add_hacker: {request.team_id} hacker_id={hacker_id} by user {user_id}")
     
     team, status_code = await team_service.add_hacker_to_team(request.team_id, hacker_id)
     
     if status_code == -1:
-        logger.error(f"team_add_hacker: team {request.team_id} not found")
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Команда не найдена")
-    if status_code == -2:
         logger.error(f"team_add_hacker: hacker {hacker_id} not found")
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Хакер не найден")
+    if status_code == -2:
+        logger.error(f"team_add_hacker: team {request.team_id} not found")
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Команда не найдена")
     if status_code == -3:
         logger.error(f"team_add_hacker: team {request.team_id} is full")
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Команда заполнена")
@@ -153,65 +212,74 @@ async def add_hacker_to_team(
         logger.error(f"team_add_hacker: unknown error {status_code}")
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Не удалось добавить хакера")
 
-    return AddHackerToTeamResponse(
-        id=team.id,
-        ownerID=team.owner_id,
-        name=team.name,
-        max_size=team.max_size,
-        hacker_ids=[hacker.id for hacker in team.hackers],
+    return trusted_response(
+        AddHackerToTeamResponse.model_construct(
+            id=team.id,
+            ownerID=team.owner_id,
+            name=team.name,
+            max_size=team.max_size,
+            hacker_ids=team.hacker_ids,
+        ),
+        status_code=status.HTTP_201_CREATED,
     )
 
 
 @team_router.get("/my-teams", response_model=TeamGetAllResponse)
 async def get_my_teams(
-    credentials: HTTPAuthorizationCredentials = Depends(security)
+    claims: Claims = Depends(get_current_claims)
 ):
     """
     Получить список команд текущего пользователя.
     Возвращает все команды, в которых пользователь является участником.
     Requires authentication.
     """
-    claims = parse_jwt_token(credentials)
     user_id = claims.uid
     logger.info(f"team_get_my_teams by user {user_id}")
-    
-    teams = await team_service.get_teams_by_user_id(user_id)
-    
-    return TeamGetAllResponse(
-        teams=[
-            TeamDto(
-                id=team.id,
-                ownerID=team.owner_id,
-                name=team.name,
-                max_size=team.max_size,
-                hacker_ids=[hacker.id for hacker in team.hackers],
-            )
-            for team in teams
-        ]
-    )
+
+    hacker_id = await hacker_service.get_hacker_id_by_user_id(user_id)
+    teams = await team_service.get_teams_by_hacker_id(hacker_id) if hacker_id else []
+
+    return trusted_response(TeamGetAllResponse.model_construct(teams=[_team_dto(team) for team in teams]))
 
 
 @team_router.get("/{team_id}", response_model=GetTeamByIdGetResponse)
 async def get_by_id(
     team_id: UUID,
-    credentials: HTTPAuthorizationCredentials = Depends(security)
+    http_request: Request,
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION),
+    claims: Claims = Depends(get_current_claims)
 ):
     """
     Получить информацию о команде по её ID.
     Requires authentication.
     """
-    claims = parse_jwt_token(credentials)
     logger.info(f"team_get_by_id: {team_id} by user {claims.uid}")
+    fieldset = parse_fields(fields, GetTeamByIdGetResponse)
+    version = await team_service.get_team_version(team_id)
+    etag = make_etag("team", team_id, version, fieldset) if version else None
+    if etag and etag_matches(http_request, etag):
+        return not_modified(etag)
+
+    # Без версии объекта нет: кэш не читается, ответ 404 даст база
+    cached = await entity_cache.get_value(team_key(team_id, version)) if version else None
+    if cached is not None:
+        return with_etag(json_response(trim_json(cached, fieldset)), etag)
+
     team, found = await team_service.get_team_by_id(team_id)
 
     if not found:
         logger.error(f"team_get_by_id: {team_id} not found")
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Команда не найдена")
 
-    return GetTeamByIdGetResponse(
+    response = GetTeamByIdGetResponse.model_construct(
         id=team.id,
         ownerID=team.owner_id,
         name=team.name,
         max_size=team.max_size,
-        hacker_ids=[hacker.id for hacker in team.hackers],
+        hacker_ids=team.hacker_ids,
     )
+    body = dump_json(response)
+    if version:
+        await entity_cache.set_value(team_key(team_id, version), body)
+
+    return with_etag(json_response(trim_json(body, fieldset)), etag)
@@ -1,13 +1,18 @@
-from typing import List
+from typing import List, Optional
 from uuid import UUID
 
-from fastapi import APIRouter, HTTPException, status, Depends
-from fastapi.security import HTTPAuthorizationCredentials
+from fastapi import APIRouter, HTTPException, Query, Request, status, Depends
 from loguru import logger
 from pydantic import BaseModel
 
+from infrastructure.cache.redis_cache import entity_cache, winner_solution_key
+from infrastructure.db.connection import db_session
 from services.winner_solution_service import WinnerSolutionService
-from utils.jwt_utils import security, parse_jwt_token
+from utils.bulk_input import BulkResponse, parse_bulk_body
+from utils.serialization import dump_json, json_response, trusted_response
+from utils.fieldsets import FIELDS_DESCRIPTION, list_include, parse_fields, trim_json
+from utils.pagination import DEFAULT_PAGE_LIMIT, MAX_PAGE_LIMIT, decode_cursor
+from utils.jwt_utils import Claims, get_admin_claims, get_current_claims
 
 winner_solution_service = WinnerSolutionService()
 
@@ -15,6 +20,7 @@ winner_solution_router = APIRouter(
     prefix="/winner-solution",
     tags=["Winner Solutions"],
     responses={404: {"description": "Not Found"}},
+    dependencies=[Depends(db_session)],
 )
 
 
@@ -30,6 +36,7 @@ class WinnerSolutionDto(BaseModel):
 
 class WinnerSolutionGetAllResponse(BaseModel):
     winner_solutions: List[WinnerSolutionDto]
+    next_cursor: Optional[str] = None
 
 
 class WinnerSolutionCreateRequest(BaseModel):
@@ -41,6 +48,15 @@ class WinnerSolutionCreateRequest(BaseModel):
     team_id: UUID
 
 
+class WinnerSolutionBulkRow(BaseModel):
+    win_money: float
+    link_to_solution: str
+    link_to_presentation: str
+    can_share: bool = True
+    hackathon_id: UUID
+    team_id: UUID
+
+
 class WinnerSolutionCreateResponse(BaseModel):
     id: UUID
 
@@ -56,41 +72,42 @@ class WinnerSolutionGetByIdResponse(BaseModel):
 
 
 @winner_solution_router.get("/", response_model=WinnerSolutionGetAllResponse)
-async def get_all(credentials: HTTPAuthorizationCredentials = Depends(security)):
+async def get_all(
+    limit: int = Query(DEFAULT_PAGE_LIMIT, ge=1, le=MAX_PAGE_LIMIT),
+    cursor: Optional[str] = Query(None, description="Курсор следующей страницы"),
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION),
+    claims: Claims = Depends(get_current_claims),
+):
     """
     Получить список всех призерских решений.
     Requires authentication.
     """
-    claims = parse_jwt_token(credentials)
     logger.info(f"winner_solution_get_all by user {claims.uid}")
-    winner_solutions = await winner_solution_service.get_all_winner_solutions()
-    
-    return WinnerSolutionGetAllResponse(
-        winner_solutions=[
-            WinnerSolutionDto(
-                id=solution.id,
-                win_money=solution.win_money,
-                link_to_solution=solution.link_to_solution,
-                link_to_presentation=solution.link_to_presentation,
-                can_share=solution.can_share,
-                hackathon_id=solution.hackathon_id,
-                team_id=solution.team_id,
-            )
-            for solution in winner_solutions
-        ]
+    fieldset = parse_fields(fields, WinnerSolutionDto)
+    winner_solutions, next_cursor = await winner_solution_service.get_all_winner_solutions(
+        limit, decode_cursor(cursor), fieldset
+    )
+
+    return trusted_response(
+        WinnerSolutionGetAllResponse.model_construct(
+            winner_solutions=[
+                WinnerSolutionDto.model_construct(**solution._mapping) for solution in winner_solutions
+            ],
+            next_cursor=next_cursor,
+        ),
+        include=list_include("winner_solutions", fieldset),
     )
 
 
 @winner_solution_router.post("/", response_model=WinnerSolutionCreateResponse, status_code=201)
 async def create(
     request: WinnerSolutionCreateRequest,
-    credentials: HTTPAuthorizationCredentials = Depends(security)
+    claims: Claims = Depends(get_current_claims)
 ):
     """
     Создать призерское решение.
     Requires authentication.
     """
-    claims = parse_jwt_token(credentials)
     logger.info(f"winner_solution_create: team {request.team_id} for hackathon {request.hackathon_id} by user {claims.uid}")
     solution_id, success = await winner_solution_service.create_winner_solution(
         hackathon_id=request.hackathon_id,
@@ -105,29 +122,61 @@ async def create(
         logger.error(f"winner_solution_create: solution already exists for team {request.team_id}")
         raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Решение от этой команды уже записано")
     
-    return WinnerSolutionCreateResponse(
-        id=solution_id,
+    return trusted_response(
+        WinnerSolutionCreateResponse.model_construct(
+            id=solution_id,
+        ),
+        status_code=status.HTTP_201_CREATED,
     )
 
 
+@winner_solution_router.post("/bulk", response_model=BulkResponse)
+async def bulk_upsert(
+    http_request: Request,
+    claims: Claims = Depends(get_admin_claims)
+):
+    """
+    Массово создать или обновить призерские решения.
+    Тело — JSON-массив или NDJSON (Content-Type: application/x-ndjson)
+    объектов WinnerSolutionBulkRow. Возвращает результат по каждой строке.
+    Requires authentication with the admin scope (JWT_ADMIN_SCOPE).
+    """
+    rows, errors = await parse_bulk_body(http_request, WinnerSolutionBulkRow)
+    logger.info(f"winner_solution_bulk: {len(rows)} valid rows, {len(errors)} invalid by user {claims.uid}")
+
+    results = await winner_solution_service.bulk_upsert_winner_solutions([
+        (row_no, row.hackathon_id, row.team_id, row.win_money,
+         row.link_to_solution, row.link_to_presentation, row.can_share)
+        for row_no, row in rows
+    ])
+
+    return trusted_response(BulkResponse.from_results(errors + results))
+
+
 @winner_solution_router.get("/{solution_id}", response_model=WinnerSolutionGetByIdResponse)
 async def get_by_id(
     solution_id: UUID,
-    credentials: HTTPAuthorizationCredentials = Depends(security)
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION),
+    claims: Claims = Depends(get_current_claims)
 ):
     """
     Получить призерское решение по ID.
     Requires authentication.
     """
-    claims = parse_jwt_token(credentials)
     logger.info(f"winner_solution_get_by_id: {solution_id} by user {claims.uid}")
+    fieldset = parse_fields(fields, WinnerSolutionGetByIdResponse)
+    cache_key = await entity_cache.versioned(winner_solution_key(solution_id))
+    cached = await entity_cache.get_value(cache_key) if cache_key else None
+    if cached is not None:
+        return json_response(trim_json(cached, fieldset))
+
     solution, found = await winner_solution_service.get_winner_solution_by_id(solution_id)
     
     if not found:
         logger.error(f"winner_solution_get_by_id: {solution_id} not found")
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Решение не найдено")
     
-    return WinnerSolutionGetByIdResponse(
+    response = WinnerSolutionGetByIdResponse.model_construct(
         id=solution.id,
         win_money=solution.win_money,
         link_to_solution=solution.link_to_solution,
@@ -135,4 +184,9 @@ async def get_by_id(
         can_share=solution.can_share,
         hackathon_id=solution.hackathon_id,
         team_id=solution.team_id,
-    )
\ No newline at end of file
+    )
+    body = dump_json(response)
+    if cache_key:
+        await entity_cache.set_value(cache_key, body)
+
+    return json_response(trim_json(body, fieldset))
\ No newline at end of file
@@ -1,48 +1,89 @@
 from datetime import datetime
-from typing import List, Optional, cast
+from typing import Collection, List, Optional, Tuple, cast
 from loguru import logger
-from sqlalchemy import select, delete, UUID
+from sqlalchemy import Row, select, tuple_, delete, UUID
 from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import joinedload
-from infrastructure.db.connection import pg_connection
+from infrastructure.db.connection import session_scope
+from persistent.db.change_counter import ChangeCounter
 from persistent.db.hackathon import Hackathon
+from repository.loader_profiles import LoadProfile, loader_options
+from repository.projections import sparse_columns
 
 
-class HackathonRepository:
-    def __init__(self) -> None:
-        self._sessionmaker = pg_connection()
+# Колонки хакатона, доступные через fields= в списке. Полный task_description
+# в списки не выбирается, вместо него отдаётся краткий task_summary
+HACKATHON_COLUMNS = (
+    "id", "name", "task_summary", "start_of_registration", "end_of_registration",
+    "start_of_hack", "end_of_hack", "amount_money", "type",
+)
+
 
-    async def get_all_hackathons(self) -> List[Hackathon]:
+class HackathonRepository:
+    async def get_all_hackathons(
+        self,
+        limit: int,
+        after: Optional[Tuple[datetime, UUID]] = None,
+        fields: Optional[Collection[str]] = None,
+    ) -> List[Row]:
         """
-        Получение всех хакатонов.
+        Получение страницы хакатонов (keyset-пагинация по (created_at, id)).
+
+        Возвращает плоские строки только с запрошенными колонками (fields) и (id, created_at).
         """
-        stmt = select(Hackathon)
+        stmt = (select(*sparse_columns(Hackathon, fields, HACKATHON_COLUMNS))
+                .order_by(Hackathon.created_at, Hackathon.id)
+                .limit(limit))
+
+        if after:
+            stmt = stmt.where(tuple_(Hackathon.created_at, Hackathon.id) > tuple_(*after))
 
-        async with self._sessionmaker() as session:
+        async with session_scope() as session:
             resp = await session.execute(stmt)
+            return list(resp.fetchall())
+
+    async def get_hackathons_version(self) -> int:
+        """
+        Версия таблицы хакатонов (для ETag списка): счётчик изменений из change_counter.
+
+        Счётчик увеличивается триггером в транзакции любого изменения таблицы,
+        поэтому, в отличие от max(updated_at), меняется и при фиксации изменений
+        не по порядку их времени, и при удалениях.
+        """
+        stmt = select(ChangeCounter.version).where(cast("ColumnElement[bool]", ChangeCounter.entity == "hackathon"))
 
-            rows = resp.fetchall()  # Извлекаем все строки
-            hackathons = [row[0] for row in rows]  # Преобразуем их в список объектов Hacker
-            return hackathons
+        async with session_scope() as session:
+            return (await session.execute(stmt)).scalar_one_or_none() or 0
+
+    async def get_hackathon_version(self, hackathon_id: UUID) -> Optional[datetime]:
+        """
+        Время последнего изменения хакатона (для ETag); None — хакатона нет.
+        """
+        stmt = select(Hackathon.updated_at).where(cast("ColumnElement[bool]", Hackathon.id == hackathon_id))
+
+        async with session_scope() as session:
+            return (await session.execute(stmt)).scalar_one_or_none()
 
     async def upsert_hackathon(
             self,
             name: str,
             task_description: str,
+            task_summary: str,
             start_of_registration: datetime,
             end_of_registration: datetime,
             start_of_hack: datetime,
             end_of_hack: datetime,
             amount_money: float,
             type: str,
-    ) -> Optional[UUID]:
+    ) -> UUID:
         """
-        Создание нового хакатона.
+        Создание нового хакатона или обновление существующего с теми же (name, start_of_hack).
         """
         stmt = insert(Hackathon).values({
             "name": name,
             "task_description": task_description,
+            "task_summary": task_summary,
             "start_of_registration": start_of_registration,
             "end_of_registration": end_of_registration,
             "start_of_hack": start_of_hack,
@@ -51,32 +92,31 @@ class HackathonRepository:
             "type": type,
         })
 
-        stmt.on_conflict_do_update(constraint="uq_hackathon_name_start", set_={
+        stmt = stmt.on_conflict_do_update(index_elements=[Hackathon.name, Hackathon.start_of_hack], set_={
             "task_description": task_description,
+            "task_summary": task_summary,
             "start_of_registration": start_of_registration,
             "end_of_registration": end_of_registration,
             "end_of_hack": end_of_hack,
             "amount_money": amount_money,
             "type": type,
             "updated_at": datetime.utcnow(),
-        })
+        }).returning(Hackathon.id)
 
-        async with self._sessionmaker() as session:
+        async with session_scope() as session:
             result = await session.execute(stmt)
-            hackathon_id = result.inserted_primary_key[0]
-
-            await session.commit()
-
-        return hackathon_id
+            return result.scalar_one()
 
     async def get_hackathon_by_id(self, hackathon_id: UUID) -> Optional[Hackathon]:
         """
         Получение хакатона по ID.
         """
-        stmt = select(Hackathon).where(cast("ColumnElement[bool]", Hackathon.id == hackathon_id)).limit(1)
+        stmt = (select(Hackathon)
+                .where(cast("ColumnElement[bool]", Hackathon.id == hackathon_id))
+                .options(*loader_options(Hackathon, LoadProfile.DETAIL))
+                .limit(1))
 
-        async with self._sessionmaker() as session:
+        async with session_scope() as session:
             resp = await session.execute(stmt)
-
-        row = resp.fetchone()
-        return row[0] if row else None
+            row = resp.fetchone()
+            return row[0] if row else None
@@ -1,164 +1,233 @@
 from datetime import datetime
-from typing import cast, List, Optional
+from typing import AsyncIterator, Collection, cast, List, Optional, Tuple
 
 from loguru import logger
-from sqlalchemy.exc import IntegrityError
 
-from infrastructure.db.connection import pg_connection
+from infrastructure.db.bulk import copy_to_staging
+from infrastructure.db.connection import pg_connection, session_scope
 from persistent.db.hacker import Hacker
+from persistent.db.relations import hacker_role_association, hacker_team_association
 from persistent.db.role import Role, RoleEnum
-from sqlalchemy import ColumnElement, select, update, delete, insert, UUID, String, Table
-from sqlalchemy.dialects.postgresql import insert as pg_insert
+from persistent.db.staging import stage_hacker, stage_hacker_role
+from sqlalchemy import (ColumnElement, Row, Select, Text, all_, any_, exists, func, literal, literal_column, select,
+                        tuple_, update, delete, insert, UUID, String, Table)
+from sqlalchemy import cast as sql_cast
+from sqlalchemy.dialects.postgresql import ARRAY, array, insert as pg_insert
+from sqlalchemy.dialects.postgresql import UUID as PG_UUID
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import sessionmaker
 
+from repository.loader_profiles import LoadProfile, loader_options
+from repository.projections import sparse_columns
 
-class HackerRepository:
-    def __init__(self) -> None:
-        self._sessionmaker = pg_connection()
+# Простые колонки проекции хакера, доступные через fields=
+HACKER_COLUMNS = ("id", "user_id", "name")
+
+
+def _hacker_projection(fields: Optional[Collection[str]] = None) -> Select:
+    """
+    Плоская выборка хакера с именами ролей и id команд, агрегированными в массивы
+    коррелированными подзапросами (без ORM-объектов и без перемножения связей).
+
+    При разреженном наборе полей выбираются только запрошенные колонки,
+    а ненужные подзапросы не строятся.
+    """
+    columns = sparse_columns(Hacker, fields, HACKER_COLUMNS)
+
+    if fields is None or "roles" in fields:
+        role_names = (
+            select(func.array_agg(Role.name))
+            .select_from(hacker_role_association.join(Role, Role.id == hacker_role_association.c.role_id))
+            .where(hacker_role_association.c.hacker_id == Hacker.id)
+            .scalar_subquery()
+        )
+        columns.append(func.coalesce(role_names, sql_cast(array([]), ARRAY(Text))).label("roles"))
 
-    async def get_all_hackers(self) -> List[Hacker]:
+    if fields is None or "team_ids" in fields:
+        team_ids = (
+            select(func.array_agg(hacker_team_association.c.team_id))
+            .where(hacker_team_association.c.hacker_id == Hacker.id)
+            .scalar_subquery()
+        )
+        columns.append(
+            func.coalesce(team_ids, sql_cast(array([]), ARRAY(PG_UUID(as_uuid=True)))).label("team_ids")
+        )
+
+    return select(*columns)
+
+
+class HackerRepository:
+    async def get_all_hackers(
+        self,
+        limit: int,
+        after: Optional[Tuple[datetime, UUID]] = None,
+        fields: Optional[Collection[str]] = None,
+    ) -> List[Row]:
         """
-        Метод для получения всех хакеров.
-        Возвращает список хакеров из базы данных.
+        Метод для получения страницы хакеров (keyset-пагинация по (created_at, id)).
+        Возвращает плоские строки (id, user_id, name, created_at, roles, team_ids) одним запросом;
+        при заданном fields — только запрошенные поля и (id, created_at).
         """
-        stmt = select(Hacker)
+        stmt = _hacker_projection(fields).order_by(Hacker.created_at, Hacker.id).limit(limit)
 
-        async with self._sessionmaker() as session:
+        if after:
+            stmt = stmt.where(tuple_(Hacker.created_at, Hacker.id) > tuple_(*after))
+
+        async with session_scope() as session:
             resp = await session.execute(stmt)
+            return list(resp.fetchall())
+
+    async def stream_all_hackers(self, batch_size: int) -> AsyncIterator[Row]:
+        """
+        Потоковая выгрузка всех хакеров через серверный курсор.
+
+        Использует собственную сессию: поток живёт дольше обработчика запроса.
+        """
+        stmt = _hacker_projection().order_by(Hacker.created_at, Hacker.id).execution_options(yield_per=batch_size)
 
-            rows = resp.fetchall()  # Извлекаем все строки
-            hackers = [row[0] for row in rows]  # Преобразуем их в список объектов Hacker
-            return hackers
+        async with pg_connection()() as session:
+            result = await session.stream(stmt)
+            async for row in result:
+                yield row
 
     async def upsert_hacker(self, user_id: UUID, name: str) -> Optional[UUID]:
         """
-        Создание или обновление хакера без ролей
+        Создание или обновление хакера без ролей одним запросом
+        INSERT ... ON CONFLICT (user_id) DO UPDATE ... RETURNING id.
         """
-        try:
-            async with self._sessionmaker() as session:
-                async with session.begin():
-                    # Проверяем существующего хакера
-                    get_stmt = select(Hacker).where(Hacker.user_id == user_id)
-                    result = await session.execute(get_stmt)
-                    existing_hacker = result.scalar_one_or_none()
-                    
-                    if existing_hacker:
-                        # Если хакер существует, обновляем его
-                        update_stmt = update(Hacker).where(
-                            Hacker.id == existing_hacker.id
-                        ).values(
-                            name=name,
-                            updated_at=datetime.utcnow()
-                        )
-                        await session.execute(update_stmt)
-                        return existing_hacker.id
-                    else:
-                        # Если хакера нет, создаем нового
-                        new_hacker = Hacker(
-                            user_id=user_id,
-                            name=name,
-                            created_at=datetime.utcnow(),
-                            updated_at=datetime.utcnow()
-                        )
-                        session.add(new_hacker)
-                        await session.flush()
-                        return new_hacker.id
-                    
-        except Exception as e:
-            logger.error(f"Error in upsert_hacker: {e}")
-            return None
-
-    async def update_hacker_roles(self, hacker_id: UUID, role_ids: List[UUID]) -> bool:
+        now = datetime.utcnow()
+        stmt = (pg_insert(Hacker)
+                .values(user_id=user_id, name=name, created_at=now, updated_at=now)
+                .on_conflict_do_update(
+                    constraint="uq_hacker_user_id",
+                    set_={"name": name, "updated_at": now},
+                )
+                .returning(Hacker.id))
+
+        async with session_scope() as session:
+            result = await session.execute(stmt)
+            return result.scalar_one()
+
+    async def bulk_upsert_hackers(
+        self,
+        hackers: List[Tuple[int, UUID, str, bool]],
+        roles: List[Tuple[UUID, UUID]],
+    ) -> List[Row]:
         """
-        Обновление ролей хакера по их ID из списка доступных ролей.
+        Массовое создание или обновление хакеров.
+
+        Строки (row_no, user_id, name, set_roles) и связи (user_id, role_id) заливаются
+        через COPY во временные таблицы, после чего сливаются в hacker одним
+        INSERT ... SELECT ... ON CONFLICT (user_id) DO UPDATE. Для строк с set_roles
+        набор ролей заменяется на переданный. user_id во входных строках уникальны.
+
+        :returns строки (id, user_id, inserted); inserted ложно для обновлённых хакеров
         """
-        try:
-            async with self._sessionmaker() as session:
-                async with session.begin():
-                    # Получаем хакера
-                    hacker_stmt = select(Hacker).where(cast("ColumnElement[bool]", Hacker.id == hacker_id)).limit(1)
-                    hacker_result = await session.execute(hacker_stmt)
-                    hacker_row = hacker_result.fetchone()
-                    
-                    if not hacker_row:
-                        return False
-                        
-                    hacker = hacker_row[0]
-                        
-                    # Получаем роли по указанным ID
-                    role_stmt = select(Role).where(Role.id.in_(role_ids))
-                    role_result = await session.execute(role_stmt)
-                    roles = role_result.scalars().all()
-                    
-                    # Устанавливаем новые роли для хакера
-                    hacker.roles = roles
-                    
-                    return True
-                    
-        except IntegrityError as e:
-            logger.error(f"IntegrityError in update_hacker_roles: {e}")
-            return False
-        except Exception as e:
-            logger.error(f"Error in update_hacker_roles: {e}")
-            return False
+        now = datetime.utcnow()
+        merge = (
+            pg_insert(Hacker)
+            .from_select(
+                ["id", "user_id", "name", "created_at", "updated_at"],
+                select(func.gen_random_uuid(), stage_hacker.c.user_id, stage_hacker.c.name, literal(now), literal(now)),
+            )
+        )
+        merge = (merge
+                 .on_conflict_do_update(
+                     constraint="uq_hacker_user_id",
+                     set_={"name": merge.excluded.name, "updated_at": merge.excluded.updated_at},
+                 )
+                 .returning(Hacker.id, Hacker.user_id, literal_column("xmax = 0").label("inserted")))
 
-    async def get_hacker_by_id(self, hacker_id: UUID) -> Optional[Hacker]:
+        # Лишние связи удаляются только у хакеров, для которых передан набор ролей
+        delete_stale_roles = (
+            delete(hacker_role_association)
+            .where(hacker_role_association.c.hacker_id == Hacker.id,
+                   Hacker.user_id == stage_hacker.c.user_id,
+                   stage_hacker.c.set_roles,
+                   ~exists().where(stage_hacker_role.c.user_id == stage_hacker.c.user_id,
+                                   stage_hacker_role.c.role_id == hacker_role_association.c.role_id))
+        )
+        insert_roles = (
+            pg_insert(hacker_role_association)
+            .from_select(
+                ["hacker_id", "role_id"],
+                select(Hacker.id, stage_hacker_role.c.role_id).where(Hacker.user_id == stage_hacker_role.c.user_id),
+            )
+            .on_conflict_do_nothing()
+        )
+
+        async with session_scope() as session:
+            await copy_to_staging(session, stage_hacker, hackers)
+            await copy_to_staging(session, stage_hacker_role, roles)
+
+            merged = list((await session.execute(merge)).fetchall())
+            await session.execute(delete_stale_roles)
+            await session.execute(insert_roles)
+
+        logger.info(f"bulk_upsert_hackers: {len(merged)} hackers, {len(roles)} role links")
+        return merged
+
+    async def update_hacker_roles(self, hacker_id: UUID, role_ids: List[UUID]) -> Tuple[bool, bool]:
         """
-        Получение хакера по ID.
+        Обновление ролей хакера по их ID одним запросом без загрузки хакера и ролей:
+        удаляются связи, которых нет в новом наборе, и добавляются недостающие
+        (ON CONFLICT DO NOTHING). Строка хакера не изменяется.
+
+        :returns (найден ли хакер, изменился ли набор ролей)
         """
-        stmt = select(Hacker).where(cast("ColumnElement[bool]", Hacker.id == hacker_id)).limit(1)
+        wanted = literal(list(role_ids), ARRAY(PG_UUID(as_uuid=True)))
+        hacker_exists = exists().where(Hacker.id == hacker_id)
 
-        async with self._sessionmaker() as session:
-            resp = await session.execute(stmt)
-            row = resp.fetchone()
-            return row[0] if row else None
+        deleted = (
+            delete(hacker_role_association)
+            .where(hacker_role_association.c.hacker_id == hacker_id,
+                   hacker_role_association.c.role_id != all_(wanted))
+            .returning(hacker_role_association.c.role_id)
+            .cte("deleted")
+        )
+        inserted = (
+            pg_insert(hacker_role_association)
+            .from_select(
+                ["hacker_id", "role_id"],
+                select(Hacker.id, Role.id).where(Hacker.id == hacker_id, Role.id == any_(wanted)),
+            )
+            .on_conflict_do_nothing()
+            .returning(hacker_role_association.c.role_id)
+            .cte("inserted")
+        )
+        stmt = select(
+            hacker_exists.label("hacker_exists"),
+            select(func.count()).select_from(deleted).scalar_subquery().label("deleted"),
+            select(func.count()).select_from(inserted).scalar_subquery().label("inserted"),
+        )
+
+        async with session_scope() as session:
+            row = (await session.execute(stmt)).one()
+
+        if not row.hacker_exists:
+            return False, False
 
-    async def get_hacker_by_user_id(self, user_id: UUID) -> Optional[Hacker]:
+        return True, bool(row.deleted or row.inserted)
+
+    async def get_hacker_by_id(self, hacker_id: UUID) -> Optional[Hacker]:
         """
-        Получение хакера по user_id.
+        Получение хакера по ID.
         """
-        stmt = select(Hacker).where(cast("ColumnElement[bool]", Hacker.user_id == user_id)).limit(1)
+        stmt = (select(Hacker)
+                .where(cast("ColumnElement[bool]", Hacker.id == hacker_id))
+                .options(*loader_options(Hacker, LoadProfile.DETAIL))
+                .limit(1))
 
-        async with self._sessionmaker() as session:
+        async with session_scope() as session:
             resp = await session.execute(stmt)
             row = resp.fetchone()
             return row[0] if row else None
 
-    async def update_hacker_roles_by_names(self, hacker_id: UUID, role_names: List[str]) -> bool:
+    async def get_hacker_id_by_user_id(self, user_id: UUID) -> Optional[UUID]:
         """
-        Обновление ролей хакера по их именам из списка доступных ролей.
+        Получение id хакера по user_id без загрузки самого хакера (по уникальному индексу user_id).
         """
-        try:
-            async with self._sessionmaker() as session:
-                async with session.begin():
-                    # Получаем хакера
-                    hacker_stmt = select(Hacker).where(cast("ColumnElement[bool]", Hacker.id == hacker_id)).limit(1)
-                    hacker_result = await session.execute(hacker_stmt)
-                    hacker_row = hacker_result.fetchone()
-                    
-                    if not hacker_row:
-                        return False
-                        
-                    hacker = hacker_row[0]
-                        
-                    # Получаем роли по их именам
-                    role_stmt = select(Role).where(Role.name.in_(role_names))
-                    role_result = await session.execute(role_stmt)
-                    roles = role_result.scalars().all()
-                    
-                    # Проверяем, найдены ли все роли
-                    if len(roles) != len(role_names):
-                        logger.warning(f"Не все роли найдены. Запрошено: {role_names}, найдено: {[role.name for role in roles]}")
-                    
-                    # Устанавливаем новые роли для хакера
-                    hacker.roles = roles
-                    
-                    return True
-                    
-        except IntegrityError as e:
-            logger.error(f"IntegrityError in update_hacker_roles_by_names: {e}")
-            return False
-        except Exception as e:
-            logger.error(f"Error in update_hacker_roles_by_names: {e}")
-            return False
+        stmt = select(Hacker.id).where(cast("ColumnElement[bool]", Hacker.user_id == user_id))
+
+        async with session_scope() as session:
+            return (await session.execute(stmt)).scalar_one_or_none()
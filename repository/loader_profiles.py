@@ -0,0 +1,53 @@
+import enum
+from typing import Dict, Tuple, Type
+
+from sqlalchemy.orm import selectinload
+from sqlalchemy.orm.interfaces import ORMOption
+
+from persistent.db.hackathon import Hackathon
+from persistent.db.hacker import Hacker
+from persistent.db.role import Role
+from persistent.db.team import Team
+from persistent.db.winner_solution import WinnerSolution
+
+
+# Профили загрузки связей. Связи в моделях по умолчанию не загружаются (lazy='raise'),
+# каждый запрос репозитория явно выбирает нужный профиль.
+class LoadProfile(str, enum.Enum):
+    # Списки: DTO списков строятся из колонок сущности (проекции), связи не загружаются,
+    # а обращение к ним в списке падает на lazy='raise', а не превращается в N+1
+    LIST = "list"
+    DETAIL = "detail"  # Карточка сущности: связи, которые отдаёт её DTO
+
+
+_PROFILES: Dict[type, Dict[LoadProfile, Tuple[ORMOption, ...]]] = {
+    Hacker: {
+        LoadProfile.LIST: (),
+        LoadProfile.DETAIL: (
+            selectinload(Hacker.roles).load_only(Role.name),
+            selectinload(Hacker.teams).load_only(Team.id),
+        ),
+    },
+    Team: {
+        LoadProfile.LIST: (),
+        LoadProfile.DETAIL: (
+            selectinload(Team.hackers).load_only(Hacker.id),
+        ),
+    },
+    # DTO хакатона и решения не содержат связей ни в списке, ни в карточке
+    Hackathon: {
+        LoadProfile.LIST: (),
+        LoadProfile.DETAIL: (),
+    },
+    WinnerSolution: {
+        LoadProfile.LIST: (),
+        LoadProfile.DETAIL: (),
+    },
+}
+
+
+def loader_options(entity: Type, profile: LoadProfile) -> Tuple[ORMOption, ...]:
+    """
+    Возвращает опции загрузки связей для сущности в указанном профиле.
+    """
+    return _PROFILES[entity][profile]
@@ -0,0 +1,22 @@
+from typing import Collection, List, Optional, Sequence
+
+from sqlalchemy.orm import InstrumentedAttribute
+
+# Колонки keyset-пагинации: нужны для курсора, поэтому выбираются всегда
+KEYSET_COLUMNS = ("id", "created_at")
+
+
+def sparse_columns(
+    entity: type,
+    fields: Optional[Collection[str]],
+    columns: Sequence[str],
+) -> List[InstrumentedAttribute]:
+    """
+    Колонки entity для выборки с разреженным набором полей (fields=).
+
+    Из fields берутся только простые колонки из columns (вычисляемые поля
+    проекции добавляет сам репозиторий); None — все колонки.
+    """
+    names = columns if fields is None else [name for name in columns if name in fields]
+
+    return [getattr(entity, name) for name in dict.fromkeys([*KEYSET_COLUMNS, *names])]
@@ -1,48 +1,37 @@
 from typing import List, Optional
 from uuid import UUID
 
-from sqlalchemy import cast, insert, select
-from sqlalchemy.exc import IntegrityError
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy import Row, cast, select
+from sqlalchemy.dialects.postgresql import insert
 
-from infrastructure.db.connection import pg_connection
+from infrastructure.db.connection import session_scope
 from persistent.db.role import Role
 
 
 class RoleRepository:
-    def __init__(self) -> None:
-        self._sessionmaker = pg_connection()
-
     async def upsert_role(self, name: str) -> Optional[UUID]:
         """
         Создание или обновление роли в базе данных.
+
+        :returns None Роль с таким именем уже существует
         """
         stmt = insert(Role).values({
             "name": name,
-        })
-        
-        async with self._sessionmaker() as session:
-            result = await session.execute(stmt)
-            role_id = result.inserted_primary_key[0]
-
-            try:
-                await session.commit()
-            except IntegrityError as error:
-                await session.rollback()
-                return None
+        }).on_conflict_do_nothing(index_elements=[Role.name]).returning(Role.id)
 
-        return role_id
+        async with session_scope() as session:
+            result = await session.execute(stmt)
+            return result.scalar_one_or_none()
 
-    async def get_all_roles(self) -> List[Role]:
+    async def get_all_roles(self) -> List[Row]:
         """
-        Получение всех ролей из базы данных.
+        Получение всех ролей (id, name) из базы данных.
         """
-        stmt = select(Role)
+        stmt = select(Role.id, Role.name)
 
-        async with self._sessionmaker() as session:
+        async with session_scope() as session:
             resp = await session.execute(stmt)
-
-        return [row[0] for row in resp.fetchall()]
+            return list(resp.fetchall())
 
     async def get_role_by_id(self, role_id: UUID) -> Optional[Role]:
         """
@@ -50,8 +39,7 @@ class RoleRepository:
         """
         stmt = select(Role).where(cast("ColumnElement[bool]", Role.id == role_id)).limit(1)
 
-        async with self._sessionmaker() as session:
+        async with session_scope() as session:
             resp = await session.execute(stmt)
-
-        row = resp.fetchone()
-        return row[0] if row else None
\ No newline at end of file
+            row = resp.fetchone()
+            return row[0] if row else None
\ No newline at end of file
@@ -1,132 +1,352 @@
-from typing import Tuple, cast, List, Optional
+from datetime import datetime
+from typing import AsyncIterator, Collection, Tuple, cast, List, Optional
 
 from loguru import logger
 from sqlalchemy.exc import IntegrityError
 
-from infrastructure.db.connection import pg_connection
+from infrastructure.db.bulk import copy_to_staging
+from infrastructure.db.connection import pg_connection, session_scope
 from persistent.db.hacker import Hacker
+from persistent.db.relations import hacker_team_association
+from persistent.db.staging import stage_team, stage_team_member
 from persistent.db.team import Team
-from sqlalchemy import ColumnElement, select, delete, UUID
-from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy import (ColumnElement, Row, Select, any_, exists, func, literal, literal_column, null, select, tuple_,
+                        update, delete, UUID)
+from sqlalchemy.dialects.postgresql import ARRAY, insert
+from sqlalchemy.dialects.postgresql import UUID as PG_UUID
 from sqlalchemy.orm import selectinload
 
+from repository.projections import sparse_columns
 
-class TeamRepository:
-    def __init__(self) -> None:
-        self._sessionmaker = pg_connection()
+# Простые колонки проекции команды, доступные через fields=
+TEAM_COLUMNS = ("id", "owner_id", "name", "max_size")
+
+
+def _team_projection(fields: Optional[Collection[str]] = None) -> Select:
+    """
+    Плоская выборка команды с id участников, агрегированными в массив (без ORM-объектов).
+
+    Если hacker_ids не запрошены, соединение со связями и группировка не выполняются.
+    """
+    stmt = select(*sparse_columns(Team, fields, TEAM_COLUMNS))
+
+    if fields is not None and "hacker_ids" not in fields:
+        return stmt
+
+    hacker_ids = func.array_remove(
+        func.array_agg(hacker_team_association.c.hacker_id), null(),
+        type_=ARRAY(PG_UUID(as_uuid=True)),
+    )
+
+    return (
+        stmt.add_columns(hacker_ids.label("hacker_ids"))
+        .select_from(Team)
+        .outerjoin(hacker_team_association, hacker_team_association.c.team_id == Team.id)
+        .group_by(Team.id)
+    )
 
-    async def get_all_teams(self) -> List[Team]:
+
+class TeamRepository:
+    async def get_all_teams(
+        self,
+        limit: int,
+        after: Optional[Tuple[datetime, UUID]] = None,
+        fields: Optional[Collection[str]] = None,
+    ) -> List[Row]:
         """
-        Получение всех команд из базы данных.
+        Получение страницы команд одним запросом (keyset-пагинация по (created_at, id)).
+
+        Каждая строка содержит id, owner_id, name, max_size, created_at и hacker_ids;
+        при заданном fields — только запрошенные поля и (id, created_at).
         """
-        stmt = select(Team)
+        stmt = _team_projection(fields).order_by(Team.created_at, Team.id).limit(limit)
 
-        async with self._sessionmaker() as session:
+        if after:
+            stmt = stmt.where(tuple_(Team.created_at, Team.id) > tuple_(*after))
+
+        async with session_scope() as session:
             resp = await session.execute(stmt)
+            return list(resp.fetchall())
+
+    async def stream_all_teams(self, batch_size: int) -> AsyncIterator[Row]:
+        """
+        Потоковая выгрузка всех команд через серверный курсор.
 
-            rows = resp.fetchall()  # Извлекаем все строки
-            teams = [row[0] for row in rows]  # Преобразуем их в список объектов Hacker
-            return teams
+        Использует собственную сессию: поток живёт дольше обработчика запроса.
+        """
+        stmt = _team_projection().order_by(Team.created_at, Team.id).execution_options(yield_per=batch_size)
+
+        async with pg_connection()() as session:
+            result = await session.stream(stmt)
+            async for row in result:
+                yield row
 
     async def create_team(self, owner_id: UUID, name: str, max_size: int) -> Optional[UUID]:
         """
         Создание новой команды в базе данных.
+
+        :returns None Команда с таким владельцем и названием уже существует
         """
         stmt = insert(Team).values({
             "owner_id": owner_id,
             "name": name,
             "max_size": max_size,
-        })
+        }).on_conflict_do_nothing(index_elements=[Team.owner_id, Team.name]).returning(Team.id)
 
-        async with self._sessionmaker() as session:
+        async with session_scope() as session:
             result = await session.execute(stmt)
-            team_id = result.inserted_primary_key[0]
-
-            try:
-                await session.commit()
-            except IntegrityError as error:
-                await session.rollback()
-                return None
+            return result.scalar_one_or_none()
 
-        return team_id
-
-    async def add_hacker_to_team(self, team_id: UUID, hacker: Hacker) -> Tuple[Optional[Team], int]:
+    async def add_hacker_to_team(self, team_id: UUID, hacker_id: UUID) -> int:
         """
-        Добавление участника в команду.
+        Добавление участника в команду одним условным запросом.
+
+        Место в команде резервируется атомарным UPDATE счётчика member_count
+        (условие member_count < max_size перепроверяется под блокировкой строки),
+        и только при успехе вставляется связь. Состав команды не загружается.
 
+        :returns 1 Участник добавлен
         :returns -1 Команда не найдена
         :returns -2 Команда уже заполнена
+        :returns -3 Хакер уже в команде
+        :returns -4 Хакер не найден
         """
-        async with self._sessionmaker() as session:
-            stmt = select(Team).where(cast("ColumnElement[bool]", Team.id == team_id)).limit(1)
-            resp = await session.execute(stmt)
-            row = resp.fetchone()
-            
-            if not row:
-                return None, -1
-                
-            team = row[0]
-            
-            if len(team.hackers) >= team.max_size:
-                return None, -2
-                
-            team.hackers.append(hacker)
-            await session.commit()
-            
-            return team, 1
-
-    async def get_team_by_id(self, team_id: UUID) -> Optional[Team]:
-        """
-        Получение команды по её идентификатору.
-        """
-        stmt = select(Team).where(cast("ColumnElement[bool]", Team.id == team_id)).limit(1)
-
-        async with self._sessionmaker() as session:
-            resp = await session.execute(stmt)
+        is_member = exists().where(
+            hacker_team_association.c.team_id == team_id,
+            hacker_team_association.c.hacker_id == hacker_id,
+        )
+        hacker_exists = exists().where(Hacker.id == hacker_id)
+
+        reserved = (
+            update(Team)
+            .where(Team.id == team_id, Team.member_count < Team.max_size, hacker_exists, ~is_member)
+            .values(member_count=Team.member_count + 1, updated_at=datetime.utcnow())
+            .returning(Team.id)
+            .cte("reserved")
+        )
+        joined = (
+            insert(hacker_team_association)
+            .from_select(
+                ["hacker_id", "team_id"],
+                select(literal(hacker_id, PG_UUID(as_uuid=True)), reserved.c.id),
+            )
+            .on_conflict_do_nothing()
+            .returning(hacker_team_association.c.team_id)
+            .cte("joined")
+        )
+        stmt = select(
+            select(func.count()).select_from(reserved).scalar_subquery().label("reserved"),
+            select(func.count()).select_from(joined).scalar_subquery().label("joined"),
+            exists().where(Team.id == team_id).label("team_exists"),
+            hacker_exists.label("hacker_exists"),
+            is_member.label("is_member"),
+        )
+
+        async with session_scope() as session:
+            row = (await session.execute(stmt)).one()
+
+            if row.joined:
+                return 1
+
+            if row.reserved:
+                # Гонка одного и того же хакера: место зарезервировано, но связь уже вставлена
+                # параллельным запросом. Возвращаем зарезервированное место.
+                release = (update(Team)
+                           .where(Team.id == team_id)
+                           .values(member_count=Team.member_count - 1))
+                await session.execute(release)
+                return -3
+
+        if not row.team_exists:
+            return -1
+        if not row.hacker_exists:
+            return -4
+        if row.is_member:
+            return -3
 
-        row = resp.fetchone()
-        return row[0] if row else None
+        return -2
 
-    async def get_team_by_name(self, name: str) -> Optional[Team]:
+    async def bulk_upsert_teams(
+        self,
+        teams: List[Tuple[int, UUID, str, int]],
+        members: List[Tuple[int, UUID]],
+    ) -> Tuple[List[int], List[int], List[Row], List[UUID]]:
         """
-        Получение команды по её имени.
+        Массовое создание или обновление команд с участниками.
+
+        Строки (row_no, owner_id, name, max_size) и участники (row_no, hacker_id)
+        заливаются через COPY во временные таблицы. Затем:
+        1. отбрасываются строки с несуществующими хакерами;
+        2. существующие команды из пачки блокируются (FOR UPDATE, в порядке id),
+           чтобы параллельные вступления не изменили member_count до конца транзакции;
+        3. отбрасываются строки, где новым участникам не хватит мест при новом
+           max_size, — такая строка не применяется целиком;
+        4. команды сливаются в team по (owner_id, name); max_size существующей
+           команды не уменьшается ниже её member_count;
+        5. участники добавляются только в команды, где хватает мест на всех новых,
+           member_count увеличивается тем же запросом.
+
+        :returns (row_no строк с несуществующими хакерами,
+                  row_no строк, участники которых не помещаются в команду,
+                  строки (id, owner_id, name, inserted) слитых команд,
+                  id команд, в которые участники не поместились после слияния)
+        """
+        unknown_members = exists().where(
+            stage_team_member.c.row_no == stage_team.c.row_no,
+            ~exists().where(Hacker.id == stage_team_member.c.hacker_id),
+        )
+        reject_unknown = delete(stage_team).where(unknown_members).returning(stage_team.c.row_no)
+
+        lock_existing = (
+            select(Team.id)
+            .where(Team.owner_id == stage_team.c.owner_id, Team.name == stage_team.c.name)
+            .order_by(Team.id)
+            .with_for_update(of=Team)
+        )
+
+        # Новые участники — ещё не состоящие именно в этой команде: team в подзапросах
+        # явно коррелирован со строкой внешнего DELETE ... USING team
+        new_members = (
+            select(func.count(stage_team_member.c.hacker_id.distinct()))
+            .where(stage_team_member.c.row_no == stage_team.c.row_no,
+                   ~exists().where(hacker_team_association.c.team_id == Team.id,
+                                   hacker_team_association.c.hacker_id == stage_team_member.c.hacker_id)
+                   .correlate_except(hacker_team_association))
+            .correlate_except(stage_team_member)
+            .scalar_subquery()
+        )
+        reject_full = (
+            delete(stage_team)
+            .where(Team.owner_id == stage_team.c.owner_id,
+                   Team.name == stage_team.c.name,
+                   Team.member_count + new_members > stage_team.c.max_size)
+            .returning(stage_team.c.row_no)
+        )
+
+        now = datetime.utcnow()
+        merge = (
+            insert(Team)
+            .from_select(
+                ["id", "owner_id", "name", "max_size", "member_count", "created_at", "updated_at"],
+                select(func.gen_random_uuid(), stage_team.c.owner_id, stage_team.c.name, stage_team.c.max_size,
+                       literal(0), literal(now), literal(now)),
+            )
+        )
+        merge = (merge
+                 .on_conflict_do_update(
+                     index_elements=[Team.owner_id, Team.name],
+                     set_={"max_size": merge.excluded.max_size, "updated_at": merge.excluded.updated_at},
+                     where=Team.member_count <= merge.excluded.max_size,
+                 )
+                 .returning(Team.id, Team.owner_id, Team.name, literal_column("xmax = 0").label("inserted")))
+
+        async with session_scope() as session:
+            await copy_to_staging(session, stage_team, teams)
+            await copy_to_staging(session, stage_team_member, members)
+
+            rejected = list((await session.execute(reject_unknown)).scalars())
+            await session.execute(lock_existing)
+            # Отдельный запрос после блокировки видит member_count, зафиксированные до неё
+            rejected_full = list((await session.execute(reject_full)).scalars())
+            merged = list((await session.execute(merge)).fetchall())
+
+            full_team_ids = []
+            if merged:
+                full_team_ids = list((await session.execute(
+                    self._bulk_add_members_stmt([team.id for team in merged])
+                )).scalars())
+
+        logger.info(
+            f"bulk_upsert_teams: {len(merged)} teams, {len(rejected)} rejected, "
+            f"{len(rejected_full)} do not fit, {len(full_team_ids)} full"
+        )
+        return rejected, rejected_full, merged, full_team_ids
+
+    @staticmethod
+    def _bulk_add_members_stmt(team_ids: List[UUID]) -> Select:
+        """
+        Добавление участников из stage_team_member в слитые команды одним запросом.
+
+        Возвращает id команд, в которых не хватило мест на всех новых участников.
         """
-        stmt = select(Team).where(cast("ColumnElement[bool]", Team.name == name)).limit(1)
+        candidates = (
+            select(Team.id.label("team_id"), stage_team_member.c.hacker_id)
+            .distinct()
+            .where(stage_team_member.c.row_no == stage_team.c.row_no,
+                   Team.owner_id == stage_team.c.owner_id,
+                   Team.name == stage_team.c.name,
+                   Team.id == any_(literal(team_ids, ARRAY(PG_UUID(as_uuid=True)))),
+                   ~exists().where(hacker_team_association.c.team_id == Team.id,
+                                   hacker_team_association.c.hacker_id == stage_team_member.c.hacker_id))
+            .cte("candidates")
+        )
+        fits = (
+            select(candidates.c.team_id)
+            .join_from(candidates, Team, Team.id == candidates.c.team_id)
+            .group_by(candidates.c.team_id, Team.member_count, Team.max_size)
+            .having(Team.member_count + func.count() <= Team.max_size)
+            .cte("fits")
+        )
+        joined = (
+            insert(hacker_team_association)
+            .from_select(
+                ["hacker_id", "team_id"],
+                select(candidates.c.hacker_id, candidates.c.team_id)
+                .where(candidates.c.team_id.in_(select(fits.c.team_id))),
+            )
+            .on_conflict_do_nothing()
+            .returning(hacker_team_association.c.team_id)
+            .cte("joined")
+        )
+        added = select(joined.c.team_id, func.count().label("added")).group_by(joined.c.team_id).subquery()
+        counted = (
+            update(Team)
+            .where(Team.id == added.c.team_id)
+            .values(member_count=Team.member_count + added.c.added, updated_at=datetime.utcnow())
+            .returning(Team.id)
+            .cte("counted")
+        )
 
-        async with self._sessionmaker() as session:
+        # Ссылка на counted нужна, чтобы CTE с обновлением попал в запрос;
+        # на результат она не влияет: обновлённые команды всегда есть в fits
+        return (
+            select(candidates.c.team_id)
+            .where(candidates.c.team_id.not_in(select(fits.c.team_id)),
+                   ~exists().where(counted.c.id == candidates.c.team_id))
+            .distinct()
+        )
+
+    async def get_team_by_id(self, team_id: UUID) -> Optional[Row]:
+        """
+        Получение команды по её идентификатору (плоская строка с hacker_ids).
+        """
+        stmt = _team_projection().where(cast("ColumnElement[bool]", Team.id == team_id))
+
+        async with session_scope() as session:
             resp = await session.execute(stmt)
+            return resp.fetchone()
 
-        row = resp.fetchone()
-        return row[0] if row else None
-
-    async def get_teams_by_user_id(self, user_id: UUID) -> List[Team]:
-        """
-        Получение всех команд, в которых пользователь с указанным user_id является участником.
-        
-        Ищет хакера по user_id и возвращает все команды, в которых он состоит.
-        """
-        async with self._sessionmaker() as session:
-            # Сначала находим хакера по user_id
-            hacker_stmt = select(Hacker).where(cast("ColumnElement[bool]", Hacker.user_id == user_id))
-            hacker_result = await session.execute(hacker_stmt)
-            hacker_rows = hacker_result.fetchall()
-            
-            if not hacker_rows:
-                logger.warning(f"Хакер с user_id={user_id} не найден")
-                return []
-                
-            hacker = hacker_rows[0][0]
-            
-            # Получаем ID команд, в которых состоит хакер
-            team_ids = [team.id for team in hacker.teams]
-            
-            if not team_ids:
-                logger.info(f"Хакер с user_id={user_id} не состоит ни в одной команде")
-                return []
-                
-            # Загружаем полную информацию о командах, включая связанных хакеров
-            teams_stmt = select(Team).where(Team.id.in_(team_ids)).options(selectinload(Team.hackers))
-            teams_result = await session.execute(teams_stmt)
-            teams = [row[0] for row in teams_result.fetchall()]
-            
-            return teams
+    async def get_team_version(self, team_id: UUID) -> Optional[datetime]:
+        """
+        Время последнего изменения команды (для ETag); None — команды нет.
+
+        Изменение состава команды обновляет member_count, а вместе с ним и updated_at.
+        """
+        stmt = select(Team.updated_at).where(cast("ColumnElement[bool]", Team.id == team_id))
+
+        async with session_scope() as session:
+            return (await session.execute(stmt)).scalar_one_or_none()
+
+    async def get_teams_by_hacker_id(self, hacker_id: UUID) -> List[Row]:
+        """
+        Получение всех команд, в которых состоит хакер (плоские строки с hacker_ids).
+        """
+        member_of = (select(hacker_team_association.c.team_id)
+                     .where(hacker_team_association.c.hacker_id == hacker_id))
+        stmt = (_team_projection()
+                .where(Team.id.in_(member_of))
+                .order_by(Team.created_at, Team.id))
+
+        async with session_scope() as session:
+            resp = await session.execute(stmt)
+            return list(resp.fetchall())
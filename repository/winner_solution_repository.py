@@ -1,28 +1,62 @@
-from typing import List, Optional, cast
+from datetime import datetime
+from typing import AsyncIterator, Collection, List, Optional, Tuple, cast
 from loguru import logger
-from sqlalchemy import insert, select, delete, UUID, and_
-from sqlalchemy.exc import IntegrityError
-
-from infrastructure.db.connection import pg_connection
+from sqlalchemy import Row, exists, func, literal, literal_column, select, tuple_, delete, UUID, and_
+from sqlalchemy.dialects.postgresql import insert
+
+from infrastructure.db.bulk import copy_to_staging
+from infrastructure.db.connection import pg_connection, session_scope
+from persistent.db.hackathon import Hackathon
+from persistent.db.staging import stage_winner_solution
+from persistent.db.team import Team
 from persistent.db.winner_solution import WinnerSolution
+from repository.loader_profiles import LoadProfile, loader_options
+from repository.projections import sparse_columns
 
 
-class WinnerSolutionRepository:
-    def __init__(self) -> None:
-        self._sessionmaker = pg_connection()
+# Колонки призерского решения, доступные через fields=
+WINNER_SOLUTION_COLUMNS = (
+    "id", "win_money", "link_to_solution", "link_to_presentation", "can_share", "hackathon_id", "team_id",
+)
+
 
-    async def get_all_winner_solutions(self) -> List[WinnerSolution]:
+class WinnerSolutionRepository:
+    async def get_all_winner_solutions(
+        self,
+        limit: int,
+        after: Optional[Tuple[datetime, UUID]] = None,
+        fields: Optional[Collection[str]] = None,
+    ) -> List[Row]:
         """
-        Получение всех хакатонов.
+        Получение страницы призерских решений (keyset-пагинация по (created_at, id)).
+
+        Возвращает плоские строки только с запрошенными колонками (fields) и (id, created_at).
         """
-        stmt = select(WinnerSolution)
+        stmt = (select(*sparse_columns(WinnerSolution, fields, WINNER_SOLUTION_COLUMNS))
+                .order_by(WinnerSolution.created_at, WinnerSolution.id)
+                .limit(limit))
 
-        async with self._sessionmaker() as session:
+        if after:
+            stmt = stmt.where(tuple_(WinnerSolution.created_at, WinnerSolution.id) > tuple_(*after))
+
+        async with session_scope() as session:
             resp = await session.execute(stmt)
+            return list(resp.fetchall())
+
+    async def stream_all_winner_solutions(self, batch_size: int) -> AsyncIterator[Row]:
+        """
+        Потоковая выгрузка всех призерских решений через серверный курсор.
 
-            rows = resp.fetchall()  # Извлекаем все строки
-            winner_solutions = [row[0] for row in rows]  # Преобразуем их в список объектов Hacker
-            return winner_solutions
+        Использует собственную сессию: поток живёт дольше обработчика запроса.
+        """
+        stmt = (select(*sparse_columns(WinnerSolution, None, WINNER_SOLUTION_COLUMNS))
+                .order_by(WinnerSolution.created_at, WinnerSolution.id)
+                .execution_options(yield_per=batch_size))
+
+        async with pg_connection()() as session:
+            result = await session.stream(stmt)
+            async for row in result:
+                yield row
 
     async def create_winner_solution(
         self,
@@ -35,6 +69,8 @@ class WinnerSolutionRepository:
     ) -> Optional[UUID]:
         """
         Создание нового призерского решения.
+
+        :returns None Решение этой команды на этом хакатоне уже записано
         """
         stmt = insert(WinnerSolution).values({
             "hackathon_id": hackathon_id,
@@ -43,64 +79,112 @@ class WinnerSolutionRepository:
             "link_to_solution": link_to_solution,
             "link_to_presentation": link_to_presentation,
             "can_share": can_share,
-        })
+        }).on_conflict_do_nothing(
+            index_elements=[WinnerSolution.hackathon_id, WinnerSolution.team_id]
+        ).returning(WinnerSolution.id)
 
-        async with self._sessionmaker() as session:
-            # Добавление хакера
+        async with session_scope() as session:
             result = await session.execute(stmt)
-            winner_solution_id = result.inserted_primary_key[0]
-            try:
-                await session.commit()
-            except IntegrityError as error:
-                await session.rollback()
-                return None
+            return result.scalar_one_or_none()
 
-        return winner_solution_id
+    async def bulk_upsert_winner_solutions(
+        self, winner_solutions: List[Tuple[int, UUID, UUID, float, str, str, bool]]
+    ) -> List[Row]:
+        """
+        Массовое создание или обновление призерских решений.
+
+        Строки (row_no, hackathon_id, team_id, win_money, link_to_solution,
+        link_to_presentation, can_share) заливаются через COPY во временную таблицу
+        и сливаются в winner_solution по (hackathon_id, team_id). Строки с
+        несуществующими хакатоном или командой отбрасываются до вставки,
+        поэтому нарушение внешнего ключа не прерывает всю загрузку.
+
+        :returns строки (id, hackathon_id, team_id, inserted) слитых решений
+        """
+        staged = stage_winner_solution.c
+        now = datetime.utcnow()
+        merge = (
+            insert(WinnerSolution)
+            .from_select(
+                ["id", "hackathon_id", "team_id", "win_money", "link_to_solution", "link_to_presentation",
+                 "can_share", "created_at", "updated_at"],
+                select(func.gen_random_uuid(), staged.hackathon_id, staged.team_id, staged.win_money,
+                       staged.link_to_solution, staged.link_to_presentation, staged.can_share,
+                       literal(now), literal(now))
+                .where(exists().where(Hackathon.id == staged.hackathon_id),
+                       exists().where(Team.id == staged.team_id)),
+            )
+        )
+        merge = (merge
+                 .on_conflict_do_update(
+                     index_elements=[WinnerSolution.hackathon_id, WinnerSolution.team_id],
+                     set_={
+                         "win_money": merge.excluded.win_money,
+                         "link_to_solution": merge.excluded.link_to_solution,
+                         "link_to_presentation": merge.excluded.link_to_presentation,
+                         "can_share": merge.excluded.can_share,
+                         "updated_at": merge.excluded.updated_at,
+                     },
+                 )
+                 .returning(WinnerSolution.id, WinnerSolution.hackathon_id, WinnerSolution.team_id,
+                            literal_column("xmax = 0").label("inserted")))
+
+        async with session_scope() as session:
+            await copy_to_staging(session, stage_winner_solution, winner_solutions)
+            merged = list((await session.execute(merge)).fetchall())
+
+        logger.info(f"bulk_upsert_winner_solutions: {len(merged)} of {len(winner_solutions)} rows merged")
+        return merged
 
     async def get_winner_solution_by_id(self, solution_id: UUID) -> Optional[WinnerSolution]:
         """
         Получение призерского решения по ID.
         """
-        stmt = select(WinnerSolution).where(cast("ColumnElement[bool]", WinnerSolution.id == solution_id))
+        stmt = (select(WinnerSolution)
+                .where(cast("ColumnElement[bool]", WinnerSolution.id == solution_id))
+                .options(*loader_options(WinnerSolution, LoadProfile.DETAIL)))
 
-        async with self._sessionmaker() as session:
+        async with session_scope() as session:
             resp = await session.execute(stmt)
-
-        row = resp.fetchone()
-        return row[0] if row else None
+            row = resp.fetchone()
+            return row[0] if row else None
 
     async def get_winner_solutions_by_hackathon(self, hackathon_id: UUID) -> List[WinnerSolution]:
         """
         Получение всех призерских решений для конкретного хакатона.
         """
-        stmt = select(WinnerSolution).where(WinnerSolution.hackathon.id == hackathon_id)
+        stmt = (select(WinnerSolution)
+                .where(WinnerSolution.hackathon_id == hackathon_id)
+                .options(*loader_options(WinnerSolution, LoadProfile.LIST)))
 
-        async with self._sessionmaker() as session:
+        async with session_scope() as session:
             resp = await session.execute(stmt)
-
-        rows = resp.fetchall()
-        return [row[0] for row in rows]
+            rows = resp.fetchall()
+            return [row[0] for row in rows]
 
     async def get_winner_solutions_by_team(self, team_id: UUID) -> List[WinnerSolution]:
         """
         Получение всех призерских решений для конкретного хакатона.
         """
-        stmt = select(WinnerSolution).where(WinnerSolution.team.id == team_id)
+        stmt = (select(WinnerSolution)
+                .where(WinnerSolution.team_id == team_id)
+                .options(*loader_options(WinnerSolution, LoadProfile.LIST)))
 
-        async with self._sessionmaker() as session:
+        async with session_scope() as session:
             resp = await session.execute(stmt)
-
-        rows = resp.fetchall()
-        return [row[0] for row in rows]
+            rows = resp.fetchall()
+            return [row[0] for row in rows]
 
     async def get_winner_solutions_by_team_and_hackathon(self, team_id: UUID, hackathon_id: UUID) -> Optional[WinnerSolution]:
         """
         Получение всех призерских решений для конкретного хакатона.
         """
         stmt = (select(WinnerSolution)
-                .where(and_(WinnerSolution.team.id == team_id, WinnerSolution.hackathon.id == hackathon_id)).limit(1))
+                .where(and_(WinnerSolution.team_id == team_id, WinnerSolution.hackathon_id == hackathon_id))
+                .options(*loader_options(WinnerSolution, LoadProfile.DETAIL))
+                .limit(1))
 
-        async with self._sessionmaker() as session:
+        async with session_scope() as session:
             resp = await session.execute(stmt)
             row = resp.fetchall()
 
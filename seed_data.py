@@ -0,0 +1,35 @@
+import argparse
+import asyncio
+
+from dotenv import load_dotenv
+
+# .env загружается до импорта настроек
+load_dotenv()
+
+from infrastructure.db.connection import dispose_engine
+from services.synthetic_data_service import SeedConfig, SyntheticDataService
+
+
+def parse_args() -> SeedConfig:
+    defaults = SeedConfig()
+    parser = argparse.ArgumentParser(description="Заполнение базы синтетическими данными")
+    parser.add_argument("--seed", type=int, default=defaults.seed, help="Зерно генератора случайных чисел")
+    parser.add_argument("--hackers", type=int, default=defaults.hackers)
+    parser.add_argument("--teams", type=int, default=defaults.teams)
+    parser.add_argument("--hackathons", type=int, default=defaults.hackathons)
+    parser.add_argument("--winners-per-hackathon", type=int, default=defaults.winners_per_hackathon)
+    parser.add_argument("--batch-size", type=int, default=defaults.batch_size, help="Строк в одном COPY-батче")
+    parser.add_argument("--concurrency", type=int, default=defaults.concurrency, help="Батчей одновременно")
+
+    return SeedConfig(**vars(parser.parse_args()))
+
+
+async def main(config: SeedConfig) -> None:
+    try:
+        await SyntheticDataService(config).run()
+    finally:
+        await dispose_engine()
+
+
+if __name__ == "__main__":
+    asyncio.run(main(parse_args()))
@@ -1,24 +1,71 @@
 from datetime import datetime
 from typing import List, Optional, Tuple
 from loguru import logger
-from sqlalchemy import UUID
+from sqlalchemy import UUID, Row
 
 from persistent.db.hackathon import Hackathon
 from persistent.db.winner_solution import WinnerSolution
 from repository.hackathon_repository import HackathonRepository
+from services.single_flight import coalesce
+from utils.pagination import Keyset, paginate
+
+# Максимальная длина краткого описания задачи в списках хакатонов
+TASK_SUMMARY_LENGTH = 200
+
+
+def summarize_task(task_description: Optional[str]) -> Optional[str]:
+    """
+    Краткое описание задачи: первый абзац, обрезанный по границе слова до TASK_SUMMARY_LENGTH символов.
+    Миграция в init.sql заполняет старые строки тем же правилом — менять вместе.
+    """
+    if not task_description:
+        return task_description
+
+    paragraph = " ".join(task_description.strip().split("\n\n", 1)[0].split())
+    if len(paragraph) <= TASK_SUMMARY_LENGTH:
+        return paragraph
+
+    cut = paragraph[:TASK_SUMMARY_LENGTH - 1]
+    return (cut.rsplit(" ", 1)[0] or cut).rstrip(" ,.;:") + "…"
 
 
 class HackathonService:
     def __init__(self) -> None:
         self.hackathon_repository = HackathonRepository()
 
-    async def get_all_hackathons(self) -> List[Hackathon]:
+    @coalesce
+    async def get_all_hackathons(
+        self,
+        limit: int,
+        after: Optional[Keyset] = None,
+        fields: Optional[List[str]] = None,
+        version: Optional[int] = None,
+    ) -> Tuple[List[Row], Optional[str]]:
         """
-        Возвращает все хакатоны.
+        Возвращает страницу хакатонов (плоские строки с запрошенными полями)
+        и курсор следующей страницы.
+
+        version — версия списка, прочитанная вызывающим до данных. В чтении она
+        не участвует, но входит в ключ объединения: запрос, увидевший новую версию,
+        не присоединится к чтению, начатому до фиксации изменения, и не отдаст
+        старое тело под новым ETag (и не опубликует его в общий снимок).
         """
-        hackathons = await self.hackathon_repository.get_all_hackathons()
+        hackathons = await self.hackathon_repository.get_all_hackathons(limit + 1, after, fields)
 
-        return hackathons
+        return paginate(hackathons, limit)
+
+    @coalesce
+    async def get_hackathons_version(self) -> int:
+        """
+        Версия списка хакатонов для условных запросов.
+        """
+        return await self.hackathon_repository.get_hackathons_version()
+
+    async def get_hackathon_version(self, hackathon_id: UUID) -> Optional[datetime]:
+        """
+        Версия хакатона для условных запросов; None — хакатон не найден.
+        """
+        return await self.hackathon_repository.get_hackathon_version(hackathon_id)
 
     async def upsert_hackathon(
         self,
@@ -35,7 +82,7 @@ class HackathonService:
         Создаёт или обновляет хакатон.
         """
         hackathon_id = await self.hackathon_repository.upsert_hackathon(
-            name, task_description, start_of_registration,
+            name, task_description, summarize_task(task_description), start_of_registration,
             end_of_registration, start_of_hack, end_of_hack,
             amount_money, type
         )
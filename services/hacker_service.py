@@ -1,26 +1,41 @@
 from uuid import UUID
 from datetime import datetime
-from typing import List, Optional, Tuple
+from typing import AsyncIterator, List, Optional, Tuple
 from loguru import logger
-from sqlalchemy import String
+from sqlalchemy import Row, String
 
-from infrastructure.db.connection import pg_connection
+from infrastructure.cache.redis_cache import entity_cache, hacker_key
+from infrastructure.db.connection import pg_connection, run_after_commit
 from persistent.db.hacker import Hacker
 from persistent.db.role import RoleEnum
 from repository.hacker_repository import HackerRepository
+from services.identity_resolver import identity_resolver
+from services.role_service import RoleService
+from utils.bulk_input import BULK_CREATED, BULK_UPDATED, BulkRowResult, bulk_error
+from utils.pagination import Keyset, paginate
 
 
 class HackerService:
     def __init__(self) -> None:
         self.hacker_repository = HackerRepository()
+        self.role_service = RoleService()
 
-    async def get_all_hackers(self) -> List[Hacker]:
+    async def get_all_hackers(
+        self, limit: int, after: Optional[Keyset] = None, fields: Optional[List[str]] = None
+    ) -> Tuple[List[Row], Optional[str]]:
         """
-        Возвращает всех хакатонщиков.
+        Возвращает страницу хакатонщиков (плоские строки с ролями и id команд)
+        и курсор следующей страницы.
         """
-        hackers = await self.hacker_repository.get_all_hackers()
+        hackers = await self.hacker_repository.get_all_hackers(limit + 1, after, fields)
 
-        return hackers
+        return paginate(hackers, limit)
+
+    def stream_all_hackers(self, batch_size: int = 1000) -> AsyncIterator[Row]:
+        """
+        Потоково возвращает всех хакатонщиков для выгрузки.
+        """
+        return self.hacker_repository.stream_all_hackers(batch_size)
 
     async def upsert_hacker(self, user_id: UUID, name: str) -> Tuple[Optional[UUID], bool]:
         """
@@ -34,9 +49,63 @@ class HackerService:
         if hacker_id is None:
             logger.error(f"Не удалось создать или обновить хакатонщика с user_id={user_id}")
             return None, False
-            
+
+        await run_after_commit(lambda: entity_cache.invalidate(hacker_key(hacker_id)))
+        await identity_resolver.remember(user_id, hacker_id)
+
         return hacker_id, True
 
+    async def bulk_upsert_hackers(
+        self, rows: List[Tuple[int, UUID, str, Optional[List[str]]]]
+    ) -> List[BulkRowResult]:
+        """
+        Массово создаёт или обновляет хакатонщиков (row_no, user_id, name, role_names).
+
+        Если role_names не None, набор ролей хакатонщика заменяется на переданный.
+        Строки с неизвестными ролями и повторными user_id отклоняются.
+
+        Returns:
+            List[BulkRowResult]: результат по каждой строке
+        """
+        catalog = await self.role_service.get_catalog()
+
+        results, hackers, roles = [], [], []
+        row_by_user_id = {}
+        for row_no, user_id, name, role_names in rows:
+            if user_id in row_by_user_id:
+                results.append(bulk_error(row_no, f"user_id уже встречался в строке {row_by_user_id[user_id]}"))
+                continue
+
+            set_roles = role_names is not None
+            if set_roles:
+                role_ids, missing = catalog.resolve_names(role_names)
+                if missing:
+                    results.append(bulk_error(row_no, f"Неизвестные роли: {', '.join(missing)}"))
+                    continue
+                roles.extend((user_id, role_id) for role_id in set(role_ids))
+
+            row_by_user_id[user_id] = row_no
+            hackers.append((row_no, user_id, name, set_roles))
+
+        if not hackers:
+            return results
+
+        merged = await self.hacker_repository.bulk_upsert_hackers(hackers, roles)
+
+        for hacker in merged:
+            results.append(BulkRowResult(
+                row=row_by_user_id[hacker.user_id],
+                status=BULK_CREATED if hacker.inserted else BULK_UPDATED,
+                id=hacker.id,
+            ))
+
+        # Только что созданных хакеров в кэше нет; соответствие user_id -> id не меняется
+        updated_keys = [hacker_key(hacker.id) for hacker in merged if not hacker.inserted]
+        if updated_keys:
+            await run_after_commit(lambda: entity_cache.invalidate(*updated_keys))
+
+        return results
+
     async def get_hacker_by_id(self, hacker_id: UUID) -> Tuple[Hacker, bool]:
         """
         Возвращает хакера по ID.
@@ -50,39 +119,45 @@ class HackerService:
 
         return hacker, True
 
-    async def get_hacker_by_user_id(self, user_id: UUID) -> Tuple[Hacker, bool]:
+    async def get_hacker_id_by_user_id(self, user_id: UUID) -> Optional[UUID]:
         """
-        Возвращает хакера по user_id (UUID).
+        Возвращает id хакера по user_id через кэширующий IdentityResolver.
 
-        :returns False Хакер не найден
+        :returns None Хакер не найден
         """
-        hacker = await self.hacker_repository.get_hacker_by_user_id(user_id)
-
-        if not hacker:
-            return None, False
+        return await identity_resolver.resolve(user_id)
 
-        return hacker, True
-
-    async def update_hacker_roles(self, hacker_id: UUID, role_ids: List[UUID]) -> bool:
+    async def update_hacker_roles(self, hacker_id: UUID, role_ids: List[UUID]) -> Tuple[bool, bool]:
         """
         Метод для обновления ролей хакера.
 
-        :returns: False если произошла ошибка (хакер не найден или недопустимые роли)
+        :returns: (успешно ли выполнена операция, изменился ли набор ролей);
+                  False если хакер не найден
         """
-        return await self.hacker_repository.update_hacker_roles(hacker_id, role_ids)
-        
-    async def update_hacker_roles_by_user_id(self, user_id: UUID, role_names: List[str]) -> bool:
+        found, changed = await self.hacker_repository.update_hacker_roles(hacker_id, role_ids)
+
+        if changed:
+            await run_after_commit(lambda: entity_cache.invalidate(hacker_key(hacker_id)))
+
+        return found, changed
+
+    async def update_hacker_roles_by_user_id(self, user_id: UUID, role_names: List[str]) -> Tuple[bool, bool]:
         """
         Метод для обновления ролей хакера по user_id и именам ролей.
-        
-        :returns: False если произошла ошибка (хакер не найден или недопустимые роли)
+
+        :returns: (успешно ли выполнена операция, изменился ли набор ролей);
+                  False если хакер не найден
         """
-        # Сначала получаем хакера по user_id
-        hacker, found = await self.get_hacker_by_user_id(user_id)
-        
-        if not found:
+        # Сначала получаем id хакера по user_id
+        hacker_id = await self.get_hacker_id_by_user_id(user_id)
+
+        if not hacker_id:
             logger.error(f"Не удалось найти хакера с user_id={user_id}")
-            return False
-            
-        # Обновляем роли используя найденный hacker_id и имена ролей
-        return await self.hacker_repository.update_hacker_roles_by_names(hacker.id, role_names)
\ No newline at end of file
+            return False, False
+
+        # Имена ролей переводим в id по справочнику в памяти, без запроса к базе
+        role_ids, missing = await self.role_service.resolve_role_ids(role_names)
+        if missing:
+            logger.warning(f"Не все роли найдены. Запрошено: {role_names}, не найдено: {missing}")
+
+        return await self.update_hacker_roles(hacker_id, role_ids)
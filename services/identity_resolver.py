@@ -0,0 +1,83 @@
+from collections import OrderedDict
+from typing import Dict, Optional
+from uuid import UUID
+
+from infrastructure.cache.redis_cache import entity_cache, hacker_user_key
+from infrastructure.db.connection import run_after_commit
+from repository.hacker_repository import HackerRepository
+
+# Соответствий user_id -> id хакера в памяти процесса
+IDENTITY_CACHE_SIZE = 10000
+
+
+class IdentityResolver:
+    """
+    Соответствие user_id из токена -> id хакера.
+
+    Соответствие не меняется после создания хакера (upsert по user_id сохраняет id),
+    поэтому кэшируется без TTL и в LRU процесса, и вторым уровнем в Redis, общем
+    для воркеров (ключ на пользователя, объём ограничен числом хакеров).
+    В базу идёт только запрос id по уникальному индексу user_id.
+    Отсутствие хакера не кэшируется: он может быть создан следующим запросом.
+    """
+
+    def __init__(self, size: int = IDENTITY_CACHE_SIZE) -> None:
+        self.hacker_repository = HackerRepository()
+        self._size = size
+        self._cache: "OrderedDict[UUID, UUID]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def _put(self, user_id: UUID, hacker_id: UUID) -> None:
+        self._cache[user_id] = hacker_id
+        self._cache.move_to_end(user_id)
+        if len(self._cache) > self._size:
+            self._cache.popitem(last=False)
+
+    async def resolve(self, user_id: UUID | str) -> Optional[UUID]:
+        """
+        Возвращает id хакера по user_id.
+
+        :returns None Хакер не найден (или user_id не UUID)
+        """
+        try:
+            user_id = user_id if isinstance(user_id, UUID) else UUID(user_id)
+        except ValueError:
+            return None
+
+        hacker_id = self._cache.get(user_id)
+        if hacker_id is not None:
+            self._cache.move_to_end(user_id)
+            self.hits += 1
+            return hacker_id
+
+        self.misses += 1
+        cached = await entity_cache.get_value(hacker_user_key(user_id))
+        if cached is not None:
+            hacker_id = UUID(cached.decode())
+        else:
+            hacker_id = await self.hacker_repository.get_hacker_id_by_user_id(user_id)
+            if hacker_id is None:
+                return None
+            await entity_cache.set_value(hacker_user_key(user_id), str(hacker_id), expire=False)
+
+        self._put(user_id, hacker_id)
+        return hacker_id
+
+    async def remember(self, user_id: UUID | str, hacker_id: UUID) -> None:
+        """
+        Запоминает соответствие после фиксации транзакции, создавшей хакера.
+        """
+        user_id = user_id if isinstance(user_id, UUID) else UUID(user_id)
+
+        async def store() -> None:
+            self._put(user_id, hacker_id)
+            await entity_cache.set_value(hacker_user_key(user_id), str(hacker_id), expire=False)
+
+        await run_after_commit(store)
+
+    def stats(self) -> Dict[str, int]:
+        return {"hits": self.hits, "misses": self.misses, "size": len(self._cache)}
+
+
+identity_resolver = IdentityResolver()
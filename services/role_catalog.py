@@ -0,0 +1,68 @@
+import hashlib
+from types import MappingProxyType
+from typing import Iterable, List, Mapping, Optional, Sequence, Tuple
+from uuid import UUID
+
+from sqlalchemy import Row
+
+from persistent.db.role import RoleEnum
+
+# Допустимые имена ролей
+VALID_ROLE_NAMES = frozenset(role.value for role in RoleEnum)
+
+
+class RoleCatalog:
+    """
+    Неизменяемый снимок справочника ролей с индексами id -> роль и имя -> роль.
+
+    При изменении ролей снимок не модифицируется, а заменяется новым целиком.
+    """
+
+    def __init__(self, roles: Iterable[Row] = (), loaded: bool = True) -> None:
+        self._roles: Tuple[Row, ...] = tuple(roles)
+        self._by_id: Mapping[UUID, Row] = MappingProxyType({role.id: role for role in self._roles})
+        self._by_name: Mapping[str, Row] = MappingProxyType({role.name: role for role in self._roles})
+        self.loaded = loaded
+        # Отпечаток содержимого: одинаков у всех процессов с одним и тем же набором ролей
+        self.version = hashlib.sha1(
+            "|".join(sorted(f"{role.id}:{role.name}" for role in self._roles)).encode()
+        ).hexdigest()
+
+    @property
+    def roles(self) -> Sequence[Row]:
+        return self._roles
+
+    def get_by_id(self, role_id: UUID) -> Optional[Row]:
+        return self._by_id.get(role_id)
+
+    def get_by_name(self, name: str) -> Optional[Row]:
+        return self._by_name.get(name)
+
+    def resolve_names(self, names: Iterable[str]) -> Tuple[List[UUID], List[str]]:
+        """
+        Переводит имена ролей в id.
+
+        :returns (id найденных ролей, имена ненайденных ролей)
+        """
+        role_ids, missing = [], []
+        for name in names:
+            role = self._by_name.get(name)
+            if role is None:
+                missing.append(name)
+            else:
+                role_ids.append(role.id)
+
+        return role_ids, missing
+
+
+# Текущий снимок справочника процесса; до первой загрузки пустой и не загруженный
+_catalog = RoleCatalog(loaded=False)
+
+
+def get_role_catalog() -> RoleCatalog:
+    return _catalog
+
+
+def set_role_catalog(catalog: RoleCatalog) -> None:
+    global _catalog
+    _catalog = catalog
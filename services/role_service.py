@@ -1,22 +1,71 @@
 from typing import List, Optional, Tuple
 from uuid import UUID
 from loguru import logger
+from sqlalchemy import Row
 
+from infrastructure.db.connection import run_after_commit
 from persistent.db.role import Role, RoleEnum
 from repository.role_repository import RoleRepository
+from services.role_catalog import VALID_ROLE_NAMES, RoleCatalog, get_role_catalog, set_role_catalog
+from services.single_flight import coalesce
 
 
 class RoleService:
     def __init__(self) -> None:
         self.role_repository = RoleRepository()
 
-    async def get_all_roles(self) -> List[Role]:
+    async def refresh_catalog(self) -> RoleCatalog:
         """
-        Возвращает все роли.
+        Перечитывает справочник ролей из базы данных и заменяет снимок в памяти.
         """
         roles = await self.role_repository.get_all_roles()
-        
-        return roles
+        catalog = RoleCatalog(roles)
+        set_role_catalog(catalog)
+        logger.info(f"Справочник ролей загружен: {len(catalog.roles)} ролей")
+
+        return catalog
+
+    async def _refresh_after_commit(self) -> None:
+        """
+        Обновление справочника после фиксации изменения ролей.
+
+        Изменение уже зафиксировано, поэтому ошибка чтения не должна превращать
+        ответ в 500: она логируется, а снимок помечается устаревшим, и его
+        перечитает первое же обращение через get_catalog.
+        """
+        try:
+            await self.refresh_catalog()
+        except Exception:
+            logger.exception("Не удалось обновить справочник ролей, он будет перечитан при следующем обращении")
+            set_role_catalog(RoleCatalog(loaded=False))
+
+    async def get_catalog(self) -> RoleCatalog:
+        """
+        Возвращает справочник ролей, загружая его при первом обращении.
+        """
+        catalog = get_role_catalog()
+        if not catalog.loaded:
+            catalog = await self._load_catalog()
+
+        return catalog
+
+    @coalesce
+    async def _load_catalog(self) -> RoleCatalog:
+        """
+        Первая загрузка справочника: одновременные запросы на холодном старте читают его один раз.
+
+        Явный refresh_catalog (после изменения ролей) не объединяется с уже идущим чтением,
+        которое могло начаться до фиксации изменений.
+        """
+        return await self.refresh_catalog()
+
+    async def get_all_roles(self) -> List[Row]:
+        """
+        Возвращает все роли из справочника в памяти.
+        """
+        catalog = await self.get_catalog()
+
+        return list(catalog.roles)
 
     async def init_roles(self) -> None:
         """
@@ -26,19 +75,32 @@ class RoleService:
             role_name = role_enum.value
             role_id = await self.role_repository.upsert_role(role_name)
 
-    async def get_role_by_id(self, role_id: UUID) -> Tuple[Role, bool]:
+        await run_after_commit(self._refresh_after_commit)
+
+    async def get_role_by_id(self, role_id: UUID) -> Tuple[Row, bool]:
         """
         Получение роли по её идентификатору.
 
         :returns False Роль не найдена
         """
-        role = await self.role_repository.get_role_by_id(role_id)
+        catalog = await self.get_catalog()
+        role = catalog.get_by_id(role_id)
 
         if not role:
             return None, False
 
         return role, True
 
+    async def resolve_role_ids(self, role_names: List[str]) -> Tuple[List[UUID], List[str]]:
+        """
+        Переводит имена ролей в id по справочнику в памяти.
+
+        :returns (id найденных ролей, имена ненайденных ролей)
+        """
+        catalog = await self.get_catalog()
+
+        return catalog.resolve_names(role_names)
+
     async def upsert_role(self, role_name: str) -> Tuple[UUID, int]:
         """
         Создание или обновление роли.
@@ -46,8 +108,7 @@ class RoleService:
         :returns -1 Недопустимое имя роли
         :returns -2 Ошибка при создании роли
         """
-        valid_roles = [role.value for role in RoleEnum]
-        if role_name not in valid_roles:
+        if role_name not in VALID_ROLE_NAMES:
             logger.warning(f"Попытка создать недопустимую роль: '{role_name}'")
             return None, -1
 
@@ -55,4 +116,6 @@ class RoleService:
         if not role_id:
             return None, -2
 
-        return role_id, 1
\ No newline at end of file
+        await run_after_commit(self._refresh_after_commit)
+
+        return role_id, 1
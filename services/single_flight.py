@@ -0,0 +1,86 @@
+import asyncio
+from collections import defaultdict
+from functools import wraps
+from typing import Any, Awaitable, Callable, DefaultDict, Dict, Hashable, Tuple, TypeVar
+
+from infrastructure.db.connection import detached_context
+
+T = TypeVar("T")
+
+
+def _freeze(value: Any) -> Hashable:
+    """
+    Хешируемое представление аргумента (списки полей и т.п.) для ключа вызова.
+    """
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(item) for item in value)
+    if isinstance(value, (set, frozenset)):
+        return frozenset(_freeze(item) for item in value)
+    if isinstance(value, dict):
+        return tuple(sorted((key, _freeze(item)) for key, item in value.items()))
+
+    return value
+
+
+class SingleFlight:
+    """
+    Объединение одинаковых одновременных чтений.
+
+    Пока вызов с ключом (метод, аргументы) выполняется, повторные вызовы с тем же
+    ключом не идут в базу, а ждут его результат (или исключение). Вызов выполняется
+    отдельной задачей вне сессии запроса: он не видит незафиксированных изменений
+    запроса-инициатора и не прерывается, если этот запрос отменён.
+    """
+
+    def __init__(self) -> None:
+        self._flights: Dict[Tuple[str, Hashable], "asyncio.Task[Any]"] = {}
+        self._stats: DefaultDict[str, Dict[str, int]] = defaultdict(lambda: {"flights": 0, "coalesced": 0})
+
+    async def do(self, name: str, key: Hashable, call: Callable[[], Awaitable[T]]) -> T:
+        flight_key = (name, key)
+        flight = self._flights.get(flight_key)
+
+        if flight is None:
+            flight = asyncio.create_task(call(), context=detached_context())
+            self._flights[flight_key] = flight
+            flight.add_done_callback(lambda done: self._land(flight_key, done))
+            self._stats[name]["flights"] += 1
+        else:
+            self._stats[name]["coalesced"] += 1
+
+        # shield: отмена одного ожидающего не отменяет общий вызов
+        return await asyncio.shield(flight)
+
+    def _land(self, flight_key: Tuple[str, Hashable], flight: "asyncio.Task[Any]") -> None:
+        if self._flights.get(flight_key) is flight:
+            del self._flights[flight_key]
+
+        # Исключение помечается полученным, даже если все ожидающие были отменены
+        if not flight.cancelled():
+            flight.exception()
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        """
+        Число запросов в базу (flights) и присоединившихся к ним вызовов (coalesced) по методам.
+        """
+        return {name: dict(counters) for name, counters in self._stats.items()}
+
+
+single_flight = SingleFlight()
+
+
+def coalesce(method: Callable[..., Awaitable[T]]) -> Callable[..., Awaitable[T]]:
+    """
+    Декоратор метода сервиса: одинаковые одновременные вызовы выполняются один раз.
+
+    Ключ — имя метода и аргументы (без self: сервисы не хранят состояния).
+    Применяется только к чтениям.
+    """
+    name = method.__qualname__
+
+    @wraps(method)
+    async def wrapper(self: Any, *args: Any, **kwargs: Any) -> T:
+        key = (_freeze(args), _freeze(kwargs))
+        return await single_flight.do(name, key, lambda: method(self, *args, **kwargs))
+
+    return wrapper
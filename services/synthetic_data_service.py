@@ -0,0 +1,222 @@
+import asyncio
+from datetime import datetime, timedelta
+from random import Random
+from typing import Awaitable, Callable, Dict, List, Sequence, Tuple, TypeVar
+from uuid import UUID
+
+from loguru import logger
+from pydantic import BaseModel
+
+from persistent.db.role import RoleEnum
+from services.hackathon_service import HackathonService
+from services.hacker_service import HackerService
+from services.role_service import RoleService
+from services.team_service import TeamService
+from services.winner_solution_service import WinnerSolutionService
+from utils.bulk_input import BULK_ERROR, BulkRowResult
+
+T = TypeVar("T")
+
+FIRST_NAMES = [
+    "John", "Jane", "Alex", "Maria", "Wei", "Aisha", "Carlos", "Olga", "Hiroshi", "Fatima",
+    "Dmitry", "Sarah", "Mohammed", "Emma", "Raj", "Sophia", "Yuki", "Kwame", "Natasha", "Miguel",
+]
+LAST_NAMES = [
+    "Doe", "Smith", "Johnson", "Garcia", "Chen", "Patel", "Rodriguez", "Ivanova", "Tanaka", "Ahmed",
+    "Petrov", "Wilson", "Ali", "Brown", "Kumar", "Martinez", "Yamamoto", "Osei", "Romanova", "Hernandez",
+]
+TEAM_ADJECTIVES = ["Elite", "Binary", "Quantum", "Neural", "Pixel", "Cloud", "Syntax", "Data", "Code", "Async"]
+TEAM_NOUNS = ["Hackers", "Wizards", "Bandits", "Savants", "Aces", "Dynamos", "Coders", "Pirates", "Ninjas", "Crusaders"]
+HACKATHON_THEMES = ["Global", "AI Revolution", "Sustainable Tech", "Fintech Innovation", "Smart Cities",
+                    "HealthTech", "EdTech", "Open Source", "GameDev", "Cybersecurity"]
+HACKATHON_TYPES = ["offline", "online", "hybrid"]
+
+# Популярность ролей: бэкендеров и фронтендеров больше, чем администраторов
+ROLE_WEIGHTS = {
+    RoleEnum.BACKEND.value: 30,
+    RoleEnum.FRONTEND.value: 25,
+    RoleEnum.ML.value: 12,
+    RoleEnum.DESIGNER.value: 10,
+    RoleEnum.PM.value: 8,
+    RoleEnum.QA.value: 7,
+    RoleEnum.DEVOPS.value: 6,
+    RoleEnum.ADMIN.value: 2,
+}
+
+
+class SeedConfig(BaseModel):
+    seed: int = 42
+    hackers: int = 1000
+    teams: int = 200
+    hackathons: int = 20
+    winners_per_hackathon: int = 3
+    batch_size: int = 5000
+    concurrency: int = 4
+
+
+class SyntheticDataService:
+    """
+    Генератор синтетических данных заданного размера.
+
+    Все случайные значения генерируются заранее из одного Random(seed), поэтому
+    набор данных детерминирован и не зависит от порядка выполнения батчей.
+    Вставка идёт батчами через массовые (COPY) методы сервисов, батчи
+    выполняются параллельно, каждый в своей транзакции.
+    """
+
+    def __init__(self, config: SeedConfig) -> None:
+        self.config = config
+        self.random = Random(config.seed)
+        self.role_service = RoleService()
+        self.hacker_service = HackerService()
+        self.team_service = TeamService()
+        self.hackathon_service = HackathonService()
+        self.winner_solution_service = WinnerSolutionService()
+        self._semaphore = asyncio.Semaphore(config.concurrency)
+
+    async def run(self) -> Dict[str, int]:
+        """
+        Заполняет базу данными и возвращает число созданных или обновлённых сущностей.
+        """
+        logger.info(f"Seeding synthetic data: {self.config.model_dump()}")
+
+        await self.role_service.init_roles()
+        await self.role_service.refresh_catalog()
+
+        hacker_ids = await self._seed_hackers()
+        team_ids = await self._seed_teams(hacker_ids)
+        hackathon_ids = await self._seed_hackathons()
+        winner_solutions = await self._seed_winner_solutions(hackathon_ids, team_ids)
+
+        summary = {
+            "hackers": len(hacker_ids),
+            "teams": len(team_ids),
+            "hackathons": len(hackathon_ids),
+            "winner_solutions": winner_solutions,
+        }
+        logger.info(f"Seeding completed: {summary}")
+
+        return summary
+
+    def _uuid(self) -> UUID:
+        return UUID(int=self.random.getrandbits(128), version=4)
+
+    async def _limited(self, call: Callable[[], Awaitable[T]]) -> T:
+        async with self._semaphore:
+            return await call()
+
+    async def _run_batches(
+        self,
+        entity: str,
+        rows: Sequence[tuple],
+        bulk_upsert: Callable[[List[tuple]], Awaitable[List[BulkRowResult]]],
+    ) -> List[BulkRowResult]:
+        """
+        Делит строки на батчи и параллельно (не более concurrency одновременно)
+        передаёт их в массовый метод сервиса.
+        """
+        size = self.config.batch_size
+        batches = [list(rows[i:i + size]) for i in range(0, len(rows), size)]
+
+        async def load(batch: List[tuple]) -> List[BulkRowResult]:
+            results = await self._limited(lambda: bulk_upsert(batch))
+            logger.info(f"{entity}: batch of {len(batch)} rows loaded")
+            return results
+
+        results = [result for batch in await asyncio.gather(*map(load, batches)) for result in batch]
+
+        failed = [result for result in results if result.status == BULK_ERROR]
+        if failed:
+            logger.warning(f"{entity}: {len(failed)} rows failed, first error: {failed[0].error}")
+
+        return sorted((result for result in results if result.status != BULK_ERROR), key=lambda result: result.row)
+
+    async def _seed_hackers(self) -> List[UUID]:
+        role_names = list(ROLE_WEIGHTS)
+        role_weights = list(ROLE_WEIGHTS.values())
+
+        rows = []
+        for row_no in range(self.config.hackers):
+            name = f"{self.random.choice(FIRST_NAMES)} {self.random.choice(LAST_NAMES)}"
+            # Чаще одна роль, реже две-три
+            role_count = self.random.choices([1, 2, 3], weights=[60, 30, 10])[0]
+            roles = sorted(set(self.random.choices(role_names, weights=role_weights, k=role_count)))
+            rows.append((row_no, self._uuid(), name, roles))
+
+        results = await self._run_batches("hackers", rows, self.hacker_service.bulk_upsert_hackers)
+        return [result.id for result in results]
+
+    async def _seed_teams(self, hacker_ids: List[UUID]) -> List[UUID]:
+        if not hacker_ids:
+            return []
+
+        # Участники выбираются из перемешанного пула: большинство хакеров состоит
+        # не более чем в одной команде, часть — без команды
+        pool: List[UUID] = []
+        rows = []
+        for row_no in range(self.config.teams):
+            size = min(self.random.choices([1, 2, 3, 4, 5, 6], weights=[5, 15, 25, 25, 20, 10])[0], len(hacker_ids))
+            if len(pool) < size:
+                pool = self.random.sample(hacker_ids, len(hacker_ids))
+
+            owner_id, *member_ids = [pool.pop() for _ in range(size)]
+            max_size = size + self.random.randint(0, 2)
+            name = f"{self.random.choice(TEAM_ADJECTIVES)} {self.random.choice(TEAM_NOUNS)} #{row_no}"
+            rows.append((row_no, owner_id, name, max_size, member_ids))
+
+        results = await self._run_batches("teams", rows, self.team_service.bulk_upsert_teams)
+        return [result.id for result in results]
+
+    async def _seed_hackathons(self) -> List[UUID]:
+        first_start = datetime(2024, 1, 1)
+
+        hackathons = []
+        for i in range(self.config.hackathons):
+            start_of_registration = first_start + timedelta(days=self.random.randint(0, 3 * 365))
+            end_of_registration = start_of_registration + timedelta(days=self.random.randint(3, 21))
+            start_of_hack = end_of_registration + timedelta(days=self.random.randint(1, 7))
+            end_of_hack = start_of_hack + timedelta(days=self.random.randint(1, 14))
+            theme = self.random.choice(HACKATHON_THEMES)
+            hackathons.append({
+                "name": f"{theme} Hackathon #{i}",
+                "task_description": f"{theme}: build a working prototype and present it to the jury.",
+                "start_of_registration": start_of_registration,
+                "end_of_registration": end_of_registration,
+                "start_of_hack": start_of_hack,
+                "end_of_hack": end_of_hack,
+                "amount_money": float(self.random.randrange(5000, 50001, 500)),
+                "type": self.random.choice(HACKATHON_TYPES),
+            })
+
+        # Массового метода для хакатонов нет: их немного, upsert выполняются параллельно
+        hackathon_ids = await asyncio.gather(*(
+            self._limited(lambda data=data: self.hackathon_service.upsert_hackathon(**data))
+            for data in hackathons
+        ))
+        logger.info(f"hackathons: {len(hackathons)} rows loaded")
+
+        return [hackathon_id for hackathon_id in hackathon_ids if hackathon_id]
+
+    async def _seed_winner_solutions(self, hackathon_ids: List[UUID], team_ids: List[UUID]) -> int:
+        winners_count = min(self.config.winners_per_hackathon, len(team_ids))
+        if not winners_count:
+            return 0
+
+        rows = []
+        for hackathon_id in hackathon_ids:
+            prize = float(self.random.randrange(5000, 50001, 500))
+            for place, team_id in enumerate(self.random.sample(team_ids, winners_count), 1):
+                rows.append((
+                    len(rows),
+                    hackathon_id,
+                    team_id,
+                    prize / place,  # Призовые уменьшаются с местом
+                    f"https://github.com/team{team_id}/solution{hackathon_id}",
+                    f"https://slides.com/team{team_id}/presentation{hackathon_id}",
+                    place == 1,  # Только первое место делится решением
+                ))
+
+        results = await self._run_batches(
+            "winner_solutions", rows, self.winner_solution_service.bulk_upsert_winner_solutions
+        )
+        return len(results)
@@ -1,32 +1,42 @@
 from datetime import datetime
-from typing import List, Optional, Tuple
+from typing import AsyncIterator, List, Optional, Tuple
 from loguru import logger
-from sqlalchemy import UUID
+from sqlalchemy import UUID, Row
 
-from infrastructure.db.connection import pg_connection
-from persistent.db.team import Team
-from repository.hacker_repository import HackerRepository
+from infrastructure.cache.redis_cache import entity_cache, hacker_key
+from infrastructure.db.connection import pg_connection, run_after_commit
 from repository.team_repository import TeamRepository
+from services.single_flight import coalesce
+from utils.bulk_input import BULK_CREATED, BULK_UPDATED, BulkRowResult, bulk_error
+from utils.pagination import Keyset, paginate
 
 
 class TeamService:
     def __init__(self) -> None:
         self.team_repository = TeamRepository()
-        self.hacker_repository = HackerRepository()
 
-    async def get_all_teams(self) -> List[Team]:
+    @coalesce
+    async def get_all_teams(
+        self, limit: int, after: Optional[Keyset] = None, fields: Optional[List[str]] = None
+    ) -> Tuple[List[Row], Optional[str]]:
         """
-        Возвращает все команды.
+        Возвращает страницу команд (плоские строки с hacker_ids) и курсор следующей страницы.
         """
-        teams = await self.team_repository.get_all_teams()
+        teams = await self.team_repository.get_all_teams(limit + 1, after, fields)
 
         if not teams:
             logger.warning("Команды не найдены.")
-        return teams
+        return paginate(teams, limit)
+
+    def stream_all_teams(self, batch_size: int = 1000) -> AsyncIterator[Row]:
+        """
+        Потоково возвращает все команды для выгрузки.
+        """
+        return self.team_repository.stream_all_teams(batch_size)
 
     async def create_team(self, owner_id: UUID, name: str, max_size: int) -> Tuple[UUID, int]:
         """
-        Создаёт новую команду.
+        Создаёт новую команду; владелец (id хакера) сразу становится участником.
 
         :returns -1 max_size должен быть больше 0
         :returns -2 Команда с таким владельцем и названием уже существует
@@ -47,7 +57,77 @@ class TeamService:
 
         return new_team_id, 1
 
-    async def get_team_by_id(self, team_id: UUID) -> Tuple[Team, bool]:
+    async def bulk_upsert_teams(
+        self, rows: List[Tuple[int, UUID, str, int, List[UUID]]]
+    ) -> List[BulkRowResult]:
+        """
+        Массово создаёт или обновляет команды (row_no, owner_id, name, max_size, hacker_ids).
+
+        Владелец всегда добавляется в участники. Участники только добавляются,
+        существующие связи не удаляются.
+
+        Returns:
+            List[BulkRowResult]: результат по каждой строке
+        """
+        results, teams, members = [], [], []
+        row_by_key = {}
+        for row_no, owner_id, name, max_size, hacker_ids in rows:
+            if (owner_id, name) in row_by_key:
+                results.append(bulk_error(row_no, f"Команда уже встречалась в строке {row_by_key[owner_id, name]}"))
+                continue
+
+            if max_size <= 0:
+                results.append(bulk_error(row_no, "max_size должен быть больше 0"))
+                continue
+
+            team_members = {owner_id, *hacker_ids}
+            if len(team_members) > max_size:
+                results.append(bulk_error(row_no, "Участников больше, чем max_size"))
+                continue
+
+            row_by_key[owner_id, name] = row_no
+            teams.append((row_no, owner_id, name, max_size))
+            members.extend((row_no, hacker_id) for hacker_id in team_members)
+
+        if not teams:
+            return results
+
+        rejected, rejected_full, merged, full_team_ids = await self.team_repository.bulk_upsert_teams(teams, members)
+
+        for row_no in rejected:
+            results.append(bulk_error(row_no, "Хакер не найден"))
+
+        for row_no in rejected_full:
+            results.append(bulk_error(row_no, "Участники не помещаются в max_size, строка не применена"))
+
+        full_team_ids = set(full_team_ids)
+        merged_rows = set()
+        for team in merged:
+            row_no = row_by_key[team.owner_id, team.name]
+            merged_rows.add(row_no)
+
+            # Команда, созданная параллельно уже после блокировки, могла заполниться:
+            # строка применена частично (max_size записан, участники не добавлены)
+            results.append(BulkRowResult(
+                row=row_no,
+                status=BULK_CREATED if team.inserted else BULK_UPDATED,
+                id=team.id,
+                error="Применено частично: команда заполнена, участники не добавлены"
+                if team.id in full_team_ids else None,
+            ))
+
+        # Оставшиеся строки не обновлены: у существующей команды участников больше нового max_size
+        rejected = {*rejected, *rejected_full}
+        for row_no, *_ in teams:
+            if row_no not in rejected and row_no not in merged_rows:
+                results.append(bulk_error(row_no, "max_size меньше текущего числа участников"))
+
+        keys = [hacker_key(hacker_id) for hacker_id in {hacker_id for _, hacker_id in members}]
+        await run_after_commit(lambda: entity_cache.invalidate(*keys))
+
+        return results
+
+    async def get_team_by_id(self, team_id: UUID) -> Tuple[Row, bool]:
         """
         Получение команды по её идентификатору.
 
@@ -60,40 +140,49 @@ class TeamService:
 
         return team, True
 
-    async def add_hacker_to_team(self, team_id: UUID, hacker_id: UUID) -> Tuple[Team, int]:
+    async def get_team_version(self, team_id: UUID) -> Optional[datetime]:
+        """
+        Версия команды для условных запросов; None — команда не найдена.
+        """
+        return await self.team_repository.get_team_version(team_id)
+
+    async def add_hacker_to_team(self, team_id: UUID, hacker_id: UUID) -> Tuple[Row, int]:
         """
         Добавление участника в команду.
 
         :returns -1 Хакер не найден
         :returns -2 Команда не найдена
         :returns -3 Команда уже заполнена
+        :returns -4 Хакер уже в команде
         """
-
-        hacker = await self.hacker_repository.get_hacker_by_id(hacker_id)
-
-        if not hacker:
-            return None, -1
-
-        team, ok = await self.team_repository.add_hacker_to_team(team_id, hacker)
+        ok = await self.team_repository.add_hacker_to_team(team_id, hacker_id)
 
         if ok == -1:
             return None, -2
 
         if ok == -2:
             return None, -3
-        
+
+        if ok == -3:
+            return None, -4
+
+        if ok == -4:
+            return None, -1
+
+        await run_after_commit(lambda: entity_cache.invalidate(hacker_key(hacker_id)))
+
+        team = await self.team_repository.get_team_by_id(team_id)
+
         return team, 1
 
-    async def get_teams_by_user_id(self, user_id: UUID) -> List[Team]:
+    async def get_teams_by_hacker_id(self, hacker_id: UUID) -> List[Row]:
         """
-        Получение всех команд пользователя.
-        
-        Находит команды, в которых участвует пользователь с указанным user_id.
+        Получение всех команд, в которых состоит хакер.
         """
-        teams = await self.team_repository.get_teams_by_user_id(user_id)
-        
+        teams = await self.team_repository.get_teams_by_hacker_id(hacker_id)
+
         if not teams:
-            logger.info(f"Команды не найдены для пользователя с user_id={user_id}")
-            
+            logger.info(f"Команды не найдены для хакера {hacker_id}")
+
         return teams
 
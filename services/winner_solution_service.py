@@ -1,26 +1,40 @@
 from datetime import datetime
-from typing import List, Optional, Tuple
+from typing import AsyncIterator, List, Optional, Tuple
 from loguru import logger
-from sqlalchemy import UUID
+from sqlalchemy import UUID, Row
 
-from infrastructure.db.connection import pg_connection
+from infrastructure.cache.redis_cache import entity_cache, winner_solution_key
+from infrastructure.db.connection import pg_connection, run_after_commit
 from persistent.db.winner_solution import WinnerSolution
 from repository.hackathon_repository import HackathonRepository
 from repository.team_repository import TeamRepository
 from repository.winner_solution_repository import WinnerSolutionRepository
+from services.single_flight import coalesce
+from utils.bulk_input import BULK_CREATED, BULK_UPDATED, BulkRowResult, bulk_error
+from utils.pagination import Keyset, paginate
 
 
 class WinnerSolutionService:
     def __init__(self) -> None:
         self.winner_solution_repository = WinnerSolutionRepository()
 
-    async def get_all_winner_solutions(self) -> List[WinnerSolution]:
+    @coalesce
+    async def get_all_winner_solutions(
+        self, limit: int, after: Optional[Keyset] = None, fields: Optional[List[str]] = None
+    ) -> Tuple[List[Row], Optional[str]]:
         """
-        Возвращает все хакатоны.
+        Возвращает страницу призерских решений (плоские строки с запрошенными полями)
+        и курсор следующей страницы.
         """
-        winner_solutions = await self.winner_solution_repository.get_all_winner_solutions()
+        winner_solutions = await self.winner_solution_repository.get_all_winner_solutions(limit + 1, after, fields)
 
-        return winner_solutions
+        return paginate(winner_solutions, limit)
+
+    def stream_all_winner_solutions(self, batch_size: int = 1000) -> AsyncIterator[Row]:
+        """
+        Потоково возвращает все призерские решения для выгрузки.
+        """
+        return self.winner_solution_repository.stream_all_winner_solutions(batch_size)
 
     async def create_winner_solution(
         self,
@@ -43,8 +57,56 @@ class WinnerSolutionService:
         if not winner_solutions_id:
             return None, False
 
+        await run_after_commit(lambda: entity_cache.invalidate(winner_solution_key(winner_solutions_id)))
+
         return winner_solutions_id, True
 
+    async def bulk_upsert_winner_solutions(
+        self, rows: List[Tuple[int, UUID, UUID, float, str, str, bool]]
+    ) -> List[BulkRowResult]:
+        """
+        Массово создаёт или обновляет призерские решения
+        (row_no, hackathon_id, team_id, win_money, link_to_solution, link_to_presentation, can_share).
+
+        Returns:
+            List[BulkRowResult]: результат по каждой строке
+        """
+        results, winner_solutions = [], []
+        row_by_key = {}
+        for row in rows:
+            row_no, hackathon_id, team_id = row[:3]
+            if (hackathon_id, team_id) in row_by_key:
+                results.append(bulk_error(row_no, f"Решение уже встречалось в строке {row_by_key[hackathon_id, team_id]}"))
+                continue
+
+            row_by_key[hackathon_id, team_id] = row_no
+            winner_solutions.append(row)
+
+        if not winner_solutions:
+            return results
+
+        merged = await self.winner_solution_repository.bulk_upsert_winner_solutions(winner_solutions)
+
+        merged_rows = set()
+        for winner_solution in merged:
+            row_no = row_by_key[winner_solution.hackathon_id, winner_solution.team_id]
+            merged_rows.add(row_no)
+            results.append(BulkRowResult(
+                row=row_no,
+                status=BULK_CREATED if winner_solution.inserted else BULK_UPDATED,
+                id=winner_solution.id,
+            ))
+
+        for row_no, *_ in winner_solutions:
+            if row_no not in merged_rows:
+                results.append(bulk_error(row_no, "Хакатон или команда не найдены"))
+
+        updated_keys = [winner_solution_key(ws.id) for ws in merged if not ws.inserted]
+        if updated_keys:
+            await run_after_commit(lambda: entity_cache.invalidate(*updated_keys))
+
+        return results
+
     async def get_winner_solution_by_id(self, solution_id: UUID) -> Tuple[WinnerSolution, bool]:
         """
         Получение призерского решения по ID.
@@ -1,12 +1,13 @@
 import multiprocessing as mp
 
 from loguru import logger
-from pydantic import BaseModel
+from pydantic import BaseModel, SecretStr
 from pydantic_settings import BaseSettings, SettingsConfigDict
 import os
-from dotenv import load_dotenv
+from typing import Optional
 
-load_dotenv()
+# Значения берутся из окружения при импорте; .env загружают точки входа (web_app.py,
+# seed_data.py) до импорта настроек, сам импорт файлов не читает
 
 
 class Postgres(BaseModel):
@@ -16,17 +17,60 @@ class Postgres(BaseModel):
     username: str = os.getenv("POSTGRES_USER")
     password: str = os.getenv("POSTGRES_PASSWORD")
     url: str = os.getenv("POSTGRES_URL")
+    pool_size: int = int(os.getenv("POSTGRES_POOL_SIZE", "10"))
+    max_overflow: int = int(os.getenv("POSTGRES_MAX_OVERFLOW", "5"))
+    pool_timeout: float = float(os.getenv("POSTGRES_POOL_TIMEOUT", "30"))
+    pool_pre_ping: bool = os.getenv("POSTGRES_POOL_PRE_PING", "true").lower() == "true"
+    pool_recycle: int = int(os.getenv("POSTGRES_POOL_RECYCLE", "1800"))
+
+
+class Redis(BaseModel):
+    url: Optional[str] = os.getenv("REDIS_URL")
+    cache_ttl: int = int(os.getenv("REDIS_CACHE_TTL", "60"))
+
+
+class Snapshot(BaseModel):
+    # Каталог общих для воркеров снимков ответов (лучше tmpfs, например /dev/shm/...); пусто — выключено
+    directory: Optional[str] = os.getenv("SNAPSHOT_DIR") or None
+
+
+class Seed(BaseModel):
+    on_startup: bool = os.getenv("SEED_ON_STARTUP", "false").lower() == "true"  # Тестовые данные при старте
 
 
 class Uvicorn(BaseModel):
     host: str = os.getenv("HOST_BACKEND")
     port: int = int(os.getenv("PORT_BACKEND"))
-    workers: int = mp.cpu_count() * 2 + 1
+    # Один асинхронный воркер на ядро; каждый воркер — отдельный процесс со своим пулом соединений
+    workers: int = int(os.getenv("UVICORN_WORKERS", mp.cpu_count()))
+    graceful_shutdown_timeout: int = int(os.getenv("UVICORN_GRACEFUL_SHUTDOWN_TIMEOUT", "30"))
+    # Быстрый профиль: uvloop, httptools и orjson (requirements-fast.txt)
+    fast_runtime: bool = os.getenv("FAST_RUNTIME", "false").lower() == "true"
+
+
+class Jwt(BaseModel):
+    # Общий секрет HS256; SecretStr не попадает в лог настроек
+    secret: Optional[SecretStr] = SecretStr(os.getenv("JWT_SECRET")) if os.getenv("JWT_SECRET") else None
+    # Каталог публичных ключей <kid>.pem (RS256/ES256, нужен пакет cryptography)
+    public_keys_dir: Optional[str] = os.getenv("JWT_PUBLIC_KEYS_DIR") or None
+    public_key_algorithms: str = os.getenv("JWT_PUBLIC_KEY_ALGORITHMS", "RS256,ES256")
+    audience: Optional[str] = os.getenv("JWT_AUDIENCE") or None
+    issuer: Optional[str] = os.getenv("JWT_ISSUER") or None
+    leeway: int = int(os.getenv("JWT_LEEWAY", "0"))  # Допуск расхождения часов, секунды
+    cache_size: int = int(os.getenv("JWT_CACHE_SIZE", "10000"))  # Проверенных токенов в LRU-кэше
+    # Scope (claim scope, через пробел) служебных токенов: массовая загрузка, метрики
+    admin_scope: str = os.getenv("JWT_ADMIN_SCOPE", "admin")
+    # Только для локальной разработки: токены декодируются без проверки подписи
+    insecure_skip_verify: bool = os.getenv("JWT_INSECURE_SKIP_VERIFY", "false").lower() == "true"
 
 
 class _Settings(BaseSettings):
     pg: Postgres = Postgres()
+    redis: Redis = Redis()
+    snapshot: Snapshot = Snapshot()
+    seed: Seed = Seed()
     uvicorn: Uvicorn = Uvicorn()
+    jwt: Jwt = Jwt()
 
     #model_config = SettingsConfigDict(env_file=".env", env_prefix="app_", env_nested_delimiter="__")
 
@@ -0,0 +1,172 @@
+import os
+import socket
+import subprocess
+import sys
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterator, Optional
+from uuid import uuid4
+
+import pytest
+
+# Настройки читаются при импорте модулей приложения, поэтому окружение
+# заполняется до первого импорта. Тесты с БД используют TEST_POSTGRES_URL
+# (postgresql+asyncpg://...) и пропускаются, если он не задан.
+TEST_POSTGRES_URL = os.getenv("TEST_POSTGRES_URL")
+
+os.environ.setdefault("PORT_POSTGRES", "5432")
+os.environ.setdefault("PORT_BACKEND", "8000")
+os.environ.setdefault("JWT_SECRET", "test-secret")
+os.environ["REDIS_URL"] = ""
+os.environ["SNAPSHOT_DIR"] = ""
+if TEST_POSTGRES_URL:
+    os.environ["POSTGRES_URL"] = TEST_POSTGRES_URL
+
+ROOT = Path(__file__).resolve().parent.parent
+INIT_SQL = ROOT / "init.sql"
+
+# Сколько ждать ответа /healthz от запущенного web_app.py
+SERVER_START_TIMEOUT = 30.0
+
+# Секрет токенов тестового HTTP-клиента
+API_SECRET = "api-test-secret"
+
+# Замеры нагрузочных тестов: выводятся сводкой в конце прогона pytest
+BENCHMARKS = []
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
+@pytest.fixture
+def report(request):
+    """
+    Записывает замер теста (например, report("joins/s", 1234.5)) в сводку прогона.
+    """
+    def record(metric: str, value: float) -> None:
+        BENCHMARKS.append((request.node.nodeid, metric, value))
+
+    return record
+
+
+def pytest_terminal_summary(terminalreporter):
+    if not BENCHMARKS:
+        return
+    terminalreporter.write_sep("-", "benchmarks")
+    for nodeid, metric, value in BENCHMARKS:
+        terminalreporter.write_line(f"{nodeid}: {metric} = {value:,.1f}")
+
+
+@pytest.fixture
+async def pg():
+    """
+    Чистая схема из init.sql для каждого теста; движок приложения
+    закрывается после теста, т.к. привязан к его циклу событий.
+    """
+    if not TEST_POSTGRES_URL:
+        pytest.skip("TEST_POSTGRES_URL is not set")
+
+    import asyncpg
+
+    from infrastructure.db.connection import dispose_engine, get_engine
+
+    conn = await asyncpg.connect(TEST_POSTGRES_URL.replace("+asyncpg", ""))
+    try:
+        await conn.execute("DROP SCHEMA public CASCADE; CREATE SCHEMA public;")
+        await conn.execute(INIT_SQL.read_text())
+    finally:
+        await conn.close()
+
+    yield get_engine()
+
+    await dispose_engine()
+
+
+def api_token(uid: str, scope: Optional[str] = None) -> str:
+    """
+    Токен пользователя uid для клиента api (заголовок запроса заменяет токен по умолчанию).
+    """
+    import jwt
+
+    claims = {"uid": uid, "exp": int(time.time()) + 3600}
+    if scope:
+        claims["scope"] = scope
+    return jwt.encode(claims, API_SECRET, algorithm="HS256")
+
+
+@pytest.fixture
+async def api(pg, monkeypatch):
+    """
+    HTTP-клиент приложения поверх ASGI (без сервера и lifespan) с токеном,
+    у которого есть scope администратора.
+    """
+    import httpx
+
+    import utils.jwt_utils as jwt_utils
+    from presentations.fastapi_app import app
+
+    monkeypatch.setattr(jwt_utils, "token_verifier", jwt_utils.TokenVerifier(secret=API_SECRET))
+    token = api_token(str(uuid4()), scope="admin")
+    async with httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=app),
+        base_url="http://test",
+        headers={"Authorization": f"Bearer {token}"},
+    ) as client:
+        yield client
+
+
+def server_env(**overrides) -> dict:
+    """
+    Окружение процессов приложения: окружение тестов без базы (старт её не ждёт),
+    токены подписываются API_SECRET.
+    """
+    env = {**os.environ, "JWT_SECRET": API_SECRET, "JWT_PUBLIC_KEYS_DIR": "", **overrides}
+    env.pop("POSTGRES_URL", None)
+    return env
+
+
+@dataclass
+class WebAppServer:
+    process: subprocess.Popen
+    url: str
+    started: float  # time.perf_counter() перед запуском процесса
+    ready: float  # time.perf_counter() первого ответа /healthz
+
+
+@contextmanager
+def web_app_server(**env) -> Iterator[WebAppServer]:
+    """
+    web_app.py в отдельном процессе на свободном порту; возвращается, когда
+    /healthz отвечает, и останавливает сервер (SIGTERM) при выходе.
+    """
+    import httpx
+
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+
+    started = time.perf_counter()
+    process = subprocess.Popen(
+        [sys.executable, "web_app.py"], cwd=ROOT,
+        env=server_env(HOST_BACKEND="127.0.0.1", PORT_BACKEND=str(port), **env),
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    url = f"http://127.0.0.1:{port}"
+    try:
+        while True:
+            assert process.poll() is None, "server exited"
+            assert time.perf_counter() - started < SERVER_START_TIMEOUT, "server did not start"
+            try:
+                if httpx.get(f"{url}/healthz").status_code == 200:
+                    break
+            except httpx.TransportError:
+                time.sleep(0.05)
+
+        yield WebAppServer(process, url, started, time.perf_counter())
+    finally:
+        process.terminate()
+        process.wait(timeout=SERVER_START_TIMEOUT)
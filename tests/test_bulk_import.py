@@ -0,0 +1,57 @@
+import json
+import time
+from uuid import uuid4
+
+import pytest
+from sqlalchemy import text
+
+from persistent.db.role import RoleEnum
+from services.role_service import RoleService
+from utils.bulk_input import MAX_BULK_ROWS
+
+pytestmark = pytest.mark.anyio
+
+# Полная пачка должна укладываться в секунды, а не в минуты построчных запросов
+BULK_TIMEOUT = 30.0
+
+
+def _ndjson(rows: list) -> bytes:
+    return "\n".join(json.dumps(row, ensure_ascii=False) for row in rows).encode()
+
+
+async def _post(api, rows: list, report, metric: str) -> dict:
+    started = time.perf_counter()
+    response = await api.post("/hacker/bulk", content=_ndjson(rows),
+                              headers={"Content-Type": "application/x-ndjson"})
+    elapsed = time.perf_counter() - started
+    report(metric, len(rows) / elapsed)
+
+    assert response.status_code == 200
+    assert elapsed < BULK_TIMEOUT
+    return response.json()
+
+
+async def _count(pg, table: str) -> int:
+    async with pg.connect() as conn:
+        return (await conn.execute(text(f"SELECT count(*) FROM {table}"))).scalar()
+
+
+async def test_bulk_import_of_10k_hackers_with_roles(pg, api, report):
+    await RoleService().init_roles()
+    roles = [role.value for role in RoleEnum]
+    rows = [
+        {"user_id": str(uuid4()), "name": f"hacker {i}", "role_names": [roles[i % len(roles)], roles[(i + 1) % len(roles)]]}
+        for i in range(MAX_BULK_ROWS)
+    ]
+
+    created = await _post(api, rows, report, "bulk create, rows/s")
+    assert (created["created"], created["updated"], created["failed"]) == (MAX_BULK_ROWS, 0, 0)
+    assert await _count(pg, "hacker") == MAX_BULK_ROWS
+    assert await _count(pg, "hacker_role_association") == 2 * MAX_BULK_ROWS
+
+    # Повтор с одной ролью: строки обновляются, набор ролей заменяется
+    for row in rows:
+        row["role_names"] = row["role_names"][:1]
+    updated = await _post(api, rows, report, "bulk update, rows/s")
+    assert (updated["created"], updated["updated"], updated["failed"]) == (0, MAX_BULK_ROWS, 0)
+    assert await _count(pg, "hacker_role_association") == MAX_BULK_ROWS
@@ -0,0 +1,159 @@
+import asyncio
+from uuid import uuid4
+
+import pytest
+
+from infrastructure.cache.redis_cache import EntityCache, hacker_key
+from infrastructure.db.connection import db_session, detached_context
+import services.hacker_service as hacker_service_module
+from services.hacker_service import HackerService
+
+fakeredis = pytest.importorskip("fakeredis")
+from fakeredis import aioredis  # noqa: E402
+
+pytestmark = pytest.mark.anyio
+
+TTL = 60
+
+
+@pytest.fixture
+def server():
+    return fakeredis.FakeServer()
+
+
+@pytest.fixture
+def cache(server):
+    return EntityCache(url=None, ttl=TTL, prefix="test", client=aioredis.FakeRedis(server=server))
+
+
+async def test_counts_hits_and_misses(cache):
+    assert await cache.get_value("team:1") is None
+
+    await cache.set_value("team:1", b'{"id": 1}')
+    assert await cache.get_value("team:1") == b'{"id": 1}'
+    assert await cache.get_value("team:1") == b'{"id": 1}'
+
+    assert cache.stats() == {"hits": 2, "misses": 1, "errors": 0}
+
+
+async def test_values_expire_after_ttl(cache):
+    await cache.set_value("team:1", "default")
+    await cache.set_value("team:2", "custom", ttl=5)
+    await cache.set_value("team:3", "persistent", expire=False)
+
+    client = cache._redis()
+    assert await client.ttl("test:team:1") == TTL
+    assert await client.ttl("test:team:2") == 5
+    assert await client.ttl("test:team:3") == -1
+
+
+async def test_invalidate_removes_keys(cache):
+    await cache.set_value("team:1", "a")
+    await cache.set_value("team:2", "b")
+
+    await cache.invalidate("team:1", "team:2")
+
+    assert await cache.get_value("team:1") is None
+    assert await cache.get_value("team:2") is None
+
+
+async def test_unavailable_redis_behaves_as_miss(cache, server):
+    server.connected = False
+
+    assert await cache.get_value("team:1") is None
+    await cache.set_value("team:1", "a")
+    await cache.invalidate("team:1")
+
+    assert cache.stats() == {"hits": 0, "misses": 0, "errors": 3}
+
+
+async def test_body_read_before_invalidation_is_not_served(cache):
+    key = await cache.versioned("hacker:1")
+    assert key == "hacker:1@0"
+
+    # Изменение фиксируется, пока читатель ходит в базу, и тело ложится уже после инвалидации
+    await cache.invalidate("hacker:1")
+    await cache.set_value(key, "stale")
+
+    fresh = await cache.versioned("hacker:1")
+    assert fresh != key
+    assert await cache.get_value(fresh) is None
+    assert await cache._redis().ttl("test:hacker:1:generation") == 2 * TTL
+
+
+async def test_unknown_generation_bypasses_cache(cache, server):
+    assert await EntityCache(url=None, ttl=TTL).versioned("hacker:1") is None
+
+    server.connected = False
+    assert await cache.versioned("hacker:1") is None
+    assert cache.stats()["errors"] == 1
+
+
+async def test_disabled_cache_is_noop():
+    cache = EntityCache(url=None, ttl=TTL)
+
+    await cache.set_value("team:1", "a")
+    assert await cache.get_value("team:1") is None
+    assert cache.stats() == {"hits": 0, "misses": 0, "errors": 0}
+
+
+async def _stale_hacker(cache: EntityCache, service: HackerService):
+    user_id = uuid4()
+    hacker_id, _ = await service.upsert_hacker(user_id, "before")
+    await cache.set_value(hacker_key(hacker_id), "stale")
+    return user_id, hacker_id
+
+
+async def test_request_invalidates_only_after_commit(pg, cache, monkeypatch):
+    monkeypatch.setattr(hacker_service_module, "entity_cache", cache)
+    service = HackerService()
+    user_id, hacker_id = await _stale_hacker(cache, service)
+
+    # Жизненный цикл зависимости db_session проходится вручную, как его ведёт FastAPI
+    request = db_session()
+    await request.__anext__()
+    await service.upsert_hacker(user_id, "after")
+    assert await cache.get_value(hacker_key(hacker_id)) == b"stale"
+
+    with pytest.raises(StopAsyncIteration):
+        await request.__anext__()
+    assert await cache.get_value(hacker_key(hacker_id)) is None
+
+
+async def test_rolled_back_request_keeps_cache(pg, cache, monkeypatch):
+    monkeypatch.setattr(hacker_service_module, "entity_cache", cache)
+    service = HackerService()
+    user_id, hacker_id = await _stale_hacker(cache, service)
+
+    request = db_session()
+    await request.__anext__()
+    await service.upsert_hacker(user_id, "after")
+
+    with pytest.raises(RuntimeError):
+        await request.athrow(RuntimeError("handler failed"))
+    assert await cache.get_value(hacker_key(hacker_id)) == b"stale"
+
+
+async def test_hacker_route_does_not_cache_a_body_read_before_a_change(api, cache, monkeypatch):
+    import presentations.routers.hacker_router as hacker_router
+
+    monkeypatch.setattr(hacker_router, "entity_cache", cache)
+    monkeypatch.setattr(hacker_service_module, "entity_cache", cache)
+    service = HackerService()
+    user_id = uuid4()
+    hacker_id, _ = await service.upsert_hacker(user_id, "before")
+    read = hacker_router.hacker_service.get_hacker_by_id
+
+    async def read_then_change(hacker_id):
+        hacker = await read(hacker_id)
+        # Другой запрос фиксирует изменение, пока тело ещё не записано в кэш
+        await asyncio.create_task(service.upsert_hacker(user_id, "after"), context=detached_context())
+        return hacker
+
+    monkeypatch.setattr(hacker_router.hacker_service, "get_hacker_by_id", read_then_change)
+    assert (await api.get(f"/hacker/{hacker_id}")).json()["name"] == "before"
+
+    monkeypatch.setattr(hacker_router.hacker_service, "get_hacker_by_id", read)
+    assert (await api.get(f"/hacker/{hacker_id}")).json()["name"] == "after"
+    assert (await api.get(f"/hacker/{hacker_id}")).json()["name"] == "after"
+    assert cache.stats()["hits"] == 1
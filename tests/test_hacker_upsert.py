@@ -0,0 +1,66 @@
+import asyncio
+import time
+from uuid import uuid4
+
+import pytest
+from sqlalchemy import text
+
+from services.hacker_service import HackerService
+from tests.conftest import api_token
+
+pytestmark = pytest.mark.anyio
+
+# Первых входов разных пользователей в каждом прогоне (последовательном и параллельном)
+FIRST_LOGINS = 200
+
+
+async def test_parallel_upserts_of_one_user_create_one_hacker(pg):
+    user_id = uuid4()
+    service = HackerService()
+
+    results = await asyncio.gather(*(service.upsert_hacker(user_id, f"name {i}") for i in range(20)))
+
+    assert all(ok for _, ok in results)
+    assert len({hacker_id for hacker_id, _ in results}) == 1
+
+    async with pg.connect() as conn:
+        rows = (await conn.execute(text("SELECT id FROM hacker WHERE user_id = :user_id"),
+                                   {"user_id": user_id})).scalars().all()
+
+    assert rows == [results[0][0]]
+
+
+async def test_distinct_first_logins_neither_fail_nor_serialize(api, pg, report):
+    async def register(user_id: str):
+        return await api.post("/hacker/", json={"name": f"hacker {user_id}"},
+                              headers={"Authorization": f"Bearer {api_token(user_id)}"})
+
+    # Незафиксированный первый вход держит запись уникального индекса user_id
+    pending_user = str(uuid4())
+    async with pg.connect() as conn:
+        transaction = await conn.begin()
+        await conn.execute(text("INSERT INTO hacker (id, user_id, name) VALUES (:id, :user_id, 'pending')"),
+                           {"id": uuid4(), "user_id": pending_user})
+        same_user = asyncio.create_task(register(pending_user))
+
+        # Остальные пользователи регистрируются, не дожидаясь его фиксации
+        started = time.perf_counter()
+        responses = await asyncio.wait_for(
+            asyncio.gather(*(register(str(uuid4())) for _ in range(FIRST_LOGINS))), timeout=30
+        )
+        report("concurrent first logins/s", FIRST_LOGINS / (time.perf_counter() - started))
+        assert not same_user.done()  # Тот же user_id ждёт исхода незафиксированной вставки
+
+        await transaction.rollback()
+
+    assert (await same_user).status_code == 201
+    assert [response.status_code for response in responses] == [201] * FIRST_LOGINS
+    assert len({response.json()["id"] for response in responses}) == FIRST_LOGINS
+
+    started = time.perf_counter()
+    for _ in range(FIRST_LOGINS):
+        assert (await register(str(uuid4()))).status_code == 201
+    report("sequential first logins/s", FIRST_LOGINS / (time.perf_counter() - started))
+
+    async with pg.connect() as conn:
+        assert (await conn.execute(text("SELECT count(*) FROM hacker"))).scalar() == 2 * FIRST_LOGINS + 1
@@ -0,0 +1,61 @@
+import time
+
+import jwt
+import pytest
+from fastapi import HTTPException
+
+from utils.jwt_utils import TokenVerifier, get_admin_claims
+
+SECRET = "secret"
+
+
+def _token(**claims) -> str:
+    return jwt.encode({"uid": "user", "exp": int(time.time()) + 60, **claims}, SECRET, algorithm="HS256")
+
+
+def test_fractional_exp_is_accepted():
+    claims = TokenVerifier(secret=SECRET).verify(_token(exp=time.time() + 60.5))
+
+    assert claims.uid == "user"
+
+
+def test_algorithm_not_matching_the_key_type_is_unauthorized():
+    pytest.importorskip("cryptography")
+    from cryptography.hazmat.primitives.asymmetric import ec, rsa
+
+    rsa_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    ec_key = ec.generate_private_key(ec.SECP256R1())
+    verifier = TokenVerifier(public_keys={"rsa": rsa_key.public_key(), "ec": ec_key.public_key()})
+    payload = {"uid": "user", "exp": int(time.time()) + 60}
+
+    assert verifier.verify(jwt.encode(payload, rsa_key, algorithm="RS256", headers={"kid": "rsa"})).uid == "user"
+    assert verifier.verify(jwt.encode(payload, ec_key, algorithm="ES256", headers={"kid": "ec"})).uid == "user"
+
+    for key, alg, kid in ((ec_key, "ES256", "rsa"), (rsa_key, "RS256", "ec")):
+        with pytest.raises(HTTPException) as error:
+            verifier.verify(jwt.encode(payload, key, algorithm=alg, headers={"kid": kid}))
+        assert error.value.status_code == 401
+
+
+def test_admin_scope_is_required_for_service_endpoints():
+    verifier = TokenVerifier(secret=SECRET)
+
+    assert get_admin_claims(verifier.verify(_token(scope="read admin"))).uid == "user"
+
+    with pytest.raises(HTTPException) as error:
+        get_admin_claims(verifier.verify(_token()))
+    assert error.value.status_code == 403
+
+
+def test_metrics_require_admin_scope(monkeypatch):
+    from fastapi.testclient import TestClient
+
+    from presentations.fastapi_app import app
+    import utils.jwt_utils as jwt_utils
+
+    monkeypatch.setattr(jwt_utils, "token_verifier", TokenVerifier(secret=SECRET))
+    client = TestClient(app)
+
+    assert client.get("/metrics/").status_code in (401, 403)
+    assert client.get("/metrics/", headers={"Authorization": f"Bearer {_token()}"}).status_code == 403
+    assert client.get("/metrics/", headers={"Authorization": f"Bearer {_token(scope='admin')}"}).status_code == 200
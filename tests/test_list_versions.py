@@ -0,0 +1,63 @@
+import asyncio
+from datetime import datetime
+
+import pytest
+from sqlalchemy import text
+
+from services.hackathon_service import HackathonService
+
+pytestmark = pytest.mark.anyio
+
+
+async def _upsert(service: HackathonService, name: str):
+    start = datetime(2030, 1, 1)
+    return await service.upsert_hackathon(name, "task", start, start, start, start, 100.0, "online")
+
+
+async def test_hackathon_list_version_changes_on_every_commit(pg):
+    service = HackathonService()
+    initial = await service.get_hackathons_version()
+
+    hackathon_id = await _upsert(service, "first")
+    created = await service.get_hackathons_version()
+    assert created != initial
+
+    # Изменение с более старым updated_at (запись, зафиксированная не по порядку времени)
+    async with pg.begin() as conn:
+        await conn.execute(text("UPDATE hackathon SET name = 'renamed', updated_at = '2000-01-01' WHERE id = :id"),
+                           {"id": hackathon_id})
+    renamed = await service.get_hackathons_version()
+    assert renamed != created
+
+    async with pg.begin() as conn:
+        await conn.execute(text("DELETE FROM hackathon"))
+    assert await service.get_hackathons_version() not in (initial, created, renamed)
+
+
+async def test_list_read_does_not_join_a_flight_of_an_older_version(pg, monkeypatch):
+    service = HackathonService()
+    read_page = service.hackathon_repository.get_all_hackathons
+    stale_read, release = asyncio.Event(), asyncio.Event()
+
+    async def held_first_read(*args):
+        rows = await read_page(*args)
+        if not stale_read.is_set():
+            # Первое чтение прочитало данные до записи и ещё не завершилось
+            stale_read.set()
+            await release.wait()
+        return rows
+
+    monkeypatch.setattr(service.hackathon_repository, "get_all_hackathons", held_first_read)
+
+    before = await service.get_hackathons_version()
+    stale_page = asyncio.ensure_future(service.get_all_hackathons(10, None, None, version=before))
+    await stale_read.wait()
+
+    await _upsert(service, "new")
+    after = await service.get_hackathons_version()
+    fresh_page = asyncio.ensure_future(service.get_all_hackathons(10, None, None, version=after))
+    await asyncio.sleep(0)
+    release.set()
+
+    assert (await stale_page)[0] == []
+    assert [row.name for row in (await fresh_page)[0]] == ["new"]
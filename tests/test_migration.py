@@ -0,0 +1,99 @@
+from uuid import uuid4
+
+import pytest
+
+from services.hackathon_service import summarize_task
+from tests.conftest import INIT_SQL, TEST_POSTGRES_URL
+
+pytestmark = pytest.mark.anyio
+
+# Блок миграции существующих баз — хвост init.sql, выполняемый отдельно
+MIGRATION = INIT_SQL.read_text().split("-- Миграция существующих баз", 1)[1].split("\n", 1)[1]
+
+DESCRIPTIONS = [
+    None,
+    "",
+    "  Короткая задача.  ",
+    "Первый   абзац\nс переносом.\n\nВторой абзац не попадает в список.",
+    "слово " * 60,
+    "Длинное описание, " + "x" * 250,
+    "Граница на знаке препинания: " + "аб, " * 60,
+]
+
+
+async def _connect():
+    import asyncpg
+
+    return await asyncpg.connect(TEST_POSTGRES_URL.replace("+asyncpg", ""))
+
+
+async def test_migration_backfills_task_summary_and_is_repeatable(pg):
+    conn = await _connect()
+    try:
+        # База до появления task_summary
+        await conn.execute("ALTER TABLE hackathon DROP COLUMN task_summary")
+        for i, description in enumerate(DESCRIPTIONS):
+            await conn.execute(
+                "INSERT INTO hackathon (id, name, task_description, start_of_hack) VALUES ($1, $2, $3, now())",
+                uuid4(), f"hackathon {i}", description,
+            )
+
+        await conn.execute(MIGRATION)
+        await conn.execute("UPDATE hackathon SET task_summary = 'edited' WHERE name = 'hackathon 2'")
+        await conn.execute(MIGRATION)
+
+        rows = await conn.fetch("SELECT name, task_description, task_summary FROM hackathon ORDER BY name")
+    finally:
+        await conn.close()
+
+    for row in rows:
+        expected = "edited" if row["name"] == "hackathon 2" else summarize_task(row["task_description"])
+        assert row["task_summary"] == expected
+
+
+async def _team(conn, owner_id, name: str, max_size: int, hacker_ids: list):
+    team_id = uuid4()
+    await conn.execute("INSERT INTO team (id, owner_id, name, max_size) VALUES ($1, $2, $3, $4)",
+                       team_id, owner_id, name, max_size)
+    await conn.executemany("INSERT INTO hacker_team_association (hacker_id, team_id) VALUES ($1, $2)",
+                           [(hacker_id, team_id) for hacker_id in hacker_ids])
+    return team_id
+
+
+async def _member_count_check(conn):
+    return await conn.fetchval(
+        "SELECT convalidated FROM pg_constraint "
+        "WHERE conname = 'ck_team_member_count' AND conrelid = 'team'::regclass"
+    )
+
+
+async def test_migration_adds_member_count_check_and_is_repeatable(pg):
+    import asyncpg
+
+    conn = await _connect()
+    try:
+        # База до появления счётчика участников и ограничения
+        await conn.execute("ALTER TABLE team DROP CONSTRAINT ck_team_member_count, DROP COLUMN member_count")
+        hacker_ids = [uuid4() for _ in range(3)]
+        await conn.executemany("INSERT INTO hacker (id, user_id, name) VALUES ($1, $2, 'hacker')",
+                               [(hacker_id, uuid4()) for hacker_id in hacker_ids])
+        await _team(conn, hacker_ids[0], "fits", 3, hacker_ids[:2])
+        overfull_id = await _team(conn, hacker_ids[0], "overfull", 1, hacker_ids[1:])
+
+        # Переполненная команда: ограничение добавлено, но старые строки не проверены
+        await conn.execute(MIGRATION)
+        assert await _member_count_check(conn) is False
+        with pytest.raises(asyncpg.CheckViolationError):
+            await conn.execute("UPDATE team SET member_count = max_size + 1 WHERE name = 'fits'")
+
+        await conn.execute("DELETE FROM hacker_team_association WHERE team_id = $1 AND hacker_id = $2",
+                           overfull_id, hacker_ids[2])
+        await conn.execute(MIGRATION)
+        assert await _member_count_check(conn) is True
+        await conn.execute(MIGRATION)
+
+        counts = dict(await conn.fetch("SELECT name, member_count FROM team"))
+    finally:
+        await conn.close()
+
+    assert counts == {"fits": 2, "overfull": 1}
@@ -0,0 +1,20 @@
+import pytest
+
+from services.role_catalog import RoleCatalog, get_role_catalog, set_role_catalog
+from services.role_service import RoleService
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_failed_refresh_after_commit_marks_catalog_stale(monkeypatch):
+    service = RoleService()
+    set_role_catalog(RoleCatalog())
+
+    async def failing_get_all_roles():
+        raise ConnectionError("database is gone")
+
+    monkeypatch.setattr(service.role_repository, "get_all_roles", failing_get_all_roles)
+
+    await service._refresh_after_commit()
+
+    assert not get_role_catalog().loaded
@@ -0,0 +1,72 @@
+import json
+import time
+from datetime import datetime, timezone
+from uuid import uuid4
+
+import pytest
+from sqlalchemy import text
+
+import utils.serialization as serialization
+from presentations.routers.hackathon_router import HackathonDto, HackathonGetAllResponse
+from utils.fieldsets import list_include
+from utils.pagination import MAX_PAGE_LIMIT
+
+pytestmark = pytest.mark.anyio
+
+REQUESTS = 20
+
+
+def _page(rows: int) -> HackathonGetAllResponse:
+    start = datetime(2030, 1, 1, tzinfo=timezone.utc)
+    return HackathonGetAllResponse.model_construct(
+        hackathons=[
+            HackathonDto.model_construct(
+                id=uuid4(), name=f"Хакатон {i}", task_summary=None if i % 2 else "задача",
+                start_of_registration=start, end_of_registration=datetime(2030, 1, 2, 3, 4, 5, 678),
+                start_of_hack=start, end_of_hack=start, amount_money=100.5, type="online",
+            )
+            for i in range(rows)
+        ],
+        next_cursor="cursor",
+    )
+
+
+def test_profiles_serialize_dtos_identically():
+    pytest.importorskip("orjson")
+    page = _page(10)
+
+    assert serialization._orjson_json(page) == serialization._pydantic_json(page)
+    include = list_include("hackathons", ["id", "start_of_hack"])
+    assert serialization._orjson_json(page, include) == serialization._pydantic_json(page, include)
+
+
+async def test_list_endpoint_before_and_after_fast_profile(pg, api, report, monkeypatch):
+    pytest.importorskip("orjson")
+    async with pg.begin() as conn:
+        await conn.execute(text(
+            "INSERT INTO hackathon (id, name, task_description, task_summary, start_of_registration, "
+            "end_of_registration, start_of_hack, end_of_hack, amount_money, type) "
+            "SELECT gen_random_uuid(), 'hackathon ' || i, 'task', 'task', now(), now(), "
+            "now() + i * interval '1 minute', now(), 100.5, 'online' FROM generate_series(1, :rows) i"
+        ), {"rows": MAX_PAGE_LIMIT})
+
+    bodies = {}
+    for profile, dump in (("standard", serialization._pydantic_json), ("fast", serialization._orjson_json)):
+        monkeypatch.setattr(serialization, "dump_json", dump)
+        await api.get("/hackathon/", params={"limit": MAX_PAGE_LIMIT})  # Прогрев: пул, кэши запросов
+        started = time.perf_counter()
+        for _ in range(REQUESTS):
+            response = await api.get("/hackathon/", params={"limit": MAX_PAGE_LIMIT})
+            assert response.status_code == 200
+        report(f"{profile} profile: list of {MAX_PAGE_LIMIT} requests/s", REQUESTS / (time.perf_counter() - started))
+        bodies[profile] = json.loads(response.content)
+
+        page = _page(MAX_PAGE_LIMIT)
+        started = time.perf_counter()
+        for _ in range(REQUESTS):
+            dump(page)
+        report(f"{profile} profile: serialization µs/row",
+               (time.perf_counter() - started) / (REQUESTS * MAX_PAGE_LIMIT) * 1e6)
+
+    assert len(bodies["fast"]["hackathons"]) == MAX_PAGE_LIMIT
+    assert bodies["fast"] == bodies["standard"]
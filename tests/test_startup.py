@@ -0,0 +1,37 @@
+import subprocess
+import sys
+import time
+
+import httpx
+
+from tests.conftest import ROOT, api_token, server_env, web_app_server
+
+
+def test_app_import_time(report):
+    code = (
+        "import time; started = time.perf_counter(); import presentations.fastapi_app; "
+        "print(time.perf_counter() - started)"
+    )
+    result = subprocess.run([sys.executable, "-c", code], cwd=ROOT, env=server_env(),
+                            capture_output=True, text=True, check=True)
+
+    report("app import, ms", float(result.stdout.strip().splitlines()[-1]) * 1000)
+
+
+def test_time_to_first_request_ignores_probes(report):
+    with web_app_server(UVICORN_WORKERS="1") as server:
+        report("spawn to first probe, ms", (server.ready - server.started) * 1000)
+
+        with httpx.Client(base_url=server.url,
+                          headers={"Authorization": f"Bearer {api_token('startup', scope='admin')}"}) as client:
+            # Пробы не считаются первым запросом; сам запрос метрик отмечается после ответа
+            client.get("/readyz")
+            assert "first_request" not in client.get("/metrics/").json()["startup"]
+
+            assert client.get("/openapi.json").status_code == 200
+            report("spawn to first request, ms", (time.perf_counter() - server.started) * 1000)
+
+            startup = client.get("/metrics/").json()["startup"]
+
+    assert startup["imported"] <= startup["lifespan"] <= startup["first_request"]
+    report("server: app import to first request, ms", startup["first_request"] * 1000)
@@ -0,0 +1,118 @@
+from contextlib import contextmanager
+from typing import Iterator, List
+
+import pytest
+from sqlalchemy import event, inspect, select, text
+
+from infrastructure.db.connection import session_scope
+from persistent.db.hackathon import Hackathon
+from persistent.db.hacker import Hacker
+from persistent.db.team import Team
+from persistent.db.winner_solution import WinnerSolution
+from repository.loader_profiles import LoadProfile, loader_options
+from tests.conftest import api_token
+from utils.pagination import MAX_PAGE_LIMIT
+
+pytestmark = pytest.mark.anyio
+
+ROWS = 5
+
+
+
+def _seed(rows: int) -> List[str]:
+    return [
+        "INSERT INTO role (id, name) VALUES (gen_random_uuid(), 'backend'), (gen_random_uuid(), 'frontend')",
+        f"INSERT INTO hacker (id, user_id, name) "
+        f"SELECT gen_random_uuid(), gen_random_uuid(), 'hacker ' || i FROM generate_series(1, {rows}) i",
+        "INSERT INTO hacker_role_association (hacker_id, role_id) SELECT h.id, r.id FROM hacker h, role r",
+        "INSERT INTO team (id, owner_id, name, max_size, member_count) "
+        "SELECT gen_random_uuid(), h.id, 'team ' || h.name, 10, 1 FROM hacker h",
+        "INSERT INTO hacker_team_association (hacker_id, team_id) SELECT owner_id, id FROM team",
+        f"INSERT INTO hackathon (id, name, task_description, start_of_registration, end_of_registration, "
+        f"start_of_hack, end_of_hack, amount_money, type) "
+        f"SELECT gen_random_uuid(), 'hackathon ' || i, 'task', now(), now(), now(), now(), 100, 'online' "
+        f"FROM generate_series(1, {rows}) i",
+        "INSERT INTO winner_solution (id, win_money, link_to_solution, link_to_presentation, hackathon_id, team_id) "
+        "SELECT gen_random_uuid(), 100, 'solution', 'presentation', h.id, t.id "
+        "FROM (SELECT id, row_number() OVER () n FROM hackathon) h "
+        "JOIN (SELECT id, row_number() OVER () n FROM team) t USING (n)",
+    ]
+
+
+@contextmanager
+def count_statements(engine) -> Iterator[List[str]]:
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(engine.sync_engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        yield statements
+    finally:
+        event.remove(engine.sync_engine, "before_cursor_execute", before_cursor_execute)
+
+
+@pytest.fixture
+async def seeded(pg, request):
+    async with pg.begin() as conn:
+        for statement in _seed(getattr(request, "param", ROWS)):
+            await conn.execute(text(statement))
+    return pg
+
+
+@pytest.mark.parametrize("profile", list(LoadProfile))
+@pytest.mark.parametrize("entity", [Hacker, Team, Hackathon, WinnerSolution])
+async def test_loader_profile_statements_do_not_grow_with_rows(seeded, entity, profile):
+    options = loader_options(entity, profile)
+
+    with count_statements(seeded) as statements:
+        async with session_scope() as session:
+            objects = list((await session.execute(select(entity).options(*options))).scalars())
+            for obj in objects:
+                for relationship in inspect(entity).relationships:
+                    if relationship.key not in inspect(obj).unloaded:
+                        getattr(obj, relationship.key)
+
+    assert len(objects) == ROWS
+    # Один запрос сущностей и по одному selectinload-запросу на связь профиля
+    assert len(statements) == 1 + len(options), statements
+
+
+# Запросов к базе на один вызов эндпоинта, независимо от числа строк
+ENDPOINT_STATEMENTS = {
+    "/hacker/": 1,
+    "/hacker/{hacker_id}": 3,  # Хакер и selectinload ролей и команд (LoadProfile.DETAIL)
+    "/team/": 1,
+    "/team/my-teams": 2,  # id хакера по user_id и команды с hacker_ids
+    "/team/{team_id}": 2,  # Версия (updated_at) для ETag и плоская строка с hacker_ids
+    "/hackathon/": 2,  # Версия списка (change_counter) и страница
+    "/hackathon/{hackathon_id}": 2,  # Версия для ETag и карточка
+    "/winner-solution/": 1,
+    "/winner-solution/{solution_id}": 1,
+}
+
+
+@pytest.mark.parametrize("seeded", [ROWS, ROWS * 4], indirect=True, ids=lambda rows: f"{rows}_rows")
+async def test_endpoint_statements_do_not_grow_with_rows(seeded, api):
+    async with seeded.connect() as conn:
+        hacker_id, user_id, team_id = (await conn.execute(text(
+            "SELECT h.id, h.user_id, t.id FROM hacker h JOIN team t ON t.owner_id = h.id LIMIT 1"
+        ))).one()
+        hackathon_id, solution_id = (await conn.execute(text(
+            "SELECT hackathon_id, id FROM winner_solution LIMIT 1"
+        ))).one()
+    ids = {"hacker_id": hacker_id, "team_id": team_id, "hackathon_id": hackathon_id, "solution_id": solution_id}
+
+    # Токен владельца команды: /team/my-teams находит его хакера по user_id
+    headers = {"Authorization": f"Bearer {api_token(str(user_id))}"}
+    counts = {}
+    for endpoint in ENDPOINT_STATEMENTS:
+        # Списки запрашиваются одной страницей на все строки
+        params = {"limit": MAX_PAGE_LIMIT} if endpoint.endswith("/") else None
+        with count_statements(seeded) as statements:
+            response = await api.get(endpoint.format(**ids), params=params, headers=headers)
+        assert response.status_code == 200, (endpoint, response.text)
+        counts[endpoint] = len(statements)
+
+    assert counts == ENDPOINT_STATEMENTS
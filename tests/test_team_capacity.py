@@ -0,0 +1,104 @@
+import asyncio
+import time
+from uuid import uuid4
+
+import pytest
+from sqlalchemy import text
+
+from services.hacker_service import HackerService
+from services.team_service import TeamService
+
+pytestmark = pytest.mark.anyio
+
+# Сотни одновременных вступлений в одну команду: места хватает трети из них
+JOINS = 300
+TEAM_SIZE = 100
+
+
+async def _hackers(count: int) -> list:
+    service = HackerService()
+    ids = []
+    for i in range(count):
+        hacker_id, ok = await service.upsert_hacker(uuid4(), f"hacker {i}")
+        assert ok
+        ids.append(hacker_id)
+    return ids
+
+
+async def test_parallel_joins_never_exceed_max_size(pg, report):
+    owner_id, *hacker_ids = await _hackers(JOINS + 1)
+    service = TeamService()
+    team_id, code = await service.create_team(owner_id, "capacity", max_size=TEAM_SIZE)
+    assert code == 1
+
+    started = time.perf_counter()
+    results = await asyncio.gather(*(service.add_hacker_to_team(team_id, hacker_id) for hacker_id in hacker_ids))
+    elapsed = time.perf_counter() - started
+    report("joins/s", len(hacker_ids) / elapsed)
+    codes = [code for _, code in results]
+
+    assert codes.count(1) == TEAM_SIZE - 1
+    assert codes.count(-3) == len(hacker_ids) - (TEAM_SIZE - 1)
+    assert await _members(pg, team_id) == (TEAM_SIZE, TEAM_SIZE, TEAM_SIZE)
+
+
+async def _members(pg, team_id) -> tuple:
+    async with pg.connect() as conn:
+        return tuple((await conn.execute(text(
+            "SELECT t.max_size, t.member_count, (SELECT count(*) FROM hacker_team_association a WHERE a.team_id = t.id) "
+            "FROM team t WHERE t.id = :id"
+        ), {"id": team_id})).one())
+
+
+async def test_bulk_row_that_does_not_fit_is_not_applied(pg):
+    owner_id, member_id, *newcomers = await _hackers(5)
+    service = TeamService()
+    team_id, _ = await service.create_team(owner_id, "bulk", max_size=3)
+    await service.add_hacker_to_team(team_id, member_id)
+
+    [result] = await service.bulk_upsert_teams([(0, owner_id, "bulk", 4, newcomers)])
+
+    assert result.status == "error"
+    assert await _members(pg, team_id) == (3, 2, 2)
+
+
+@pytest.mark.parametrize("max_size", [10, 17])
+async def test_bulk_and_parallel_joins_never_exceed_max_size(pg, max_size):
+    owner_id, *hacker_ids = await _hackers(17)
+    service = TeamService()
+    team_id, _ = await service.create_team(owner_id, "mixed", max_size=max_size)
+    joining, bulk_members = hacker_ids[:8], hacker_ids[8:]
+
+    results = await asyncio.gather(
+        *(service.add_hacker_to_team(team_id, hacker_id) for hacker_id in joining),
+        service.bulk_upsert_teams([(0, owner_id, "mixed", max_size, bulk_members[:4])]),
+        service.bulk_upsert_teams([(0, owner_id, "mixed", max_size, bulk_members[4:])]),
+    )
+
+    joined = sum(code == 1 for _, code in results[:len(joining)])
+    bulk_added = sum(4 for [row] in results[len(joining):] if row.status == "updated")
+    _, member_count, members = await _members(pg, team_id)
+
+    assert member_count == members == 1 + joined + bulk_added
+    assert member_count <= max_size
+    if max_size == len(hacker_ids) + 1:
+        # Места хватает всем: каждое вступление и каждая строка пачки применены
+        assert (joined, bulk_added) == (len(joining), len(bulk_members))
+
+
+async def test_bulk_counts_newcomers_who_belong_to_other_teams(pg):
+    owner_id, member_id, other_owner_id, *newcomers = await _hackers(6)
+    service = TeamService()
+    team_id, _ = await service.create_team(owner_id, "bulk", max_size=3)
+    await service.add_hacker_to_team(team_id, member_id)
+    other_team_id, _ = await service.create_team(other_owner_id, "other", max_size=10)
+    for hacker_id in newcomers:
+        await service.add_hacker_to_team(other_team_id, hacker_id)
+
+    [rejected] = await service.bulk_upsert_teams([(0, owner_id, "bulk", 4, newcomers)])
+    assert rejected.status == "error"
+    assert await _members(pg, team_id) == (3, 2, 2)
+
+    [applied] = await service.bulk_upsert_teams([(0, owner_id, "bulk", 5, newcomers)])
+    assert (applied.status, applied.error) == ("updated", None)
+    assert await _members(pg, team_id) == (5, 5, 5)
@@ -0,0 +1,91 @@
+import asyncio
+import os
+import signal
+import sys
+import time
+from pathlib import Path
+
+import httpx
+import pytest
+
+from tests.conftest import SERVER_START_TIMEOUT, web_app_server
+
+pytestmark = pytest.mark.skipif(not sys.platform.startswith("linux"), reason="worker processes are read from /proc")
+
+LOAD_SECONDS = 2.0
+LOAD_CONCURRENCY = 32
+
+
+def _workers(master_pid: int) -> set:
+    """
+    Воркеры uvicorn — дочерние процессы мастера, запущенные через multiprocessing spawn.
+    """
+    workers = set()
+    for stat in Path("/proc").glob("[0-9]*/stat"):
+        try:
+            ppid = int(stat.read_text().rsplit(")", 1)[1].split()[1])
+            cmdline = (stat.parent / "cmdline").read_bytes()
+        except (OSError, IndexError, ValueError):
+            continue
+        if ppid == master_pid and b"spawn_main" in cmdline:
+            workers.add(int(stat.parent.name))
+    return workers
+
+
+def _wait_for_workers(master_pid: int, count: int, exclude: set = frozenset()) -> set:
+    deadline = time.perf_counter() + SERVER_START_TIMEOUT
+    while time.perf_counter() < deadline:
+        workers = _workers(master_pid) - exclude
+        if len(workers) == count:
+            return workers
+        time.sleep(0.1)
+    raise AssertionError(f"expected {count} workers of {master_pid}, got {_workers(master_pid)}")
+
+
+async def _throughput(url: str) -> float:
+    """
+    Запросов /healthz в секунду при LOAD_CONCURRENCY одновременных клиентах.
+    """
+    done = 0
+    deadline = time.perf_counter() + LOAD_SECONDS
+
+    async def client(http: httpx.AsyncClient) -> None:
+        nonlocal done
+        while time.perf_counter() < deadline:
+            assert (await http.get("/healthz")).status_code == 200
+            done += 1
+
+    limits = httpx.Limits(max_connections=LOAD_CONCURRENCY)
+    async with httpx.AsyncClient(base_url=url, limits=limits) as http:
+        started = time.perf_counter()
+        await asyncio.gather(*(client(http) for _ in range(LOAD_CONCURRENCY)))
+        return done / (time.perf_counter() - started)
+
+
+def test_supervisor_restarts_a_killed_worker():
+    with web_app_server(UVICORN_WORKERS="2") as server:
+        killed, survivor = sorted(_wait_for_workers(server.process.pid, 2))
+        os.kill(killed, signal.SIGKILL)
+
+        # Мастер заменяет упавший воркер, уцелевший продолжает работать
+        workers = _wait_for_workers(server.process.pid, 2, exclude={killed})
+        assert survivor in workers
+        assert server.process.poll() is None
+        assert httpx.get(f"{server.url}/healthz").status_code == 200
+
+
+@pytest.mark.anyio
+async def test_throughput_scales_with_workers(report):
+    scaled = min(os.cpu_count() or 1, 4)
+    throughput = {}
+    for workers in sorted({1, max(scaled, 2)}):
+        with web_app_server(UVICORN_WORKERS=str(workers)) as server:
+            if workers > 1:  # Один воркер uvicorn обслуживает в самом процессе, без мастера
+                _wait_for_workers(server.process.pid, workers)
+            throughput[workers] = await _throughput(server.url)
+        report(f"{workers} worker(s): /healthz requests/s", throughput[workers])
+
+    if scaled < 2:
+        pytest.skip(f"{os.cpu_count()} CPU: worker scaling cannot show here, throughput reported only")
+    # Воркеры — отдельные процессы: на нескольких ядрах пропускная способность растёт
+    assert throughput[scaled] > 1.3 * throughput[1]
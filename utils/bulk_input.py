@@ -0,0 +1,84 @@
+import json
+from typing import List, Optional, Tuple, Type, TypeVar
+from uuid import UUID
+
+from fastapi import HTTPException, Request, status
+from pydantic import BaseModel, ValidationError
+
+M = TypeVar("M", bound=BaseModel)
+
+MAX_BULK_ROWS = 10000
+
+BULK_CREATED = "created"
+BULK_UPDATED = "updated"
+BULK_ERROR = "error"
+
+
+class BulkRowResult(BaseModel):
+    row: int  # Порядковый номер строки во входных данных (с нуля)
+    status: str
+    id: Optional[UUID] = None
+    error: Optional[str] = None
+
+
+class BulkResponse(BaseModel):
+    created: int
+    updated: int
+    failed: int
+    results: List[BulkRowResult]
+
+    @classmethod
+    def from_results(cls, results: List[BulkRowResult]) -> "BulkResponse":
+        results = sorted(results, key=lambda result: result.row)
+        return cls(
+            created=sum(result.status == BULK_CREATED for result in results),
+            updated=sum(result.status == BULK_UPDATED for result in results),
+            failed=sum(result.status == BULK_ERROR for result in results),
+            results=results,
+        )
+
+
+def bulk_error(row: int, error: str, id: Optional[UUID] = None) -> BulkRowResult:
+    return BulkRowResult(row=row, status=BULK_ERROR, id=id, error=error)
+
+
+async def parse_bulk_body(request: Request, model: Type[M]) -> Tuple[List[Tuple[int, M]], List[BulkRowResult]]:
+    """
+    Parse a bulk request body: a JSON array or NDJSON (one object per line,
+    Content-Type application/x-ndjson). Every row is validated separately.
+
+    Returns:
+        Valid rows with their positions and error results for invalid rows
+
+    Raises:
+        HTTPException: If the body is not a JSON array / NDJSON or has too many rows
+    """
+    body = await request.body()
+
+    try:
+        if request.headers.get("content-type", "").startswith("application/x-ndjson"):
+            items = [json.loads(line) for line in body.splitlines() if line.strip()]
+        else:
+            items = json.loads(body)
+    except ValueError:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid JSON")
+
+    if not isinstance(items, list):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Expected a JSON array or NDJSON")
+
+    if len(items) > MAX_BULK_ROWS:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"At most {MAX_BULK_ROWS} rows per request"
+        )
+
+    rows, errors = [], []
+    for row_no, item in enumerate(items):
+        try:
+            rows.append((row_no, model.model_validate(item)))
+        except ValidationError as e:
+            errors.append(bulk_error(row_no, "; ".join(
+                f"{'.'.join(map(str, error['loc']))}: {error['msg']}" for error in e.errors()
+            )))
+
+    return rows, errors
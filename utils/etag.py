@@ -0,0 +1,56 @@
+import hashlib
+from typing import Any, Optional
+
+from fastapi import Request, Response, status
+
+# Bump when a response shape changes, so clients holding bodies of the old
+# shape do not get 304 for rows whose updated_at has not changed since
+REPRESENTATION_VERSION = 1
+
+# Authenticated responses: browsers may store them but must revalidate with
+# If-None-Match on every use; shared caches must not store them
+REVALIDATE = "private, no-cache"
+
+
+def make_etag(*parts: Any) -> str:
+    """
+    Build a strong ETag from the version of the data and everything else the
+    body depends on (query string, sparse fieldset).
+    """
+    key = "|".join(str(part) for part in (REPRESENTATION_VERSION, *parts))
+    return f'"{hashlib.sha1(key.encode()).hexdigest()}"'
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """
+    Whether If-None-Match of the request matches the ETag (weak comparison, RFC 9110 13.1.2).
+    """
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+
+    if header.strip() == "*":
+        return True
+
+    return any(tag.strip().removeprefix("W/") == etag for tag in header.split(","))
+
+
+def not_modified(etag: str, cache_control: str = REVALIDATE) -> Response:
+    """
+    304 response without a body.
+    """
+    return Response(
+        status_code=status.HTTP_304_NOT_MODIFIED,
+        headers={"ETag": etag, "Cache-Control": cache_control},
+    )
+
+
+def with_etag(response: Response, etag: Optional[str], cache_control: str = REVALIDATE) -> Response:
+    """
+    Attach the ETag and Cache-Control headers to a 200 response.
+    """
+    if etag is not None:
+        response.headers["ETag"] = etag
+        response.headers["Cache-Control"] = cache_control
+
+    return response
@@ -0,0 +1,52 @@
+import json
+from typing import Any, Dict, List, Optional, Type
+
+from fastapi import HTTPException, status
+from pydantic import BaseModel
+
+FIELDS_DESCRIPTION = "Поля ответа через запятую, например id,name (по умолчанию все)"
+
+
+def parse_fields(fields: Optional[str], model: Type[BaseModel]) -> Optional[List[str]]:
+    """
+    Parse a comma-separated sparse fieldset against the fields of a DTO.
+
+    Returns:
+        Requested field names in request order, or None if all fields are requested
+
+    Raises:
+        HTTPException: If a field is not a field of the DTO
+    """
+    if not fields:
+        return None
+
+    requested = list(dict.fromkeys(field.strip() for field in fields.split(",") if field.strip()))
+    unknown = [field for field in requested if field not in model.model_fields]
+    if unknown or not requested:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unknown fields: {', '.join(unknown)}. Allowed: {', '.join(model.model_fields)}"
+        )
+
+    return requested
+
+
+def list_include(key: str, fields: Optional[List[str]]) -> Optional[Dict[str, Any]]:
+    """
+    `include` argument of model_dump_json for a page of items stored under `key`.
+    """
+    if fields is None:
+        return None
+
+    return {key: {"__all__": set(fields)}, "next_cursor": True}
+
+
+def trim_json(body: bytes | str, fields: Optional[List[str]]) -> bytes | str:
+    """
+    Keep only the requested fields of an already serialized JSON object (e.g. from the cache).
+    """
+    if fields is None:
+        return body
+
+    data = json.loads(body)
+    return json.dumps({field: data[field] for field in fields}, separators=(",", ":"), ensure_ascii=False)
@@ -1,64 +1,279 @@
-from typing import Optional
-from fastapi import HTTPException, status, Request, Depends
-from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-import jwt
-from pydantic import BaseModel
-from loguru import logger
-
-class Claims(BaseModel):
-    uid: str  # This is the user_id as per the requirements
-    email: Optional[str] = None
-    exp: Optional[int] = None
-    iat: Optional[int] = None
-
-security = HTTPBearer()
-
-def parse_jwt_token(credentials: HTTPAuthorizationCredentials) -> Claims:
-    """
-    Parse JWT token from Authorization header and extract claims.
-    
-    Args:
-        credentials: HTTPAuthorizationCredentials from FastAPI security
-        
-    Returns:
-        Claims object containing uid (user_id) and other claims
-        
-    Raises:
-        HTTPException: If token is invalid or missing required claims
-    """
-    try:
-        # Here you would typically verify the token with your secret key
-        # For now, we'll just decode it without verification
-        payload = jwt.decode(credentials.credentials, options={"verify_signature": False})
-        
-        if "uid" not in payload:
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="Invalid token: missing uid claim"
-            )
-            
-        return Claims(
-            uid=payload["uid"],  # This uid is the user_id
-            email=payload.get("email"),
-            exp=payload.get("exp"),
-            iat=payload.get("iat")
-        )
-        
-    except jwt.InvalidTokenError:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Invalid token"
-        )
-
-def get_current_user_id(credentials: HTTPAuthorizationCredentials = Depends(security)) -> str:
-    """
-    Convenience function to get just the user_id from the JWT token.
-    
-    Args:
-        credentials: HTTPAuthorizationCredentials from FastAPI security
-        
-    Returns:
-        user_id extracted from the JWT token
-    """
-    claims = parse_jwt_token(credentials)
-    return claims.uid  # Return the uid as user_id 
\ No newline at end of file
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, FrozenSet, List, Optional, Tuple
+
+from fastapi import HTTPException, status, Depends
+from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
+import jwt
+from pydantic import BaseModel, ValidationError
+from loguru import logger
+
+from settings.settings import Jwt, settings
+
+class Claims(BaseModel):
+    uid: str  # This is the user_id as per the requirements
+    email: Optional[str] = None
+    exp: Optional[float] = None  # NumericDate, may be fractional
+    iat: Optional[float] = None
+    scope: Optional[str] = None  # Space-separated scopes, e.g. "admin"
+
+    @property
+    def scopes(self) -> FrozenSet[str]:
+        return frozenset(self.scope.split()) if self.scope else frozenset()
+
+security = HTTPBearer()
+
+HMAC_ALGORITHMS = ["HS256"]
+
+
+def _unauthorized(detail: str) -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail=detail,
+        headers={"WWW-Authenticate": "Bearer"},
+    )
+
+
+def load_public_keys(directory: str) -> Dict[str, Any]:
+    """
+    Load public keys from `<kid>.pem` files of a directory.
+
+    Several keys may be active at once, so a new key is rolled out by adding
+    its file next to the old one and the old one is removed after its tokens expire.
+
+    Raises:
+        RuntimeError: If the `cryptography` package is not installed
+    """
+    try:
+        from cryptography.hazmat.primitives.serialization import load_pem_public_key
+    except ImportError as e:
+        raise RuntimeError("JWT_PUBLIC_KEYS_DIR requires the cryptography package") from e
+
+    return {path.stem: load_pem_public_key(path.read_bytes()) for path in sorted(Path(directory).glob("*.pem"))}
+
+
+def key_algorithms(key: Any, algorithms: List[str]) -> List[str]:
+    """
+    Subset of the configured algorithms that matches the key type.
+
+    A token whose `alg` does not fit its key (e.g. ES256 with an RSA key) is
+    then rejected by PyJWT as a disallowed algorithm instead of failing in
+    key preparation.
+    """
+    # Keys are only loaded when cryptography is installed
+    from cryptography.hazmat.primitives.asymmetric import ec, ed448, ed25519, rsa
+
+    if isinstance(key, rsa.RSAPublicKey):
+        prefixes = ("RS", "PS")
+    elif isinstance(key, ec.EllipticCurvePublicKey):
+        prefixes = ("ES",)
+    elif isinstance(key, (ed25519.Ed25519PublicKey, ed448.Ed448PublicKey)):
+        prefixes = ("EdDSA",)
+    else:
+        return []
+
+    return [alg for alg in algorithms if alg.startswith(prefixes)]
+
+
+class TokenVerifier:
+    """
+    Verifies bearer tokens and caches the resulting claims.
+
+    HS* tokens are checked against the shared secret, asymmetric tokens
+    against the public key named by their `kid` header. Verified claims are
+    kept in a bounded LRU cache keyed by the token, so repeated requests with
+    the same token skip decoding and signature checks; a cached token is
+    still rejected once its `exp` has passed.
+    """
+
+    def __init__(
+        self,
+        secret: Optional[str] = None,
+        public_keys: Optional[Dict[str, Any]] = None,
+        public_key_algorithms: Optional[List[str]] = None,
+        audience: Optional[str] = None,
+        issuer: Optional[str] = None,
+        leeway: int = 0,
+        cache_size: int = 10000,
+        verify: bool = True,
+    ) -> None:
+        self._secret = secret
+        self._public_keys: Dict[str, Tuple[Any, List[str]]] = {}
+        for kid, key in (public_keys or {}).items():
+            algorithms = key_algorithms(key, public_key_algorithms or ["RS256", "ES256"])
+            if algorithms:
+                self._public_keys[kid] = (key, algorithms)
+            else:
+                logger.warning(f"jwt public key {kid}: no configured algorithm fits {type(key).__name__}, skipped")
+        self._audience = audience
+        self._issuer = issuer
+        self._leeway = leeway
+        self._cache_size = cache_size
+        self._verify = verify
+        self._cache: "OrderedDict[str, Claims]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    @classmethod
+    def from_settings(cls, config: Jwt) -> "TokenVerifier":
+        public_keys = load_public_keys(config.public_keys_dir) if config.public_keys_dir else {}
+        verifier = cls(
+            secret=config.secret.get_secret_value() if config.secret else None,
+            public_keys=public_keys,
+            public_key_algorithms=[alg.strip() for alg in config.public_key_algorithms.split(",") if alg.strip()],
+            audience=config.audience,
+            issuer=config.issuer,
+            leeway=config.leeway,
+            cache_size=config.cache_size,
+            verify=not config.insecure_skip_verify,
+        )
+
+        if not verifier._verify:
+            logger.warning("JWT signature verification is disabled (JWT_INSECURE_SKIP_VERIFY)")
+        elif not verifier._secret and not verifier._public_keys:
+            logger.error("no JWT_SECRET or JWT_PUBLIC_KEYS_DIR configured, all tokens will be rejected")
+        else:
+            logger.info(f"jwt verifier: hmac={bool(verifier._secret)}, public keys={sorted(verifier._public_keys)}")
+
+        return verifier
+
+    def _key(self, token: str) -> Tuple[Any, List[str]]:
+        """
+        Key and allowed algorithms for a token, chosen by its (unverified) header.
+        """
+        header = jwt.get_unverified_header(token)
+
+        if header.get("alg") in HMAC_ALGORITHMS:
+            if not self._secret:
+                raise _unauthorized("Invalid token: HMAC tokens are not accepted")
+            return self._secret, HMAC_ALGORITHMS
+
+        entry = self._public_keys.get(header.get("kid"))
+        if entry is None:
+            raise _unauthorized("Invalid token: unknown key id")
+
+        return entry
+
+    def _decode(self, token: str) -> Dict[str, Any]:
+        if not self._verify:
+            return jwt.decode(token, options={"verify_signature": False})
+
+        key, algorithms = self._key(token)
+        return jwt.decode(
+            token,
+            key,
+            algorithms=algorithms,
+            audience=self._audience,
+            issuer=self._issuer,
+            leeway=self._leeway,
+            options={"verify_aud": self._audience is not None},
+        )
+
+    def verify(self, token: str) -> Claims:
+        """
+        Verify a token and extract its claims.
+
+        Raises:
+            HTTPException: 401 if the token is invalid, expired or has no uid claim
+        """
+        claims = self._cache.get(token)
+        if claims is not None:
+            if claims.exp is not None and claims.exp + self._leeway <= time.time():
+                del self._cache[token]
+                raise _unauthorized("Invalid token: expired")
+
+            self._cache.move_to_end(token)
+            self.hits += 1
+            return claims
+
+        self.misses += 1
+        try:
+            payload = self._decode(token)
+        except jwt.ExpiredSignatureError:
+            raise _unauthorized("Invalid token: expired")
+        except (jwt.PyJWTError, TypeError, ValueError):
+            # TypeError/ValueError: a key PyJWT cannot use for the token, never a 500
+            raise _unauthorized("Invalid token")
+
+        if "uid" not in payload:
+            raise _unauthorized("Invalid token: missing uid claim")
+
+        try:
+            claims = Claims(
+                uid=payload["uid"],  # This uid is the user_id
+                email=payload.get("email"),
+                exp=payload.get("exp"),
+                iat=payload.get("iat"),
+                scope=payload.get("scope"),
+            )
+        except ValidationError:
+            raise _unauthorized("Invalid token: malformed claims")
+
+        self._cache[token] = claims
+        if len(self._cache) > self._cache_size:
+            self._cache.popitem(last=False)
+
+        return claims
+
+    def stats(self) -> Dict[str, int]:
+        return {"hits": self.hits, "misses": self.misses, "size": len(self._cache)}
+
+
+token_verifier = TokenVerifier.from_settings(settings.jwt)
+
+
+def parse_jwt_token(credentials: HTTPAuthorizationCredentials) -> Claims:
+    """
+    Verify the JWT token from the Authorization header and extract claims.
+
+    Args:
+        credentials: HTTPAuthorizationCredentials from FastAPI security
+
+    Returns:
+        Claims object containing uid (user_id) and other claims
+
+    Raises:
+        HTTPException: If token is invalid or missing required claims
+    """
+    return token_verifier.verify(credentials.credentials)
+
+
+def get_current_claims(credentials: HTTPAuthorizationCredentials = Depends(security)) -> Claims:
+    """
+    Dependency resolving the claims of the current request.
+
+    FastAPI caches dependencies per request, so the token is verified once
+    even when several dependencies of a route need the claims.
+
+    Returns:
+        Claims of the verified token
+    """
+    return parse_jwt_token(credentials)
+
+
+def get_current_user_id(claims: Claims = Depends(get_current_claims)) -> str:
+    """
+    Convenience function to get just the user_id from the JWT token.
+
+    Returns:
+        user_id extracted from the JWT token
+    """
+    return claims.uid  # Return the uid as user_id
+
+
+def get_admin_claims(claims: Claims = Depends(get_current_claims)) -> Claims:
+    """
+    Dependency for service endpoints (bulk imports, metrics): the token must
+    carry the admin scope (JWT_ADMIN_SCOPE) in its `scope` claim.
+
+    Returns:
+        Claims of the verified service token
+
+    Raises:
+        HTTPException: 403 if the token has no admin scope
+    """
+    if settings.jwt.admin_scope not in claims.scopes:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Admin scope required")
+
+    return claims
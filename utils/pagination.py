@@ -0,0 +1,58 @@
+import base64
+import json
+from datetime import datetime
+from typing import Any, List, Optional, Sequence, Tuple
+from uuid import UUID
+
+from fastapi import HTTPException, status
+
+DEFAULT_PAGE_LIMIT = 50
+MAX_PAGE_LIMIT = 500
+
+# Позиция в keyset-пагинации: (created_at, id) последней отданной строки
+Keyset = Tuple[datetime, UUID]
+
+
+def encode_cursor(created_at: datetime, id: UUID) -> str:
+    """
+    Encode the (created_at, id) keyset of the last row into an opaque cursor.
+    """
+    raw = json.dumps([created_at.isoformat(), str(id)]).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: Optional[str]) -> Optional[Keyset]:
+    """
+    Decode an opaque cursor produced by encode_cursor.
+
+    Raises:
+        HTTPException: If the cursor is malformed
+    """
+    if not cursor:
+        return None
+
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        created_at, id = json.loads(raw)
+        return datetime.fromisoformat(created_at), UUID(id)
+    except (ValueError, TypeError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor"
+        )
+
+
+def paginate(rows: Sequence[Any], limit: int) -> Tuple[List[Any], Optional[str]]:
+    """
+    Cut a page of `limit` rows out of `limit + 1` fetched rows.
+
+    Returns:
+        The page and the cursor of the next page (None if this page is the last one)
+    """
+    page = list(rows[:limit])
+
+    if len(rows) <= limit or not page:
+        return page, None
+
+    last = page[-1]
+    return page, encode_cursor(last.created_at, last.id)
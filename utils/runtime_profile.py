@@ -0,0 +1,57 @@
+from functools import lru_cache
+from importlib.util import find_spec
+from typing import Dict, Type
+
+from fastapi.responses import JSONResponse, ORJSONResponse
+from loguru import logger
+
+from settings.settings import settings
+
+
+def _available(module: str) -> bool:
+    return find_spec(module) is not None
+
+
+def uvicorn_runtime_options() -> Dict[str, str]:
+    """
+    uvicorn loop/http options of the runtime profile.
+
+    The fast profile (FAST_RUNTIME=true) uses uvloop and httptools from
+    requirements-fast.txt; a missing package falls back to the default
+    implementation with a warning.
+    """
+    if not settings.uvicorn.fast_runtime:
+        return {}
+
+    options = {}
+    for option, module in (("loop", "uvloop"), ("http", "httptools")):
+        if _available(module):
+            options[option] = module
+        else:
+            logger.warning(f"fast runtime: {module} is not installed, using the default {option}")
+
+    return options
+
+
+@lru_cache(maxsize=None)
+def orjson_enabled() -> bool:
+    """
+    Whether the runtime profile serializes JSON with orjson: only in the fast
+    profile and only if orjson is installed (a missing package is reported once).
+    """
+    if not settings.uvicorn.fast_runtime:
+        return False
+
+    if not _available("orjson"):
+        logger.warning("fast runtime: orjson is not installed, using the standard JSON serializers")
+        return False
+
+    return True
+
+
+def default_response_class() -> Type[JSONResponse]:
+    """
+    Default FastAPI response class of the runtime profile: orjson-based in the
+    fast profile (native UUID/datetime serialization), the standard one otherwise.
+    """
+    return ORJSONResponse if orjson_enabled() else JSONResponse
@@ -0,0 +1,56 @@
+from typing import Any, Dict, Optional
+from uuid import UUID
+
+from fastapi import Response, status
+from pydantic import BaseModel
+
+from utils.runtime_profile import orjson_enabled
+
+JSON_MEDIA_TYPE = "application/json"
+
+
+def _pydantic_json(dto: BaseModel, include: Optional[Dict[str, Any]] = None) -> bytes:
+    return dto.__pydantic_serializer__.to_json(dto, include=include)
+
+
+def _orjson_default(value: Any) -> str:
+    # orjson handles uuid.UUID itself but not subclasses such as asyncpg's UUID
+    if isinstance(value, UUID):
+        return str(value)
+    raise TypeError(f"Type is not JSON serializable: {type(value).__name__}")
+
+
+def _orjson_json(dto: BaseModel, include: Optional[Dict[str, Any]] = None) -> bytes:
+    import orjson  # Optional dependency of the fast runtime profile
+
+    # UTC datetimes as "Z", like pydantic, so both profiles produce the same JSON
+    return orjson.dumps(dto.model_dump(include=include), default=_orjson_default, option=orjson.OPT_UTC_Z)
+
+
+# JSON serializer of the runtime profile for DTO bodies: orjson over model_dump()
+# in the fast profile (UUIDs and datetimes natively), pydantic-core otherwise
+dump_json = _orjson_json if orjson_enabled() else _pydantic_json
+
+
+def json_response(body: bytes | str, status_code: int = status.HTTP_200_OK) -> Response:
+    """
+    Return an already serialized JSON body (e.g. from the cache) as is.
+    """
+    return Response(content=body, media_type=JSON_MEDIA_TYPE, status_code=status_code)
+
+
+def trusted_response(
+    dto: BaseModel,
+    status_code: int = status.HTTP_200_OK,
+    include: Optional[Dict[str, Any]] = None,
+) -> Response:
+    """
+    Serialize a DTO built from trusted data (model_construct over database rows)
+    straight to JSON.
+
+    FastAPI does not validate or re-encode a returned Response against the
+    route's response_model, so every row is validated zero times instead of
+    twice; response_model still documents the schema. `include` trims the
+    payload to a sparse fieldset.
+    """
+    return json_response(dump_json(dto, include), status_code)
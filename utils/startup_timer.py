@@ -0,0 +1,45 @@
+import time
+from typing import Dict
+
+# Liveness/readiness probes start before any client traffic and do not count as the first request
+PROBE_PATHS = frozenset({"/healthz", "/readyz"})
+
+
+class StartupTimer:
+    """
+    Startup milestones of the process, in seconds since this module was imported.
+    Each milestone is recorded once.
+    """
+
+    def __init__(self) -> None:
+        self._started = time.perf_counter()
+        self._marks: Dict[str, float] = {}
+
+    def mark(self, name: str) -> None:
+        if name not in self._marks:
+            self._marks[name] = round(time.perf_counter() - self._started, 4)
+
+    def has(self, name: str) -> bool:
+        return name in self._marks
+
+    def stats(self) -> Dict[str, float]:
+        return dict(self._marks)
+
+
+startup_timer = StartupTimer()
+
+
+class FirstRequestTimer:
+    """
+    ASGI middleware recording the time to the first served HTTP request
+    (health probes excluded).
+    """
+
+    def __init__(self, app) -> None:
+        self.app = app
+
+    async def __call__(self, scope, receive, send) -> None:
+        await self.app(scope, receive, send)
+
+        if scope["type"] == "http" and scope["path"] not in PROBE_PATHS:
+            startup_timer.mark("first_request")
@@ -1,21 +1,29 @@
-import asyncio
-
 import uvicorn
-from presentations.fastapi_app import app
+from dotenv import load_dotenv
+
+# .env загружается до импорта настроек; воркеры uvicorn наследуют окружение мастер-процесса
+load_dotenv()
+
 from settings.settings import settings
+from utils.runtime_profile import uvicorn_runtime_options
+
+# Приложение передаётся строкой импорта: так uvicorn может запустить несколько
+# воркеров, каждый из которых импортирует приложение в своём процессе
+APP = "presentations.fastapi_app:app"
 
 
-async def main() -> None:
-    server = uvicorn.Server(
-        uvicorn.Config(
-            app,
-            host=settings.uvicorn.host,
-            port=settings.uvicorn.port,
-            workers=settings.uvicorn.workers,
-        )
+def main() -> None:
+    # При workers > 1 uvicorn запускает мастер-процесс, который следит за
+    # воркерами и перезапускает упавшие
+    uvicorn.run(
+        APP,
+        host=settings.uvicorn.host,
+        port=settings.uvicorn.port,
+        workers=settings.uvicorn.workers,
+        timeout_graceful_shutdown=settings.uvicorn.graceful_shutdown_timeout,
+        **uvicorn_runtime_options(),
     )
-    await server.serve()
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    main()